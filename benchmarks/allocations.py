@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of memory allocated per call of the stream callback, measured with tracemalloc.
+
+Compares the callback of `remote_audio.audio.create_stream_callback`, which reads into and returns preallocated buffers,
+with the previous one, which allocated the data with `readframes`, then padding and a concatenation when the source ran short.
+Each is run in steady state:
+- playing:  the source has data for every chunk;
+- starved:  the source is waiting for data, so every chunk is padded with silence;
+with and without a gain applied.
+
+For each, reports the peak memory allocated during a single callback, and the memory still held after all callbacks.
+The Python objects involved - the ints and the returned tuple - are a few dozen bytes; anything the size of a chunk is a buffer.
+
+The peak max and retained memory of the pooled callback are not zero, and at small chunk sizes can exceed the legacy one:
+every few dozen callbacks, the interpreter itself allocates a couple of KiB, which tracemalloc attributes to the call.
+This is the same with or without a gain, and for any chunk size; it is not a buffer. The peak mean is what scales with chunks.
+With `--check`, the benchmark fails unless every pooled peak and its retained memory stays below one chunk;
+use a chunk size large enough that those few KiB do not count, e.g. the default of `--check`.
+
+Does not need an output device.
+
+Usage:
+    python benchmarks/allocations.py [--chunk-size 1024] [--callbacks 1000] [--json] [--check]
+"""
+
+import argparse
+import array
+import io
+import json
+import os
+import sys
+import tracemalloc
+import wave
+from typing import Any, Callable, Dict, List, Union
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+if (SRC_PATH not in sys.path):
+    sys.path.insert(0, SRC_PATH)
+
+DEFAULT_CHUNK_SIZE = 1024
+CHECK_CHUNK_SIZE = 4096         # Default with --check; 16 KiB chunks, well above the interpreter's own allocations
+DEFAULT_CALLBACKS = 1000
+WARMUP_CALLBACKS = 10
+SAMPLE_RATE = 48000
+CHANNELS = 2
+
+
+def create_legacy_callback(
+    wHnd:wave.Wave_read,
+    chunk_size:int,
+    stream_status:"remote_audio.stream.StreamStatus",
+    gain_stage:"remote_audio.dsp.GainStage" = None,
+)->Callable:
+    """
+    The stream callback as it was before the buffer pool, for comparison.
+    """
+    import pyaudio
+
+    def wrapper(
+        in_data:Union[
+            bytes,
+            None,
+        ],
+        frame_count:int,
+        time_info:Dict[
+            str, Any
+        ],
+        status_flags:int,
+    ):
+        _data = wHnd.readframes(chunk_size)
+
+        if (gain_stage is not None):
+            _data = gain_stage.process(_data)
+
+        stream_status.played(len(_data))
+
+        _status = pyaudio.paContinue if (_data or stream_status) else pyaudio.paComplete
+        if (not stream_status.timedout):
+            _data += b"\x00"*(chunk_size*wHnd.getnchannels()*wHnd.getsampwidth()-len(_data))
+
+        return (_data, _status)
+
+    return wrapper
+
+
+def create_source(
+    frames:int,
+)->io.BytesIO:
+    from remote_audio.io.file import create_wav
+
+    return create_wav(b"\x00\x10" * CHANNELS * frames, channels=CHANNELS, sample_rate=SAMPLE_RATE)
+
+
+def measure(
+    callback:Callable,
+    chunk_size:int,
+    callbacks:int,
+)->Dict[str, float]:
+    """
+    Call `callback` `callbacks` times after a warm up; peak and retained memory, in bytes.
+    """
+    for _ in range(WARMUP_CALLBACKS):
+        callback(None, chunk_size, {}, 0)
+
+    # Preallocated, so that the measurements themselves are not retained memory
+    _peaks = array.array("q", bytes(8 * callbacks))
+
+    tracemalloc.start()
+    _baseline, _ = tracemalloc.get_traced_memory()
+
+    for _i in range(callbacks):
+        _before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        _result = callback(None, chunk_size, {}, 0)
+        del _result
+
+        _, _peak = tracemalloc.get_traced_memory()
+        _peaks[_i] = _peak - _before
+
+    _after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "peak_mean":    sum(_peaks) / len(_peaks),
+        "peak_max":     max(_peaks),
+        "retained":     _after - _baseline,
+    }
+
+
+def run(
+    implementation:str,
+    scenario:str,
+    gain:float,
+    chunk_size:int = DEFAULT_CHUNK_SIZE,
+    callbacks:int = DEFAULT_CALLBACKS,
+)->Dict[str, object]:
+    from remote_audio import audio, buffers, dsp
+    from remote_audio.stream import StreamStatus
+
+    _frames = (callbacks + WARMUP_CALLBACKS) * chunk_size if (scenario == "playing") else 0
+    _source = create_source(_frames)
+
+    # A timeout so long that a starved stream stays alive
+    _stream_status = StreamStatus(timeout=3600)
+    _gain_stage = dsp.create_gain_stage(
+        channels = CHANNELS,
+        sample_width = 2,
+        sample_rate = SAMPLE_RATE,
+        gain = gain,
+        max_frames = chunk_size,
+    )
+
+    if (implementation == "legacy"):
+        _callback = create_legacy_callback(wave.open(_source, "rb"), chunk_size, _stream_status, _gain_stage)
+    else:
+        _callback = audio.create_stream_callback(buffers.FrameReader.open(_source), chunk_size, _stream_status, _gain_stage)
+
+    return {
+        "implementation":   implementation,
+        "scenario":         scenario,
+        "gain":             gain,
+        "chunk_bytes":      chunk_size * CHANNELS * 2,
+        **measure(_callback, chunk_size, callbacks),
+    }
+
+
+def main(
+    argv:List[str] = None,
+)->int:
+    _parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _parser.add_argument("--chunk-size", type=int, default=None, help=f"Frames per callback; {DEFAULT_CHUNK_SIZE}, or {CHECK_CHUNK_SIZE} with --check.")
+    _parser.add_argument("--callbacks", type=int, default=DEFAULT_CALLBACKS, help="Callbacks measured per run.")
+    _parser.add_argument("--json", action="store_true", help="Output results as JSON.")
+    _parser.add_argument("--check", action="store_true", help="Fail unless the pooled callback allocates and retains less than one chunk.")
+    _args = _parser.parse_args(argv)
+
+    if (_args.chunk_size is None):
+        _args.chunk_size = CHECK_CHUNK_SIZE if (_args.check) else DEFAULT_CHUNK_SIZE
+
+    if (not hasattr(tracemalloc, "reset_peak")):
+        print ("Python 3.9 or later is required for tracemalloc.reset_peak().")
+        return 1
+
+    _results = [
+        run(
+            implementation = _implementation,
+            scenario = _scenario,
+            gain = _gain,
+            chunk_size = _args.chunk_size,
+            callbacks = _args.callbacks,
+        ) \
+            for _scenario in ("playing", "starved") \
+                for _gain in (1.0, 0.5) \
+                    for _implementation in ("legacy", "pooled")
+    ]
+
+    if (_args.json):
+        print (json.dumps(_results, indent=4))
+    else:
+        print (f"{'implementation':>14}  {'scenario':>8}  {'gain':>4}  {'chunk':>6}  {'peak mean':>9}  {'peak max':>8}  {'retained':>8}")
+        for _result in _results:
+            print (f"{_result['implementation']:>14}  {_result['scenario']:>8}  {_result['gain']:4.1f}  {_result['chunk_bytes']:6d}  {_result['peak_mean']:9.0f}  {_result['peak_max']:8d}  {_result['retained']:8d}")
+
+    if (_args.check):
+        _failed = [
+            _result \
+                for _result in _results \
+                    if _result["implementation"] == "pooled" and max(_result["peak_max"], _result["retained"]) >= _result["chunk_bytes"]
+        ]
+
+        for _result in _failed:
+            print (f"FAILED: pooled {_result['scenario']} at gain {_result['gain']:.1f} allocated {_result['peak_max']} and retained {_result['retained']} bytes, for {_result['chunk_bytes']} byte chunks.", file=sys.stderr)
+
+        if (_failed):
+            return 1
+
+    return 0
+
+
+if (__name__=="__main__"):
+    sys.exit(main())
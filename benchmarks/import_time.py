@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for `import remote_audio`.
+
+Measures, each in a fresh interpreter:
+- cold import time: no bytecode cache, so every module is compiled from source;
+- warm import time: median of several runs with bytecode cached;
+- per-module cost, parsed from `python -X importtime`.
+
+Exits with status 1 if the warm import time exceeds the threshold, so it can guard against regressions in CI.
+
+Usage:
+    python benchmarks/import_time.py [--module remote_audio] [--threshold-ms 250] [--runs 5] [--top 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULE = "remote_audio"
+DEFAULT_THRESHOLD_MS = 250
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 20
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+_IMPORTTIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s+)(?P<module>\S+)\s*$"
+)
+
+
+def run_import(
+    module:str,
+    cold:bool = False,
+)->Tuple[float, List[Dict[str, object]]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime`.
+
+    Returns the total wall time in ms as measured by the child,
+    and the parsed importtime records.
+    """
+
+    _env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, (SRC_PATH, os.environ.get("PYTHONPATH")))),
+    }
+
+    with tempfile.TemporaryDirectory() as _cache_dir:
+        if (cold):
+            # An empty pycache prefix forces every module to be compiled from source
+            _env["PYTHONPYCACHEPREFIX"] = _cache_dir
+
+        _process = subprocess.run(
+            [
+                sys.executable,
+                "-X", "importtime",
+                "-c",
+                "import time; _start = time.perf_counter(); "
+                f"import {module}; "
+                "print((time.perf_counter()-_start)*1000)",
+            ],
+            env = _env,
+            capture_output = True,
+            text = True,
+        )
+
+    if (_process.returncode):
+        raise RuntimeError(
+            f"Importing {module} failed:\n{_process.stderr[-2000:]}"
+        )
+
+    return float(_process.stdout.strip().splitlines()[-1]), parse_importtime(_process.stderr)
+
+
+def parse_importtime(
+    output:str,
+)->List[Dict[str, object]]:
+    """
+    Parse the stderr of `python -X importtime` into records of
+    module name, self time and cumulative time in ms, and nesting depth.
+    """
+
+    _records = []
+    for _line in output.splitlines():
+        _parsed = _IMPORTTIME_PATTERN.match(_line)
+
+        if (_parsed):
+            _records.append({
+                "module":           _parsed.group("module"),
+                "self_ms":          int(_parsed.group("self")) / 1000,
+                "cumulative_ms":    int(_parsed.group("cumulative")) / 1000,
+                "depth":            (len(_parsed.group("indent")) - 1) // 2,
+            })
+
+    return _records
+
+
+def benchmark(
+    module:str = DEFAULT_MODULE,
+    runs:int = DEFAULT_RUNS,
+)->Dict[str, object]:
+    """
+    Run the cold and warm import benchmarks for `module`.
+    """
+
+    _cold_ms, _ = run_import(module, cold=True)
+
+    # Make sure bytecode is cached before the warm runs
+    run_import(module)
+
+    _warm = [ run_import(module) for _ in range(max(runs, 1)) ]
+    _warm_ms = [ _ms for _ms, _ in _warm ]
+
+    # Per-module cost from the median run
+    _median_run = sorted(_warm, key=lambda _run: _run[0])[len(_warm)//2]
+
+    return {
+        "module":           module,
+        "cold_ms":          _cold_ms,
+        "warm_ms":          statistics.median(_warm_ms),
+        "warm_runs_ms":     _warm_ms,
+        "modules":          _median_run[1],
+    }
+
+
+def summarise_packages(
+    records:List[Dict[str, object]],
+    top:int = DEFAULT_TOP,
+)->List[Dict[str, object]]:
+    """
+    Self time aggregated by top-level package, most expensive first.
+    """
+
+    _packages = {}
+    for _record in records:
+        _package = _record["module"].split(".")[0]
+        _packages[_package] = _packages.get(_package, 0) + _record["self_ms"]
+
+    return [
+        {"package": _package, "self_ms": _ms} \
+            for _package, _ms in sorted(_packages.items(), key=lambda _item: -_item[1])[:top]
+    ]
+
+
+def main(
+    argv:List[str] = None,
+)->int:
+    _parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import.")
+    _parser.add_argument("--threshold-ms", type=float, default=DEFAULT_THRESHOLD_MS, help="Fail if the warm import time exceeds this.")
+    _parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Number of warm runs.")
+    _parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of modules and packages to list.")
+    _parser.add_argument("--json", action="store_true", help="Output results as JSON.")
+    _args = _parser.parse_args(argv)
+
+    _result = benchmark(
+        module = _args.module,
+        runs = _args.runs,
+    )
+    _result["threshold_ms"] = _args.threshold_ms
+    _result["packages"] = summarise_packages(_result["modules"], top=_args.top)
+    _result["passed"] = _result["warm_ms"] <= _args.threshold_ms
+
+    if (_args.json):
+        print (json.dumps(_result, indent=4))
+    else:
+        print (f"import {_result['module']}")
+        print (f"  cold: {_result['cold_ms']:8.1f} ms")
+        print (f"  warm: {_result['warm_ms']:8.1f} ms (median of {len(_result['warm_runs_ms'])}; threshold {_args.threshold_ms:.1f} ms)")
+
+        print (f"\nTop {_args.top} modules by cumulative time:")
+        for _record in sorted(_result["modules"], key=lambda _record: -_record["cumulative_ms"])[:_args.top]:
+            print (f"  {_record['cumulative_ms']:8.1f} ms  {_record['self_ms']:8.1f} ms self  {_record['module']}")
+
+        print (f"\nTop {_args.top} packages by self time:")
+        for _package in _result["packages"]:
+            print (f"  {_package['self_ms']:8.1f} ms  {_package['package']}")
+
+        print ("\nPASSED" if _result["passed"] else "\nFAILED: warm import time exceeds threshold.")
+
+    return 0 if _result["passed"] else 1
+
+
+if (__name__=="__main__"):
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of output underruns (xruns) of the playback engines under GIL contention.
+
+For each engine and each number of load threads, plays a generated tone from a StreamIO that is
+written by a producer thread - as a download or FFmpeg would - while the load threads run pure Python.
+Underruns are counted in `StreamStatus.xruns`, a view of `StreamStatus.metrics.output_underflows`:
+- callback engine: from the paOutputUnderflow flag PortAudio passes to the callback;
+- blocking engine: from the write buffer having run dry between two writes.
+Late callbacks and the highest callback load, from `StreamStatus.stats`, tell whether the underruns were caused by our own code.
+
+Needs an output device.
+
+Usage:
+    python benchmarks/xruns.py [--device-index 0] [--duration 10] [--load 0 2 4] [--engine callback blocking] [--json]
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time as timer
+from typing import Dict, List
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+if (SRC_PATH not in sys.path):
+    sys.path.insert(0, SRC_PATH)
+
+DEFAULT_DURATION = 10
+DEFAULT_LOAD = [0, 2, 4]
+DEFAULT_SAMPLE_RATE = 48000
+DEFAULT_CHANNELS = 2
+DEFAULT_FREQUENCY = 440
+PRODUCER_CHUNK_DURATION = 0.02      # Seconds of audio per write of the producer
+PRODUCER_SPEED = 2                  # Times realtime that the producer writes at
+
+
+def generate_tone(
+    duration:float,
+    sample_rate:int = DEFAULT_SAMPLE_RATE,
+    channels:int = DEFAULT_CHANNELS,
+    frequency:float = DEFAULT_FREQUENCY,
+)->bytes:
+    """
+    A 16-bit sine tone as WAV data, header included.
+    """
+    from remote_audio.io.file import create_wav
+
+    _frames = int(duration * sample_rate)
+    _samples = [
+        int(8192 * math.sin(2 * math.pi * frequency * _frame / sample_rate)) \
+            for _frame in range(_frames)
+    ]
+
+    return create_wav(
+        b"".join(struct.pack("<h", _sample) * channels for _sample in _samples),
+        channels = channels,
+        sample_rate = sample_rate,
+    ).getvalue()
+
+
+def produce(
+    stream_io:"remote_audio.io.base_io.StreamIO",
+    data:bytes,
+    chunk_size:int,
+    interval:float,
+)->None:
+    """
+    Write `data` into `stream_io` in chunks, `interval` seconds apart.
+    """
+
+    for _start in range(0, len(data), chunk_size):
+        stream_io.write(data[_start:_start+chunk_size])
+        timer.sleep(interval)
+
+
+def load(
+    stop:threading.Event,
+)->None:
+    """
+    Hold the GIL with pure Python work until stopped.
+    """
+
+    while (not stop.is_set()):
+        sum(_i * _i for _i in range(10000))
+
+
+def run(
+    engine:str,
+    load_threads:int,
+    duration:float = DEFAULT_DURATION,
+    device_index:int = None,
+    data:bytes = None,
+)->Dict[str, object]:
+    """
+    Play `duration` seconds of tone through `engine` with `load_threads` running, and count the underruns.
+    """
+
+    from remote_audio import audio
+    from remote_audio.io.base_io import StreamIO
+
+    if (data is None):
+        data = generate_tone(duration)
+
+    _header_size = 44
+    _byte_rate = DEFAULT_SAMPLE_RATE * DEFAULT_CHANNELS * 2
+    _chunk_size = int(_byte_rate * PRODUCER_CHUNK_DURATION)
+
+    _io = StreamIO(bytes_total=len(data))
+    _io.write(data[:_header_size])
+
+    _stop = threading.Event()
+    _threads = [
+        threading.Thread(target=load, args=(_stop,), daemon=True) \
+            for _ in range(load_threads)
+    ] + [
+        threading.Thread(
+            target=produce,
+            args=(_io, data[_header_size:], _chunk_size, PRODUCER_CHUNK_DURATION / PRODUCER_SPEED),
+            daemon=True,
+        ),
+    ]
+
+    for _thread in _threads:
+        _thread.start()
+
+    _start = timer.perf_counter()
+
+    try:
+        with audio.start_wav_stream(
+            _io,
+            device_index = device_index,
+            bytes_total = len(data) - _header_size,
+            engine = engine,
+        ) as _stream:
+            pass
+    finally:
+        _stop.set()
+
+    _elapsed = timer.perf_counter() - _start
+    _stats = _stream.stream_status.stats
+
+    return {
+        "engine":       engine,
+        "load_threads": load_threads,
+        "duration":     _elapsed,
+        "xruns":        _stream.stream_status.xruns,
+        "xruns_per_minute": _stream.stream_status.xruns / _elapsed * 60,
+        "late_callbacks":   _stats.late_callbacks,
+        "max_load":     _stats.max_load,
+    }
+
+
+def main(
+    argv:List[str] = None,
+)->int:
+    _parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _parser.add_argument("--device-index", type=int, default=None, help="Output device; the default device if not given.")
+    _parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds of audio per run.")
+    _parser.add_argument("--load", type=int, nargs="+", default=DEFAULT_LOAD, help="Numbers of load threads to run with.")
+    _parser.add_argument("--engine", nargs="+", default=["callback", "blocking"], help="Playback engines to compare.")
+    _parser.add_argument("--json", action="store_true", help="Output results as JSON.")
+    _args = _parser.parse_args(argv)
+
+    _data = generate_tone(_args.duration)
+
+    _results = [
+        run(
+            engine = _engine,
+            load_threads = _load,
+            duration = _args.duration,
+            device_index = _args.device_index,
+            data = _data,
+        ) \
+            for _load in _args.load \
+                for _engine in _args.engine
+    ]
+
+    if (_args.json):
+        print (json.dumps(_results, indent=4))
+    else:
+        print (f"{'engine':>10}  {'load':>4}  {'seconds':>8}  {'xruns':>6}  {'per minute':>10}  {'late':>5}  {'max load':>8}")
+        for _result in _results:
+            print (f"{_result['engine']:>10}  {_result['load_threads']:>4}  {_result['duration']:8.1f}  {_result['xruns']:6d}  {_result['xruns_per_minute']:10.1f}  {_result['late_callbacks']:5d}  {_result['max_load']:8.0%}")
+
+    return 0
+
+
+if (__name__=="__main__"):
+    sys.exit(main())
@@ -1,12 +1,38 @@
+import importlib
+from typing import Any
+
 import remote_audio.exceptions as exceptions
-import remote_audio.api as api
+import remote_audio.io as io
+import remote_audio.classes as classes
 
+# Modules that talk to PortAudio or need NumPy are only imported on first access,
+# so that `remote_audio.io` and `remote_audio.classes` can be used on machines without sound hardware or pyaudio.
+_LAZY_MODULES = (
+    "api",
+    "stream",
+    "audio",
+    "speech",
+    "device",
+    "snapshot",
+    "monitor",
+    "output",
+    "mixer",
+    "latency",
+    "null",
+    "capture",
+    "dsp",
+    "buffers",
+    "metrics",
+    "playlist",
+)
 
-import remote_audio.stream as stream
-import remote_audio.io as io
-import remote_audio.audio as audio
-import remote_audio.speech as speech
+def __getattr__(
+    name:str,
+)->Any:
+    if (name in _LAZY_MODULES):
+        return importlib.import_module(f"{__name__}.{name}")
 
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-import remote_audio.device as device
-import remote_audio.classes as classes
\ No newline at end of file
+def __dir__()->list:
+    return sorted(set(globals()) | set(_LAZY_MODULES))
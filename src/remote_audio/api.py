@@ -1,21 +1,139 @@
 #!/usr/bin/env python3
 import os, sys
 from contextlib import redirect_stderr, redirect_stdout
+import threading
+from typing import Any, Callable, Dict
 
-import pyaudio
 
+# PortAudio is only initialised on first use - scanning host APIs and devices is expensive,
+# and processes that only fetch or transcode never need it.
+_pya = None
+_pya_lock = threading.RLock()
 
-pya = None
+# Held while the handle is replaced or a stream is opened on it;
+# hold it to check for streams and refresh() without one being opened in between.
+lock = _pya_lock
 
-def refresh():
+# Streams opened through open_stream() on the shared handle, each with what tells whether it is still in use;
+# all of them are closed when PortAudio is terminated.
+_streams:Dict["pyaudio.Stream", Callable[[], bool]] = {}
+
+def get_pya()->"pyaudio.PyAudio":
+    """
+    Get the PyAudio handle, initialising PortAudio on first call.
+    Thread-safe.
+    """
+
+    _handle = _pya
+
+    if (_handle is None):
+        with _pya_lock:
+            if (_pya is None):
+                refresh()
+
+            _handle = _pya
+
+    return _handle
+
+def refresh(
+    terminate:bool = True,
+    pya:"pyaudio.PyAudio" = None,
+)->"pyaudio.PyAudio":
     """
     Rebuild PyAudio handle
+
+    PortAudio only rescans devices if it is fully terminated before being initialised again;
+    with `terminate`, the previous handle is terminated first, which closes all of its streams.
+
+    `pya` becomes the new handle instead of a new pyaudio.PyAudio, e.g. a `remote_audio.null.NullPyAudio`.
     """
-    
-    global pya
-    with redirect_stdout(open(os.devnull, 'w')):
-        with redirect_stderr(open(os.devnull, 'w')):
-            pya = pyaudio.PyAudio()
 
+    global _pya
+    with _pya_lock:
+        if (terminate and _pya is not None):
+            _pya.terminate()
+            _streams.clear()
+
+        if (pya is None):
+            # Imported here so that importing remote_audio does not require pyaudio
+            import pyaudio
+
+            with open(os.devnull, 'w') as _devnull:
+                with redirect_stdout(_devnull):
+                    with redirect_stderr(_devnull):
+                        pya = pyaudio.PyAudio()
+
+        _pya = pya
+
+        return _pya
+
+def is_initialised()->bool:
+    """
+    Whether PortAudio had been initialised in this process.
+    """
+    return _pya is not None
+
+def open_stream(
+    pya:"pyaudio.PyAudio" = None,
+    busy:Callable[[], bool] = None,
+    **kwargs,
+)->"pyaudio.Stream":
+    """
+    Open a stream through `pya`, or the shared PyAudio handle if not given.
+
+    Streams of the shared handle are tracked until close_stream(), as refresh() would close them;
+    `busy` tells whether the stream is in use, e.g. playing, which defaults to it being active.
+    """
+    with _pya_lock:
+        if (pya is not None):
+            return pya.open(**kwargs)
+
+        _stream = get_pya().open(**kwargs)
+
+        if (busy is None):
+            busy = _stream.is_active
+
+        _streams[_stream] = busy
+
+        return _stream
+
+def close_stream(
+    stream:"pyaudio.Stream",
+)->None:
+    """
+    Stop and close a stream opened through open_stream().
+    Raises OSError if it had already been closed, e.g. by refresh().
+    """
+    with _pya_lock:
+        _streams.pop(stream, None)
+
+    stream.stop_stream()
+    stream.close()
+
+def has_active_streams()->bool:
+    """
+    Whether any stream opened through open_stream() on the current PyAudio handle is in use.
+    """
+    with _pya_lock:
+        _busy = list(_streams.values())
+
+    for _is_busy in _busy:
+        try:
+            if (_is_busy()):
+                return True
+        except OSError as e:
+            # Stream had been closed
+            pass
+
+    return False
+
+def __getattr__(
+    name:str,
+)->Any:
+    """
+    Backward compatibility for `api.pya`, which is now initialised lazily.
+    """
+    if (name == "pya"):
+        return get_pya()
 
-refresh()
\ No newline at end of file
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,29 +1,52 @@
 #!/usr/bin/env python3
 import os, sys
-from typing import Any, BinaryIO, Callable, Dict, Union
+import time as timer
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Tuple, Union
 
 
 import pyaudio
 import wave
 
-from remote_audio import api, device
+from remote_audio import api, buffers, device, dsp, mixer, snapshot
+import remote_audio.latency as latency_profiles
 import remote_audio
 from remote_audio.exceptions import InvalidInputParameters
-from remote_audio.stream import AudioStream, StreamStatus, DEFAULT_TIMEOUT
+from remote_audio.stream import AudioStream, AudioStreamGroup, BlockingAudioStream, PlaybackEngine, StreamStatus, DEFAULT_TIMEOUT
 
 DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_BLOCK_SIZE = 4096   # Frames per write of the blocking engine
+DEFAULT_MAX_CHANNELS = 2    # Devices like ALSA "default" can report 32+ output channels; don't upmix into all of them.
 
 
 def create_stream_callback(
-    wHnd:wave.Wave_read,
+    wHnd:Union[
+        "buffers.FrameReader",
+        wave.Wave_read,
+    ],
     chunk_size:int=DEFAULT_CHUNK_SIZE,
     stream_status:StreamStatus=None,
+    gain_stage:"remote_audio.dsp.GainStage"=None,
     ):
     """
     From a wave_read object, feed chunks of data to the stream.
     To be used with steam_callback in pyaudio methods.
+
+    If `gain_stage` is given, every chunk is passed through it before going to PortAudio.
+
+    Chunks are read into, and handed to PortAudio from, a pool of preallocated buffers;
+    so for a FrameReader, nothing the size of a chunk is allocated once the stream is running.
+
+    The status flags, the time taken by each call and the output latency are recorded in `stream_status.metrics`.
     """
 
+    _reader = buffers.get_frame_reader(wHnd)
+    _pool = buffers.BufferPool(
+        frames=chunk_size,
+        channels=_reader.getnchannels(),
+        sample_width=_reader.getsampwidth(),
+    )
+    _chunk_bytes = chunk_size*_reader.frame_size
+
     def wrapper(
         in_data:Union[
             bytes,
@@ -35,23 +58,132 @@ def create_stream_callback(
         ],
         status_flags:int,
     ):
-        _data = wHnd.readframes(chunk_size)
+        _start = timer.perf_counter()
+
+        if (gain_stage is not None):
+            # A seek waiting for the fade out repositions the source before this chunk is read
+            gain_stage.run_pending()
+
+        _buffer = _pool.next()
+        _size = _reader.readinto(_buffer.view)
 
         if (isinstance(stream_status, StreamStatus)):
+            stream_status.metrics.record_flags(status_flags)
+            stream_status.metrics.record_time_info(time_info)
+
             # Record amount of bytes played to StreamStatus
-            stream_status.played(len(_data))
+            stream_status.played(_size)
+
+            _status = pyaudio.paContinue if (_size or stream_status) else pyaudio.paComplete
+            if (stream_status):
+                # arbitarily keeping stream alive by feeding null bytes, while data is still expected;
+                # once complete, a short buffer ends the stream - PyAudio pads the rest itself
+                _buffer.pad(_size)
+                _size = _chunk_bytes
+        else:
+            _status = pyaudio.paContinue if (_size) else pyaudio.paComplete
 
-            _status = pyaudio.paContinue if (_data or stream_status) else pyaudio.paComplete
-            if (not stream_status.timedout):
-                # arbitarily keeping stream alive by feeding null bytes
-                _data += b"\x00"*(chunk_size*wHnd.getnchannels()*wHnd.getsampwidth()-len(_data))
+        if (_size == _chunk_bytes):
+            # The whole buffer; slices would be new objects
+            _data = _buffer.array
+            _samples = _buffer.samples
         else:
-            _status = pyaudio.paContinue if (_data) else pyaudio.paComplete
+            _data = _buffer.array[:_size]
+            _samples = _buffer.samples[:_size//_reader.frame_size] if (_buffer.samples is not None) else None
+
+        if (gain_stage is not None and _samples is not None):
+            gain_stage.process_into(_samples)
+
+        if (isinstance(stream_status, StreamStatus)):
+            stream_status.metrics.record_callback(timer.perf_counter() - _start, frame_count)
 
         return (_data, _status)
 
     return wrapper
 
+def create_stream_writer(
+    wHnd:Union[
+        "buffers.FrameReader",
+        wave.Wave_read,
+    ],
+    stream_status:StreamStatus,
+    block_size:int=DEFAULT_BLOCK_SIZE,
+    silence_size:int=DEFAULT_CHUNK_SIZE,
+    gain_stage:"remote_audio.dsp.GainStage"=None,
+)->Callable[["pyaudio.Stream"], None]:
+    """
+    From a wave_read object, write blocks of `block_size` frames to a blocking stream until `stream_status` ends.
+    To be run by the writer thread of a BlockingAudioStream.
+
+    If the source is waiting for data, `silence_size` frames of silence are written instead, to keep the stream alive.
+    If `gain_stage` is given, every block is passed through it before being written.
+
+    As in create_stream_callback(), blocks are read into and written from preallocated buffers.
+    The time taken to prepare each block, excluding the blocking write, is recorded in `stream_status.metrics`.
+    """
+
+    _reader = buffers.get_frame_reader(wHnd)
+    _pool = buffers.BufferPool(
+        frames=block_size,
+        channels=_reader.getnchannels(),
+        sample_width=_reader.getsampwidth(),
+    )
+    _frame_size = _reader.frame_size
+    _silence = b"\x00"*(silence_size*_frame_size)
+
+    def writer(
+        stream:"pyaudio.Stream",
+    )->None:
+        # Free space in the buffer before anything is written; if it is back to this, the buffer had run dry.
+        # PyAudio closes the stream on an underflow exception, so underflows have to be detected this way instead.
+        _capacity = None
+
+        while (stream_status):
+            _start = timer.perf_counter()
+
+            if (gain_stage is not None):
+                # As in create_stream_callback()
+                gain_stage.run_pending()
+
+            _buffer = _pool.next()
+            _size = _reader.readinto(_buffer.view)
+
+            if (_size):
+                stream_status.played(_size)
+
+                if (_size == len(_buffer)):
+                    _data = _buffer.array
+                    _samples = _buffer.samples
+                else:
+                    _data = _buffer.array[:_size]
+                    # No samples for 8 and 24-bit, which have no NumPy dtype
+                    _samples = _buffer.samples[:_size//_frame_size] if (_buffer.samples is not None) else None
+
+                if (gain_stage is not None and _samples is not None):
+                    gain_stage.process_into(_samples)
+            elif (stream_status):
+                _data = _silence
+            else:
+                break
+
+            stream_status.metrics.record_callback(timer.perf_counter() - _start, len(_data)//_frame_size)
+
+            try:
+                _available = stream.get_write_available()
+
+                if (_capacity is None):
+                    _capacity = _available
+                elif (_capacity and _available >= _capacity):
+                    # Dry buffer; no flags to tell without a callback
+                    stream_status.metrics.record_underflow()
+
+                stream.write(_data, len(_data)//_frame_size)
+            except OSError as e:
+                # Stream had been closed
+                stream_status.set(False)
+
+    return writer
+
 def start_wav_stream(
     io:Union[
         BinaryIO,
@@ -70,6 +202,20 @@ def start_wav_stream(
     ]=None,
     timeout:float=DEFAULT_TIMEOUT,
     exit_interrupt:bool=False,
+    latency:Union[
+        "latency_profiles.LatencyProfile",
+        str,
+        None,
+    ]=None,
+    engine:Union[
+        PlaybackEngine,
+        str,
+    ]=PlaybackEngine.CALLBACK,
+    block_size:int=DEFAULT_BLOCK_SIZE,
+    pya:"pyaudio.PyAudio"=None,
+    buffer_all:bool=False,
+    gain:float=None,
+    fade:float=None,
     **kwargs,
 )->AudioStream:
     """
@@ -77,6 +223,24 @@ def start_wav_stream(
 
     The stream is non-blocking - an AudioStream object will be returned as soon as the stream starts.
 
+    If `latency` is one of "low", "balanced" or "robust" (see `remote_audio.latency.LatencyProfile`),
+    `chunk_size` and `frames_per_buffer` are derived from the latencies reported by the device,
+    and a StreamIO is buffered according to its measured jitter before the stream starts;
+    this call then blocks until it is, for up to `timeout`, as it does with `buffer_all`.
+    Returns InvalidInputParameters if `latency` is not a known profile.
+
+    With `engine="blocking"`, a writer thread feeds the stream `block_size` frames at a time with blocking writes,
+    instead of PortAudio calling back into Python for every `chunk_size` frames; a BlockingAudioStream is returned.
+    This is more resilient to other Python threads, e.g. downloads and FFmpeg, holding the GIL.
+
+    `pya` replaces the shared PyAudio handle, e.g. with a `remote_audio.null.NullPyAudio` to play without sound hardware.
+    With `buffer_all`, a StreamIO is written completely before the stream starts, so that the producer can never fall behind;
+    for rendering offline, e.g. with a `remote_audio.null.FileAudioDevice`.
+
+    `gain` scales the samples on their way to the device; it can be changed while playing through `AudioStream.gain`.
+    With `fade` seconds, the stream fades in when it starts and out when stopped or seeked, instead of clicking.
+    Neither is supported for 8 and 24-bit audio; InvalidInputParameters is returned if either is asked for.
+
     Returns a AudioStream;
     use this function as context manager:
     ```
@@ -85,9 +249,21 @@ def start_wav_stream(
     ```
     """
 
-    _p = api.pya
+    try:
+        engine = PlaybackEngine(engine)
+    except ValueError as e:
+        return InvalidInputParameters(f"Unknown playback engine {repr(engine)}; expected one of {[ _engine.value for _engine in PlaybackEngine ]}.")
+
+    _p = pya if (pya is not None) else api.get_pya()
 
-    _wHnd = wave.open(io, "rb")
+    _wHnd = buffers.FrameReader.open(io)
+
+    if (((gain is not None and gain != 1) or fade) and isinstance(mixer.get_dtype(_wHnd.getsampwidth()), Exception)):
+        # Would otherwise play at full volume, without a fade
+        _wHnd.close()
+        return InvalidInputParameters(
+            f"gain and fade are not supported for {_wHnd.getsampwidth()*8}-bit audio; only for {[ _width*8 for _width in mixer.SAMPLE_DTYPES ]}-bit."
+        )
 
     if (bytes_total is None):
         if (isinstance(io, str)):
@@ -101,15 +277,98 @@ def start_wav_stream(
             # That means it has .bytes_total,
             # and StreamStatus supports having a StreamIO as bytes_total
             bytes_total = io
+        elif (callable(getattr(io, "seekable", None)) and io.seekable()):
+            # Static file-like object, e.g. a BytesIO; its header is final.
+            # Without a length, a stream would play silence until it timed out - as fast as it can on an unpaced device.
+            bytes_total = (_wHnd.getnframes() - _wHnd.tell()) * _wHnd.frame_size
+
+    if (latency is not None):
+        _buffer_settings = latency_profiles.get_buffer_settings(
+            profile = latency,
+            device_info = get_device_info(device_index, pya=pya),
+            sample_rate = _wHnd.getframerate(),
+            frame_size = _wHnd.getnchannels()*_wHnd.getsampwidth(),
+            write_interval = getattr(io, "write_interval", None),
+            write_jitter = getattr(io, "write_jitter", None),
+        )
+
+        if (isinstance(_buffer_settings, Exception)):
+            return _buffer_settings
+
+        chunk_size = _buffer_settings.chunk_size
+        kwargs["frames_per_buffer"] = _buffer_settings.frames_per_buffer
+
+        if (_buffer_settings.prebuffer_bytes and isinstance(io, remote_audio.io.base_io.StreamIO)):
+            # Absolute position; a StreamIOReader's .tell() already is
+            _prebuffer_until = io.tell() + getattr(io, "bytes_discarded", 0) + _buffer_settings.prebuffer_bytes
+
+            if (isinstance(io.bytes_total, int)):
+                # No point waiting for more than there is
+                _prebuffer_until = min(_prebuffer_until, io.bytes_total)
+
+            io.await_data(
+                size = _prebuffer_until,
+                timeout = timeout if (timeout is not None) else DEFAULT_TIMEOUT,
+                interval = 0.01,
+            )
+
+    if (buffer_all and isinstance(io, remote_audio.io.base_io.StreamIO)):
+        io.await_complete(
+            timeout = timeout if (timeout is not None) else DEFAULT_TIMEOUT,
+        )
 
     # Initiate a StreamStatus
     _stream_status = StreamStatus(
         io=io,
         bytes_total=bytes_total,
         timeout=timeout,
+        sample_rate=_wHnd.getframerate(),
+    )
+
+    _gain_stage = dsp.create_gain_stage(
+        channels=_wHnd.getnchannels(),
+        sample_width=_wHnd.getsampwidth(),
+        sample_rate=_wHnd.getframerate(),
+        gain=gain,
+        fade=fade,
     )
     
-    _stream = _p.open(output_device_index=device_index,
+    if (engine is PlaybackEngine.BLOCKING):
+        _stream = api.open_stream(pya=pya,
+                          busy=_stream_status.__bool__,
+                          output_device_index=device_index,
+                          format=_p.get_format_from_width(_wHnd.getsampwidth()),
+                          channels=_wHnd.getnchannels(),
+                          rate=_wHnd.getframerate(),
+                          output=True,
+                          start=False,
+                          **kwargs,
+        )
+
+        _audio_stream = BlockingAudioStream(
+            _stream,
+            writer=create_stream_writer(
+                wHnd=_wHnd,
+                stream_status=_stream_status,
+                block_size=block_size,
+                silence_size=kwargs.get("frames_per_buffer", None) or chunk_size,
+                gain_stage=_gain_stage,
+            ),
+            timeout=timeout,
+            stream_status=_stream_status,
+            exit_interrupt=exit_interrupt,
+            gain_stage=_gain_stage,
+            wave_read=_wHnd,
+        )
+
+        if (start):
+            _audio_stream.start()
+
+        return _audio_stream
+
+    _stream = api.open_stream(pya=pya,
+                      busy=_stream_status.__bool__,
+                      output_device_index=device_index,
                       format=_p.get_format_from_width(_wHnd.getsampwidth()),
                       channels=_wHnd.getnchannels(),
                       rate=_wHnd.getframerate(),
@@ -119,6 +378,7 @@ def start_wav_stream(
                           wHnd=_wHnd,
                           chunk_size=chunk_size,
                           stream_status=_stream_status,
+                          gain_stage=_gain_stage,
                       ),
                       **kwargs,
     )
@@ -129,6 +389,147 @@ def start_wav_stream(
         timeout=timeout,
         stream_status=_stream_status,
         exit_interrupt=exit_interrupt,
+        gain_stage=_gain_stage,
+        wave_read=_wHnd,
+    )
+
+def start_shared_wav_stream(
+    io:"remote_audio.io.base_io.StreamIO",
+    device_indices:Iterable[Union[
+        int,
+        None
+    ]],
+    chunk_size:int=DEFAULT_CHUNK_SIZE,
+    start:bool=True,
+    timeout:float=DEFAULT_TIMEOUT,
+    exit_interrupt:bool=False,
+    **kwargs,
+)->Union[
+    AudioStreamGroup,
+    Exception,
+]:
+    """
+    Play one StreamIO on several devices at once.
+
+    The source is decoded/downloaded only once; each device gets its own StreamIOReader over the shared buffer,
+    and data is freed once the slowest device had played it.
+
+    If any of the streams cannot be started, the others are closed and the error is returned.
+
+    Returns a AudioStreamGroup;
+    use this function as context manager:
+    ```
+    with start_shared_wav_stream(io, [device_index1, device_index2]) as _streams:
+        pass
+    ```
+    """
+
+    # Iterated twice below
+    device_indices = list(device_indices)
+
+    # Create all the readers before any stream starts, so that they all get the header.
+    _readers = [ io.reader() for _ in device_indices ]
+
+    _streams = []
+    for _reader, _device_index in zip(_readers, device_indices):
+        _stream = start_wav_stream(
+            io =            _reader,
+            device_index =  _device_index,
+            chunk_size =    chunk_size,
+            start =         False,
+            timeout =       timeout,
+            exit_interrupt= exit_interrupt,
+            **kwargs,
+        )
+
+        if (isinstance(_stream, Exception)):
+            for _started in _streams:
+                _started.stop()
+
+            for _reader in _readers:
+                _reader.close()
+
+            return _stream
+
+        _streams.append(_stream)
+
+    _group = AudioStreamGroup(_streams)
+
+    if (start):
+        _group.start()
+
+    return _group
+
+def get_device_info(
+    device_index:Union[
+        int,
+        None
+    ]=None,
+    pya:"pyaudio.PyAudio"=None,
+)->Dict[str, Any]:
+    """
+    Get the PortAudio device info of an output device, from the device snapshot where possible.
+
+    If `device_index` is None, the default output device is used.
+    If `pya` is given, the device is looked up from it directly instead.
+    """
+
+    _device_info = None
+
+    if (pya is None):
+        _device_snapshot = snapshot.get_snapshot()
+
+        _device_info = _device_snapshot.get_info(
+            _device_snapshot.default_output_index if (device_index is None) else device_index
+        )
+
+    if (_device_info is None):
+        _p = pya if (pya is not None) else api.get_pya()
+
+        if (device_index is None):
+            _device_info = _p.get_default_output_device_info()
+        else:
+            _device_info = _p.get_device_info_by_index(device_index=device_index)
+
+    return _device_info
+
+def get_native_format(
+    device_info:Dict[str, Any],
+    input:bool=False,
+    max_channels:int=DEFAULT_MAX_CHANNELS,
+)->Tuple[int, int]:
+    """
+    The native (sample_rate, channels) in `device_info`, as returned by PyAudio; for capturing if `input`, or playback.
+    Channels are capped to `max_channels`. Either is None if the device does not report it.
+    """
+
+    _sample_rate = int(device_info.get("defaultSampleRate", None) or 0) or None
+    _channels = int(device_info.get("maxInputChannels" if (input) else "maxOutputChannels", None) or 0) or None
+
+    if (_channels and max_channels):
+        _channels = min(_channels, max_channels)
+
+    return _sample_rate, _channels
+
+def get_output_format(
+    device_index:Union[
+        int,
+        None
+    ]=None,
+    max_channels:int=DEFAULT_MAX_CHANNELS,
+    pya:"pyaudio.PyAudio"=None,
+)->Tuple[int, int]:
+    """
+    Get the native (sample_rate, channels) of an output device,
+    so that FFmpeg can convert to exactly what the device will play.
+
+    If `device_index` is None, the default output device is used.
+    Channels are capped to `max_channels`.
+    """
+
+    return get_native_format(
+        get_device_info(device_index, pya=pya),
+        max_channels=max_channels,
     )
 
 def get_format_class(
@@ -139,17 +540,68 @@ def get_format_class(
 ]:
     """
     Look for the relevant StreamIO class that corresponds to `format`.
+    `format` can be a FFmpeg format or any of its aliases, a file extension, a MIME type or a codec.
     Returns None if not found.
     """
 
-    format = format.upper()
+    return remote_audio.classes.get_format_class(format)
 
-    _wav_formats = ("WAV", "WAVE")
+def _play_source(
+    kind:str,
+    source:Union[
+        str,
+        bytes,
+    ],
+    format:str=None,
+    device_index:Union[
+        int,
+        None
+    ]=None,
+    chunk_size:int=DEFAULT_CHUNK_SIZE,
+    start:bool=True,
+    bytes_total:Union[
+        int,
+        "remote_audio.io.base_io.StreamIO",
+        None,
+    ]=None,
+    timeout:float=DEFAULT_TIMEOUT,
+    exit_interrupt:bool=False,
+    callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+    sample_rate:int=None,
+    channels:int=None,
+    start_at:Union[float, str]=None,
+    end_at:Union[float, str]=None,
+    **kwargs,
+)->AudioStream:
+    """
+    Open `source` through `remote_audio.classes.open_source` and play it; see play_file, play_http and play_bytes.
+    """
 
-    if (format in _wav_formats):
-        return remote_audio.io.base_io.WaveStreamIO
-    else:
-        return getattr(remote_audio.classes, f"{format}StreamIO", None)
+    _io = remote_audio.classes.open_source(
+        kind =          kind,
+        source =        source,
+        format =        format,
+        sample_rate =   sample_rate,
+        channels =      channels,
+        output_format = lambda: get_output_format(device_index, pya=kwargs.get("pya", None)),
+        callback =      callback,
+        start_at =      start_at,
+        end_at =        end_at,
+    )
+
+    if (isinstance(_io, Exception)):
+        return _io
+
+    return start_wav_stream(
+        io =            _io,
+        device_index =  device_index,
+        chunk_size =    chunk_size,
+        start =         start,
+        bytes_total =   bytes_total,
+        timeout =       timeout,
+        exit_interrupt= exit_interrupt,
+        **kwargs,
+    )
 
 def play_file(
     path:str,
@@ -168,12 +620,21 @@ def play_file(
     timeout:float=DEFAULT_TIMEOUT,
     exit_interrupt:bool=False,
     callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+    sample_rate:int=None,
+    channels:int=None,
+    start_at:Union[float, str]=None,
+    end_at:Union[float, str]=None,
     **kwargs,
 )->AudioStream:
     """
     Play a local audio file.
     If `format` is not provided, it will use the file suffix.
 
+    Non-WAV formats are decoded by FFmpeg directly into `sample_rate` and `channels`;
+    if not provided, the native format of the output device is used.
+
+    `start_at` and `end_at` (in seconds, or FFmpeg time duration strings) limit playback to part of the source.
+
     Returns a AudioStream;
     use this function as context manager:
     ```
@@ -181,34 +642,24 @@ def play_file(
         pass
     ```
     """
-    if (not format):
-        format = path.split(".")[-1]
-    _format_class = get_format_class(format)
-
-    if (_format_class):
-        _io = _format_class.from_file(
-            path =          path,
-            callback =      callback,
-        )
-
-        if (not isinstance(_io, Exception)):
-            
-            return start_wav_stream(
-                io =            _io,
-                device_index =  device_index,
-                chunk_size =    chunk_size,
-                start =         start,
-                bytes_total =   bytes_total,
-                timeout =       timeout,
-                exit_interrupt= exit_interrupt,
-                **kwargs,
-            )
 
-        else:
-
-            return _io
-    else:
-        return InvalidInputParameters(f"{format} is not a valid format.")
+    return _play_source(
+        kind =          "file",
+        source =        path,
+        format =        format,
+        device_index =  device_index,
+        chunk_size =    chunk_size,
+        start =         start,
+        bytes_total =   bytes_total,
+        timeout =       timeout,
+        exit_interrupt= exit_interrupt,
+        callback =      callback,
+        sample_rate =   sample_rate,
+        channels =      channels,
+        start_at =      start_at,
+        end_at =        end_at,
+        **kwargs,
+    )
 
 def play_http(
     url:str,
@@ -227,11 +678,20 @@ def play_http(
     timeout:float=DEFAULT_TIMEOUT,
     exit_interrupt:bool=False,
     callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+    sample_rate:int=None,
+    channels:int=None,
+    start_at:Union[float, str]=None,
+    end_at:Union[float, str]=None,
     **kwargs,
 )->AudioStream:
     """
     Play an audio file over HTTP.
-    If `format` is not provided, it will use the file suffix.
+    If `format` is not provided, it will use the file suffix, or failing that the Content-Type returned by the server.
+
+    Non-WAV formats are decoded by FFmpeg directly into `sample_rate` and `channels`;
+    if not provided, the native format of the output device is used.
+
+    `start_at` and `end_at` (in seconds, or FFmpeg time duration strings) limit playback to part of the source.
 
     Returns a AudioStream;
     use this function as context manager:
@@ -241,30 +701,71 @@ def play_http(
     ```
     """
 
-    if (not format):
-        format = url.split(".")[-1]
-    _format_class = get_format_class(format)
+    return _play_source(
+        kind =          "http",
+        source =        url,
+        format =        format,
+        device_index =  device_index,
+        chunk_size =    chunk_size,
+        start =         start,
+        bytes_total =   bytes_total,
+        timeout =       timeout,
+        exit_interrupt= exit_interrupt,
+        callback =      callback,
+        sample_rate =   sample_rate,
+        channels =      channels,
+        start_at =      start_at,
+        end_at =        end_at,
+        **kwargs,
+    )
 
-    if (_format_class):
-        _io = _format_class.from_http(
-            url =           url,
-            callback =      callback,
-        )
-        
-        if (not isinstance(_io, Exception)):
-
-            return start_wav_stream(
-                io =            _io,
-                device_index =  device_index,
-                chunk_size =    chunk_size,
-                start =         start,
-                bytes_total =   bytes_total,
-                timeout =       timeout,
-                exit_interrupt= exit_interrupt,
-                **kwargs,
-            )
-        
-        else:
-            return _io
-    else:
-        return InvalidInputParameters(f"{format} is not a valid format.")
\ No newline at end of file
+def play_bytes(
+    data:bytes,
+    format:str,
+    device_index:Union[
+        int,
+        None
+    ]=None,
+    chunk_size:int=DEFAULT_CHUNK_SIZE,
+    start:bool=True,
+    bytes_total:Union[
+        int,
+        "remote_audio.io.base_io.StreamIO",
+        None,
+    ]=None,
+    timeout:float=DEFAULT_TIMEOUT,
+    exit_interrupt:bool=False,
+    callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+    sample_rate:int=None,
+    channels:int=None,
+    **kwargs,
+)->AudioStream:
+    """
+    Play audio data already in memory, e.g. a compressed clip.
+    `format` is required, as there is no file suffix to go by.
+
+    Non-WAV data is piped into FFmpeg by a background thread, so this returns without waiting for the decoder.
+
+    Returns a AudioStream;
+    use this function as context manager:
+    ```
+    with play_bytes(_mp3_data, "mp3", device_index=device_index) as _stream:
+        pass
+    ```
+    """
+
+    return _play_source(
+        kind =          "bytes",
+        source =        data,
+        format =        format,
+        device_index =  device_index,
+        chunk_size =    chunk_size,
+        start =         start,
+        bytes_total =   bytes_total,
+        timeout =       timeout,
+        exit_interrupt= exit_interrupt,
+        callback =      callback,
+        sample_rate =   sample_rate,
+        channels =      channels,
+        **kwargs,
+    )
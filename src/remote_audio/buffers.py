@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+import io
+import wave
+from typing import BinaryIO, Iterator, Union
+
+import numpy as np
+
+from remote_audio import mixer
+
+"""
+Preallocated buffers for the playback path.
+
+PyAudio copies the output of a stream callback, and the frames of a blocking write, before it returns;
+so the same memory can be filled in place and handed to it again and again, instead of allocating new bytes for every buffer.
+PyAudio takes any read-only buffer without a release hook for these - which NumPy arrays are, but bytearray and memoryview are not -
+so every buffer is handed over as a NumPy view.
+"""
+
+DEFAULT_POOL_SIZE = 2       # Buffers in rotation; the one just handed over is never the one being filled
+
+
+class PooledBuffer():
+    """
+    One preallocated buffer of `frames` frames, with the views the playback path needs of it:
+    - .view:    memoryview, for .readinto();
+    - .array:   uint8 NumPy array, to hand to PyAudio;
+    - .samples: (frames, channels) NumPy array of samples, if there is a dtype for the sample width; None otherwise.
+    """
+
+    __slots__ = ("data", "view", "array", "samples", "frames", "frame_size")
+
+    def __init__(
+        self,
+        frames:int,
+        channels:int,
+        sample_width:int,
+    )->None:
+        self.frames = frames
+        self.frame_size = channels * sample_width
+
+        self.data = bytearray(frames * self.frame_size)
+        self.view = memoryview(self.data)
+        self.array = np.frombuffer(self.data, dtype=np.uint8)
+
+        _dtype = mixer.get_dtype(sample_width)
+        self.samples = None if (isinstance(_dtype, Exception)) else self.array.view(_dtype).reshape(frames, channels)
+
+    def __len__(
+        self,
+    )->int:
+        return len(self.data)
+
+    def pad(
+        self,
+        size:int,
+    )->None:
+        """
+        Fill the buffer with silence from byte `size` onwards.
+        """
+        if (size < len(self.data)):
+            self.array[size:] = 0
+
+
+class BufferPool():
+    """
+    A small ring of PooledBuffers of the same size, reused in turn.
+    """
+
+    def __init__(
+        self,
+        frames:int,
+        channels:int,
+        sample_width:int,
+        size:int = DEFAULT_POOL_SIZE,
+    )->None:
+        self.frames = frames
+        self.buffers = [
+            PooledBuffer(frames, channels, sample_width) \
+                for _ in range(max(size, 1))
+        ]
+        self._index = 0
+
+    def __len__(
+        self,
+    )->int:
+        return len(self.buffers)
+
+    def __iter__(
+        self,
+    )->Iterator[PooledBuffer]:
+        return iter(self.buffers)
+
+    def next(
+        self,
+    )->PooledBuffer:
+        """
+        The next buffer in rotation, to be filled.
+        """
+        self._index = (self._index + 1) % len(self.buffers)
+        return self.buffers[self._index]
+
+
+class FrameReader():
+    """
+    Reads the frames of a WAV source straight into a buffer with .readinto(), instead of allocating them like wave.Wave_read.readframes().
+
+    Stands in for the opened wave.Wave_read elsewhere: the format getters, .getnframes(), .tell() and .setpos() are the same.
+    Without `file`, the file underneath `wave_read` is not known; frames are then read with .readframes() and copied.
+    """
+
+    def __init__(
+        self,
+        wave_read:wave.Wave_read,
+        file:BinaryIO = None,
+        close_file:bool = False,
+    )->None:
+        self.wave_read = wave_read
+        self.file = file
+        self.close_file = close_file
+
+        self.frame_size = wave_read.getnchannels() * wave_read.getsampwidth()
+        self.offset = 0                 # Bytes into the data; a source still being written can return part of a frame
+
+        # Having parsed the header, wave leaves the file at the start of the data
+        try:
+            self.data_start = file.tell() if (file is not None) else None
+        except (OSError, AttributeError) as e:
+            self.data_start = None
+
+        self._readinto = getattr(file, "readinto", None)
+
+    @classmethod
+    def open(
+        cls,
+        io:Union[
+            BinaryIO,
+            str,
+        ],
+    )->"FrameReader":
+        """
+        Open a WAV file path, or a file-like object positioned at the start of a WAV header.
+        """
+        if (isinstance(io, str)):
+            _file = open(io, "rb")
+
+            try:
+                return cls(wave.open(_file, "rb"), _file, close_file=True)
+            except (wave.Error, EOFError) as e:
+                _file.close()
+                raise e
+        else:
+            return cls(wave.open(io, "rb"), io)
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(file={repr(self.file)}, position={self.position}, nframes={self.getnframes()})"
+
+    def getnchannels(
+        self,
+    )->int:
+        return self.wave_read.getnchannels()
+
+    def getsampwidth(
+        self,
+    )->int:
+        return self.wave_read.getsampwidth()
+
+    def getframerate(
+        self,
+    )->int:
+        return self.wave_read.getframerate()
+
+    def getnframes(
+        self,
+    )->int:
+        return self.wave_read.getnframes()
+
+    @property
+    def position(
+        self,
+    )->int:
+        return self.offset // self.frame_size
+
+    def tell(
+        self,
+    )->int:
+        return self.position
+
+    def setpos(
+        self,
+        pos:int,
+    )->None:
+        """
+        Move to frame `pos`; the source has to be seekable.
+        """
+        if (not 0 <= pos <= self.getnframes()):
+            raise wave.Error("position not in range")
+
+        if (self.file is None):
+            self.wave_read.setpos(pos)
+        elif (self.data_start is None):
+            raise io.UnsupportedOperation(f"{type(self.file).__name__} cannot be seeked.")
+        else:
+            self.file.seek(self.data_start + pos * self.frame_size, io.SEEK_SET)
+
+        self.offset = pos * self.frame_size
+
+    def readinto(
+        self,
+        buffer:memoryview,
+    )->int:
+        """
+        Read as many whole frames as fit into `buffer`, without going past the end of the data.
+        Returns the number of bytes read, which can be short if the source is still being written.
+        """
+        _size = min(len(buffer) // self.frame_size * self.frame_size, self.getnframes() * self.frame_size - self.offset)
+
+        if (_size <= 0):
+            return 0
+
+        if (_size < len(buffer)):
+            buffer = buffer[:_size]
+
+        if (self._readinto is not None):
+            _bytes_read = self._readinto(buffer) or 0
+        else:
+            _data = self.file.read(_size) if (self.file is not None) else self.wave_read.readframes(_size // self.frame_size)
+            _bytes_read = len(_data)
+            buffer[:_bytes_read] = _data
+
+        self.offset += _bytes_read
+
+        return _bytes_read
+
+    def readframes(
+        self,
+        nframes:int,
+    )->bytes:
+        """
+        Same as wave.Wave_read.readframes(); allocates.
+        """
+        _buffer = bytearray(nframes * self.frame_size)
+        return bytes(_buffer[:self.readinto(memoryview(_buffer))])
+
+    def close(
+        self,
+    )->None:
+        if (self.close_file):
+            self.file.close()
+
+
+def get_frame_reader(
+    wave_read:Union[
+        FrameReader,
+        wave.Wave_read,
+    ],
+)->FrameReader:
+    """
+    `wave_read` as a FrameReader.
+    """
+    return wave_read if (isinstance(wave_read, FrameReader)) else FrameReader(wave_read)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+
+import collections
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+from remote_audio import api
+import remote_audio.io.base_io as base_io
+import remote_audio.io.file as file
+from remote_audio.exceptions import DeviceNotFound
+
+"""
+Capture from input devices into a StreamIO.
+
+The PortAudio input callback does nothing but append each chunk to a bounded queue;
+a pump thread moves the chunks into the StreamIO - either raw, as WAV that can be played straight back
+with `start_wav_stream`, or through FFmpeg into a compressed format such as opus.
+"""
+
+DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_MAX_BUFFERED = 64           # Chunks waiting for the pump before new ones are dropped
+DEFAULT_SAMPLE_RATE = 48000
+DEFAULT_CHANNELS = 1
+SAMPLE_WIDTH = 2                    # Always 16-bit, which is what FFmpeg is told to expect
+
+# Same values as in pyaudio, without having to import pyaudio
+PA_CONTINUE = 0
+PA_COMPLETE = 1
+PA_INT16 = 8
+PA_INPUT_OVERFLOW = 2
+
+
+class CaptureStream():
+    """
+    Records from an input device into `io`, a StreamIO.
+
+    Usage:
+    ```
+    with AudioDevice.find_first(input=True).record() as _capture:
+        _other_device.start_wav_stream(_capture.io)
+        ...
+    ```
+
+    If the pump falls more than `max_buffered` chunks behind, new chunks are dropped and counted in .chunks_dropped,
+    so that PortAudio's thread is never blocked. Overflows reported by PortAudio itself are counted in .input_overflows.
+    """
+
+    def __init__(
+        self,
+        io:"base_io.StreamIO",
+        device_index:int = None,
+        sample_rate:int = DEFAULT_SAMPLE_RATE,
+        channels:int = DEFAULT_CHANNELS,
+        chunk_size:int = DEFAULT_CHUNK_SIZE,
+        max_buffered:int = DEFAULT_MAX_BUFFERED,
+        start:bool = True,
+        pya:"pyaudio.PyAudio" = None,
+        **kwargs,
+    )->None:
+        self.io = io
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_size = chunk_size
+        self.max_buffered = max_buffered
+
+        self.bytes_captured = 0
+        self.chunks_dropped = 0
+        self.input_overflows = 0
+
+        # deque.append and .popleft are atomic, so the callback does not need a lock
+        self._chunks = collections.deque()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._pump_thread = None
+
+        self.stream = api.open_stream(
+            pya=pya,
+            input_device_index=device_index,
+            format=PA_INT16,
+            channels=channels,
+            rate=sample_rate,
+            input=True,
+            frames_per_buffer=chunk_size,
+            start=False,
+            stream_callback=self._callback,
+            **kwargs,
+        )
+
+        if (start):
+            self.start()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(device_index={repr(self.device_index)}, sample_rate={self.sample_rate}, channels={self.channels}, captured={self.bytes_captured:,}, dropped={self.chunks_dropped}, recording={self.recording})"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    @property
+    def recording(
+        self,
+    )->bool:
+        return self._pump_thread is not None and not self._stopped.is_set()
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * SAMPLE_WIDTH
+
+    def _callback(
+        self,
+        in_data:Union[
+            bytes,
+            None,
+        ],
+        frame_count:int,
+        time_info:Dict[
+            str, Any
+        ],
+        status_flags:int,
+    )->Tuple[None, int]:
+        if (status_flags & PA_INPUT_OVERFLOW):
+            self.input_overflows += 1
+
+        if (in_data):
+            if (len(self._chunks) >= self.max_buffered):
+                self.chunks_dropped += 1
+            else:
+                self._chunks.append(in_data)
+                self._ready.set()
+
+        return (None, PA_COMPLETE if self._stopped.is_set() else PA_CONTINUE)
+
+    def _pump(
+        self,
+    )->None:
+        """
+        Move captured chunks into `io` until stopped and drained.
+        """
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+
+            while (self._chunks):
+                _chunk = self._chunks.popleft()
+                self.io.write(_chunk)
+                self.bytes_captured += len(_chunk)
+
+            if (self._stopped.is_set() and not self._chunks):
+                break
+
+    def start(
+        self,
+    )->None:
+        if (self._pump_thread is None):
+            self._pump_thread = threading.Thread(
+                target = self._pump,
+                name = type(self).__name__,
+                daemon = True,
+            )
+            self._pump_thread.start()
+
+            self.stream.start_stream()
+
+    def stop(
+        self,
+    )->None:
+        """
+        Stop capturing, deliver whatever was captured into `io`, and mark `io` as complete.
+        """
+        if (self._stopped.is_set()):
+            return
+
+        try:
+            api.close_stream(self.stream)
+        except OSError as e:
+            # Already closed, e.g. PortAudio had been terminated by api.refresh()
+            pass
+
+        self._stopped.set()
+        self._ready.set()
+
+        if (self._pump_thread is not None and self._pump_thread is not threading.current_thread()):
+            self._pump_thread.join()
+
+        if (callable(getattr(self.io, "close_input", None))):
+            # Encoder; .bytes_total is set once it had finished
+            self.io.close_input()
+        else:
+            self.io.bytes_total = self.io.bytes_written
+
+
+def record(
+    device_index:int = None,
+    format:str = None,
+    sample_rate:int = None,
+    channels:int = None,
+    chunk_size:int = DEFAULT_CHUNK_SIZE,
+    max_buffered:int = DEFAULT_MAX_BUFFERED,
+    start:bool = True,
+    options:Iterable["remote_audio.io.ffmpeg.classes.FFmpegOption"] = [],
+    callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+    pya:"pyaudio.PyAudio" = None,
+    **kwargs,
+)->Union[
+    CaptureStream,
+    Exception,
+]:
+    """
+    Start capturing from an input device; the default input device if `device_index` is None.
+
+    Without `format`, the CaptureStream's .io is a StreamIO of WAV data, which can be played back with `start_wav_stream`.
+    With `format`, e.g. "opus", the audio is encoded by FFmpeg into a FFmpegEncoderStreamIO as it is captured;
+    `options` are passed to FFmpeg as extra output options, and `callback` is called when it finishes.
+
+    Unless specified, `sample_rate` and `channels` are the native format of the device.
+    Returns DeviceNotFound if the device cannot capture.
+    """
+
+    _p = pya if (pya is not None) else api.get_pya()
+
+    try:
+        _device_info = _p.get_default_input_device_info() if (device_index is None) else _p.get_device_info_by_index(device_index)
+    except OSError as e:
+        return DeviceNotFound(f"No input device #{device_index} found: {str(e)}")
+
+    _max_channels = int(_device_info.get("maxInputChannels", 0))
+
+    if (not _max_channels):
+        return DeviceNotFound(f"Device {repr(_device_info.get('name', device_index))} cannot capture.")
+
+    sample_rate = int(sample_rate or _device_info.get("defaultSampleRate", 0) or DEFAULT_SAMPLE_RATE)
+    channels = int(channels or min(_max_channels, 2))
+
+    if (format):
+        import remote_audio.classes as classes
+
+        _io = classes.FFmpegEncoderStreamIO(
+            format = format,
+            sample_rate = sample_rate,
+            channels = channels,
+            options = options,
+            callback = callback,
+        )
+    else:
+        _io = base_io.StreamIO(
+            file.WavHeader.new(
+                file.WAV_MAX_CHUNKSIZE,     # Length is unknown until capture stops
+                NumChannels = channels,
+                SampleRate = sample_rate,
+                BitsPerSample = SAMPLE_WIDTH * 8,
+            ).construct()
+        )
+
+    return CaptureStream(
+        io = _io,
+        device_index = device_index,
+        sample_rate = sample_rate,
+        channels = channels,
+        chunk_size = chunk_size,
+        max_buffered = max_buffered,
+        start = start,
+        pya = pya,
+        **kwargs,
+    )
@@ -2,394 +2,117 @@
 
 # Collection of all StreamIO classes.
 
+from typing import Callable, Tuple, Union
+
 from remote_audio.io.base_io import StreamIO, \
+                                    StreamIOReader, \
                                     WaveStreamIO
 
 from remote_audio.io.advanced_io import FFmpegStreamIO, \
-                                        A64StreamIO, \
-                                        AACStreamIO, \
-                                        AAStreamIO, \
-                                        AAXStreamIO, \
-                                        AC3StreamIO, \
-                                        ACEStreamIO, \
-                                        ACMStreamIO, \
-                                        ACTStreamIO, \
-                                        ADFStreamIO, \
-                                        ADPStreamIO, \
-                                        ADSStreamIO, \
-                                        ADTSStreamIO, \
-                                        ADXStreamIO, \
-                                        AEAStreamIO, \
-                                        AFCStreamIO, \
-                                        AIFFStreamIO, \
-                                        AIXStreamIO, \
-                                        ALAWStreamIO, \
-                                        ALIAS_PIXStreamIO, \
-                                        ALPStreamIO, \
-                                        AMRNBStreamIO, \
-                                        AMRStreamIO, \
-                                        AMRWBStreamIO, \
-                                        AMVStreamIO, \
-                                        ANMStreamIO, \
-                                        APCStreamIO, \
-                                        APEStreamIO, \
-                                        APMStreamIO, \
-                                        APNGStreamIO, \
-                                        APTXStreamIO, \
-                                        APTX_HDStreamIO, \
-                                        AQTITLEStreamIO, \
-                                        ARGO_ASFStreamIO, \
-                                        ARGO_BRPStreamIO, \
-                                        ARGO_CVGStreamIO, \
-                                        ASFStreamIO, \
-                                        ASF_OStreamIO, \
-                                        ASF_STREAMStreamIO, \
-                                        ASSStreamIO, \
-                                        ASTStreamIO, \
-                                        AUDIOTOOLBOXStreamIO, \
-                                        AUStreamIO, \
-                                        AV1StreamIO, \
-                                        AVFOUNDATIONStreamIO, \
-                                        AVIStreamIO, \
-                                        AVM2StreamIO, \
-                                        AVRStreamIO, \
-                                        AVS2StreamIO, \
-                                        AVS3StreamIO, \
-                                        AVSStreamIO, \
-                                        BETHSOFTVIDStreamIO, \
-                                        BFIStreamIO, \
-                                        BFSTMStreamIO, \
-                                        BINKAStreamIO, \
-                                        BINKStreamIO, \
-                                        BINStreamIO, \
-                                        BITPACKEDStreamIO, \
-                                        BITStreamIO, \
-                                        BMP_PIPEStreamIO, \
-                                        BMVStreamIO, \
-                                        BOAStreamIO, \
-                                        BRENDER_PIXStreamIO, \
-                                        BRSTMStreamIO, \
-                                        C93StreamIO, \
-                                        CAFStreamIO, \
-                                        CAVSVIDEOStreamIO, \
-                                        CDGStreamIO, \
-                                        CDXLStreamIO, \
-                                        CINEStreamIO, \
-                                        CODEC2RAWStreamIO, \
-                                        CODEC2StreamIO, \
-                                        CONCATStreamIO, \
-                                        CRCStreamIO, \
-                                        CRI_PIPEStreamIO, \
-                                        DASHStreamIO, \
-                                        DATAStreamIO, \
-                                        DAUDStreamIO, \
-                                        DCSTRStreamIO, \
-                                        DDS_PIPEStreamIO, \
-                                        DERFStreamIO, \
-                                        DFAStreamIO, \
-                                        DHAVStreamIO, \
-                                        DIRACStreamIO, \
-                                        DNXHDStreamIO, \
-                                        DPX_PIPEStreamIO, \
-                                        DSFStreamIO, \
-                                        DSICINStreamIO, \
-                                        DSSStreamIO, \
-                                        DTSHDStreamIO, \
-                                        DTSStreamIO, \
-                                        DVBSUBStreamIO, \
-                                        DVBTXTStreamIO, \
-                                        DVDStreamIO, \
-                                        DVStreamIO, \
-                                        DXAStreamIO, \
-                                        EAC3StreamIO, \
-                                        EAStreamIO, \
-                                        EA_CDATAStreamIO, \
-                                        EPAFStreamIO, \
-                                        EXR_PIPEStreamIO, \
-                                        F32BEStreamIO, \
-                                        F32LEStreamIO, \
-                                        F4VStreamIO, \
-                                        F64BEStreamIO, \
-                                        F64LEStreamIO, \
-                                        FFMETADATAStreamIO, \
-                                        FIFOStreamIO, \
-                                        FIFO_TESTStreamIO, \
-                                        FILMSTRIPStreamIO, \
-                                        FILM_CPKStreamIO, \
-                                        FITSStreamIO, \
-                                        FLACStreamIO, \
-                                        FLICStreamIO, \
-                                        FLVStreamIO, \
-                                        FRAMECRCStreamIO, \
-                                        FRAMEHASHStreamIO, \
-                                        FRAMEMD5StreamIO, \
-                                        FRMStreamIO, \
-                                        FSBStreamIO, \
-                                        FWSEStreamIO, \
-                                        G722StreamIO, \
-                                        G723_1StreamIO, \
-                                        G726LEStreamIO, \
-                                        G726StreamIO, \
-                                        G729StreamIO, \
-                                        GDVStreamIO, \
-                                        GEM_PIPEStreamIO, \
-                                        GENHStreamIO, \
-                                        GIFStreamIO, \
-                                        GIF_PIPEStreamIO, \
-                                        GSMStreamIO, \
-                                        GXFStreamIO, \
-                                        H261StreamIO, \
-                                        H263StreamIO, \
-                                        H264StreamIO, \
-                                        HASHStreamIO, \
-                                        HCAStreamIO, \
-                                        HCOMStreamIO, \
-                                        HDSStreamIO, \
-                                        HEVCStreamIO, \
-                                        HLSStreamIO, \
-                                        HNMStreamIO, \
-                                        ICOStreamIO, \
-                                        IDCINStreamIO, \
-                                        IDFStreamIO, \
-                                        IFFStreamIO, \
-                                        IFVStreamIO, \
-                                        ILBCStreamIO, \
-                                        IMAGE2PIPEStreamIO, \
-                                        IMAGE2StreamIO, \
-                                        IMFStreamIO, \
-                                        INGENIENTStreamIO, \
-                                        IPMOVIEStreamIO, \
-                                        IPODStreamIO, \
-                                        IPUStreamIO, \
-                                        IRCAMStreamIO, \
-                                        ISMVStreamIO, \
-                                        ISSStreamIO, \
-                                        IV8StreamIO, \
-                                        IVFStreamIO, \
-                                        IVRStreamIO, \
-                                        J2K_PIPEStreamIO, \
-                                        JACOSUBStreamIO, \
-                                        JPEGLS_PIPEStreamIO, \
-                                        JPEG_PIPEStreamIO, \
-                                        JVStreamIO, \
-                                        KUXStreamIO, \
-                                        KVAGStreamIO, \
-                                        LATMStreamIO, \
-                                        LAVFIStreamIO, \
-                                        LIVE_FLVStreamIO, \
-                                        LMLM4StreamIO, \
-                                        LOASStreamIO, \
-                                        LRCStreamIO, \
-                                        LUODATStreamIO, \
-                                        LVFStreamIO, \
-                                        LXFStreamIO, \
-                                        M4AStreamIO, \
-                                        M4VStreamIO, \
-                                        MATROSKAStreamIO, \
-                                        MCAStreamIO, \
-                                        MCCStreamIO, \
-                                        MD5StreamIO, \
-                                        MGSTSStreamIO, \
-                                        MICRODVDStreamIO, \
-                                        MJ2StreamIO, \
-                                        MJPEGStreamIO, \
-                                        MJPEG_2000StreamIO, \
-                                        MKVTIMESTAMP_V2StreamIO, \
-                                        MLPStreamIO, \
-                                        MLVStreamIO, \
-                                        MMFStreamIO, \
-                                        MMStreamIO, \
-                                        MODSStreamIO, \
-                                        MOFLEXStreamIO, \
-                                        MOVStreamIO, \
-                                        MP2StreamIO, \
-                                        MP3StreamIO, \
-                                        MP4StreamIO, \
-                                        MPC8StreamIO, \
-                                        MPCStreamIO, \
-                                        MPEG1VIDEOStreamIO, \
-                                        MPEG2VIDEOStreamIO, \
-                                        MPEGStreamIO, \
-                                        MPEGTSRAWStreamIO, \
-                                        MPEGTSStreamIO, \
-                                        MPEGVIDEOStreamIO, \
-                                        MPJPEGStreamIO, \
-                                        MPL2StreamIO, \
-                                        MPSUBStreamIO, \
-                                        MSFStreamIO, \
-                                        MSNWCTCPStreamIO, \
-                                        MSPStreamIO, \
-                                        MTAFStreamIO, \
-                                        MTVStreamIO, \
-                                        MULAWStreamIO, \
-                                        MUSXStreamIO, \
-                                        MVIStreamIO, \
-                                        MVStreamIO, \
-                                        MXFStreamIO, \
-                                        MXF_D10StreamIO, \
-                                        MXF_OPATOMStreamIO, \
-                                        MXGStreamIO, \
-                                        NCStreamIO, \
-                                        NISTSPHEREStreamIO, \
-                                        NSPStreamIO, \
-                                        NSVStreamIO, \
-                                        NULLStreamIO, \
-                                        NUTStreamIO, \
-                                        NUVStreamIO, \
-                                        OBUStreamIO, \
-                                        OGAStreamIO, \
-                                        OGGStreamIO, \
-                                        OGVStreamIO, \
-                                        OMAStreamIO, \
-                                        OPUSStreamIO, \
-                                        PAFStreamIO, \
-                                        PAM_PIPEStreamIO, \
-                                        PBM_PIPEStreamIO, \
-                                        PCX_PIPEStreamIO, \
-                                        PGMYUV_PIPEStreamIO, \
-                                        PGM_PIPEStreamIO, \
-                                        PGX_PIPEStreamIO, \
-                                        PHOTOCD_PIPEStreamIO, \
-                                        PICTOR_PIPEStreamIO, \
-                                        PJSStreamIO, \
-                                        PMPStreamIO, \
-                                        PNG_PIPEStreamIO, \
-                                        PPM_PIPEStreamIO, \
-                                        PP_BNKStreamIO, \
-                                        PSD_PIPEStreamIO, \
-                                        PSPStreamIO, \
-                                        PSXSTRStreamIO, \
-                                        PVAStreamIO, \
-                                        PVFStreamIO, \
-                                        QCPStreamIO, \
-                                        QDRAW_PIPEStreamIO, \
-                                        R3DStreamIO, \
-                                        RAWVIDEOStreamIO, \
-                                        REALTEXTStreamIO, \
-                                        REDSPARKStreamIO, \
-                                        RL2StreamIO, \
-                                        RMStreamIO, \
-                                        ROQStreamIO, \
-                                        RPLStreamIO, \
-                                        RSDStreamIO, \
-                                        RSOStreamIO, \
-                                        RTPStreamIO, \
-                                        RTP_MPEGTSStreamIO, \
-                                        RTSPStreamIO, \
-                                        S16BEStreamIO, \
-                                        S16LEStreamIO, \
-                                        S24BEStreamIO, \
-                                        S24LEStreamIO, \
-                                        S32BEStreamIO, \
-                                        S32LEStreamIO, \
-                                        S337MStreamIO, \
-                                        S8StreamIO, \
-                                        SAMIStreamIO, \
-                                        SAPStreamIO, \
-                                        SBCStreamIO, \
-                                        SBGStreamIO, \
-                                        SCCStreamIO, \
-                                        SCDStreamIO, \
-                                        SDL2StreamIO, \
-                                        SDLStreamIO, \
-                                        SDPStreamIO, \
-                                        SDR2StreamIO, \
-                                        SDSStreamIO, \
-                                        SDXStreamIO, \
-                                        SEGMENTStreamIO, \
-                                        SERStreamIO, \
-                                        SGAStreamIO, \
-                                        SGI_PIPEStreamIO, \
-                                        SHNStreamIO, \
-                                        SIFFStreamIO, \
-                                        SIMBIOSIS_IMXStreamIO, \
-                                        SLNStreamIO, \
-                                        SMJPEGStreamIO, \
-                                        SMKStreamIO, \
-                                        SMOOTHSTREAMINGStreamIO, \
-                                        SMUSHStreamIO, \
-                                        SOLStreamIO, \
-                                        SOXStreamIO, \
-                                        SPDIFStreamIO, \
-                                        SPXStreamIO, \
-                                        SRTStreamIO, \
-                                        SSEGMENTStreamIO, \
-                                        STLStreamIO, \
-                                        STREAMHASHStreamIO, \
-                                        STREAM_SEGMENTStreamIO, \
-                                        SUBVIEWER1StreamIO, \
-                                        SUBVIEWERStreamIO, \
-                                        SUNRAST_PIPEStreamIO, \
-                                        SUPStreamIO, \
-                                        SVAGStreamIO, \
-                                        SVCDStreamIO, \
-                                        SVG_PIPEStreamIO, \
-                                        SVSStreamIO, \
-                                        SWFStreamIO, \
-                                        TAKStreamIO, \
-                                        TEDCAPTIONSStreamIO, \
-                                        TEEStreamIO, \
-                                        THPStreamIO, \
-                                        TIERTEXSEQStreamIO, \
-                                        TIFF_PIPEStreamIO, \
-                                        TMVStreamIO, \
-                                        TRUEHDStreamIO, \
-                                        TTAStreamIO, \
-                                        TTMLStreamIO, \
-                                        TTYStreamIO, \
-                                        TXDStreamIO, \
-                                        TYStreamIO, \
-                                        U16BEStreamIO, \
-                                        U16LEStreamIO, \
-                                        U24BEStreamIO, \
-                                        U24LEStreamIO, \
-                                        U32BEStreamIO, \
-                                        U32LEStreamIO, \
-                                        U8StreamIO, \
-                                        UNCODEDFRAMECRCStreamIO, \
-                                        V210StreamIO, \
-                                        V210XStreamIO, \
-                                        VAGStreamIO, \
-                                        VC1StreamIO, \
-                                        VC1TESTStreamIO, \
-                                        VCDStreamIO, \
-                                        VIDCStreamIO, \
-                                        VIVIDASStreamIO, \
-                                        VIVOStreamIO, \
-                                        VMDStreamIO, \
-                                        VOBSUBStreamIO, \
-                                        VOBStreamIO, \
-                                        VOCStreamIO, \
-                                        VPKStreamIO, \
-                                        VPLAYERStreamIO, \
-                                        VQFStreamIO, \
-                                        W64StreamIO, \
-                                        WAVStreamIO, \
-                                        WC3MOVIEStreamIO, \
-                                        WEBMStreamIO, \
-                                        WEBM_CHUNKStreamIO, \
-                                        WEBM_DASH_MANIFESTStreamIO, \
-                                        WEBPStreamIO, \
-                                        WEBP_PIPEStreamIO, \
-                                        WEBVTTStreamIO, \
-                                        WSAUDStreamIO, \
-                                        WSDStreamIO, \
-                                        WSVQAStreamIO, \
-                                        WTVStreamIO, \
-                                        WVEStreamIO, \
-                                        WVStreamIO, \
-                                        X11GRABStreamIO, \
-                                        XAStreamIO, \
-                                        XBINStreamIO, \
-                                        XBM_PIPEStreamIO, \
-                                        XMVStreamIO, \
-                                        XPM_PIPEStreamIO, \
-                                        XVAGStreamIO, \
-                                        XWD_PIPEStreamIO, \
-                                        XWMAStreamIO, \
-                                        YOPStreamIO, \
-                                        YUV4MPEGPIPEStreamIO, \
-                                        _3DOSTRStreamIO, \
-                                        _3G2StreamIO, \
-                                        _3GPStreamIO, \
-                                        _4XMStreamIO
\ No newline at end of file
+                                        FFmpegEncoderStreamIO
+
+import remote_audio.io.advanced_io as advanced_io
+import remote_audio.io.ffmpeg.format_index as format_index
+import remote_audio.io.http as http
+from remote_audio.exceptions import InvalidInputParameters
+
+def get_format_class(
+    format:str
+)->Union[
+    type,
+    None,
+]:
+    """
+    Look for the relevant StreamIO class that corresponds to `format`.
+    `format` can be a FFmpeg format or any of its aliases, a file extension, a MIME type or a codec.
+    Returns None if not found.
+    """
+
+    format = format_index.resolve_format(format)
+
+    if (not format):
+        return None
+    elif (format == "wav"):
+        return WaveStreamIO
+    else:
+        # Classes are generated on demand; only the formats actually used are ever built.
+        return advanced_io.get_format_class(format)
+
+def open_source(
+    kind:str,
+    source:Union[
+        str,
+        bytes,
+    ],
+    format:str = None,
+    sample_rate:int = None,
+    channels:int = None,
+    output_format:Callable[[], Tuple[int, int]] = None,
+    **kwargs,
+)->Union[
+    StreamIO,
+    Exception,
+]:
+    """
+    Open a StreamIO of WAV data for `source`, which is
+    - a path if `kind` is "file",
+    - a URL if `kind` is "http", or
+    - the data itself if `kind` is "bytes".
+
+    If `format` is not provided, it is deduced from the path or URL, or failing that the Content-Type of the URL.
+    Non-WAV sources are decoded by FFmpeg into `sample_rate` and `channels` if provided;
+    any of them missing is taken from `output_format()`, e.g. the native format of the device, which is only called then.
+    Other `kwargs`, e.g. `start_at`, `end_at` and `callback`, are passed on to the class method.
+    """
+
+    if (not format and kind in ("file", "http")):
+        format = format_index.from_path(source)
+
+        if (not format and kind == "http"):
+            # No recognisable suffix; ask the server instead
+            _content_type = http.get_http_content_type(source)
+
+            if (not isinstance(_content_type, Exception)):
+                format = format_index.from_mime_type(_content_type)
+
+    _format_class = get_format_class(format) if format else None
+
+    if (not _format_class):
+        return InvalidInputParameters(f"{format} is not a valid format.")
+
+    if (issubclass(_format_class, FFmpegStreamIO)):
+        if (not (sample_rate and channels) and output_format is not None):
+            _sample_rate, _channels = output_format()
+            sample_rate = sample_rate or _sample_rate
+            channels = channels or _channels
+
+        if (sample_rate):
+            kwargs["sample_rate"] = sample_rate
+        if (channels):
+            kwargs["channels"] = channels
+
+    if (kind == "file"):
+        return _format_class.from_file(path=source, **kwargs)
+    elif (kind == "http"):
+        return _format_class.from_http(url=source, **kwargs)
+    elif (kind == "bytes"):
+        # Neither class supports seeking within bytes
+        kwargs.pop("start_at", None)
+        kwargs.pop("end_at", None)
+        return _format_class.from_bytes(data=source, **kwargs)
+    else:
+        return InvalidInputParameters(f"Unknown source kind {repr(kind)}; expected 'file', 'http' or 'bytes'.")
+
+# Format-specific classes, e.g. MP3StreamIO, are generated on first access by advanced_io.
+# Resolve them from there instead of importing all of them here.
+
+def __getattr__(
+    name:str,
+)->type:
+    if (name in advanced_io.FORMAT_CLASS_NAMES):
+        return getattr(advanced_io, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__()->list:
+    return sorted(set(globals()) | set(advanced_io.FORMAT_CLASS_NAMES))
@@ -8,8 +8,9 @@ from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Tuple, Union
 from remote_audio import audio
 from remote_audio import exceptions
 from remote_audio import api
+from remote_audio import snapshot
 
-from remote_audio.stream import AudioStream, DEFAULT_TIMEOUT
+from remote_audio.stream import AudioStream, AudioStreamGroup, DEFAULT_TIMEOUT
 import remote_audio.classes
 import remote_audio.io
 
@@ -38,12 +39,19 @@ class DeviceHostAPISignature(dict):
         device_index:int = 0,
     )->"DeviceHostAPISignature":
 
-        _self_info = api.pya.get_device_info_by_index(device_index=device_index)
+        # Answer from the device snapshot if possible - probing PortAudio is linear in the number of devices
+        _signature = snapshot.get_snapshot().get_signature(device_index)
+        if (_signature is not None):
+            return cls(*_signature)
+
+        _p = api.get_pya()
+
+        _self_info = _p.get_device_info_by_index(device_index=device_index)
         
         host_api_device_index = 0
         while (_self_info is not None):
             try:
-                _device_info = api.pya.get_device_info_by_host_api_device_index(
+                _device_info = _p.get_device_info_by_host_api_device_index(
                     host_api_index=_self_info.get("hostApi", None),
                     host_api_device_index=host_api_device_index,
                 )
@@ -98,21 +106,60 @@ class AudioDevice():
     def __init__(
         self,
         device_index:int,
+        device_info:Dict[str, Any] = None,
+        signature:DeviceHostAPISignature = None,
         **kwargs,
     ):
-        _p = api.pya
+        """
+        `device_info` and `signature` can be supplied from a DeviceSnapshot;
+        otherwise they are queried from PortAudio.
+        """
+        if (device_info is None):
+            device_info = snapshot.get_snapshot().get_info(device_index)
 
-        _device_info = _p.get_device_info_by_index(
-            device_index=device_index
-        )
+        if (device_info is None):
+            # Not in the snapshot; let PortAudio raise OSError if the device does not exist
+            _p = api.get_pya()
+
+            device_info = _p.get_device_info_by_index(
+                device_index=device_index
+            )
         
         self.properties =   {
-            **_device_info,
+            **device_info,
             **kwargs,
         }
 
         self.device_index = device_index
-        self.signature = DeviceHostAPISignature.from_device_index(self.device_index)
+        self.signature = signature if (signature is not None) else DeviceHostAPISignature.from_device_index(self.device_index)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        device_index:int,
+        device_snapshot:"snapshot.DeviceSnapshot" = None,
+    )->"AudioDevice":
+        """
+        Build an AudioDevice from a DeviceSnapshot without querying PortAudio.
+        Returns DeviceNotFound if the snapshot does not have the device.
+        """
+        if (device_snapshot is None):
+            device_snapshot = snapshot.get_snapshot()
+
+        _device_info = device_snapshot.get_info(device_index)
+
+        if (_device_info is None):
+            return exceptions.DeviceNotFound(
+                f"Device #{device_index} not found."
+            )
+
+        _signature = device_snapshot.get_signature(device_index)
+
+        return cls(
+            device_index = device_index,
+            device_info = _device_info,
+            signature = DeviceHostAPISignature(*_signature) if _signature else None,
+        )
 
     def __repr__(
         self,
@@ -138,6 +185,14 @@ class AudioDevice():
     def canOutput(self):
         return  bool(self.maxOutputChannels)
 
+    @property
+    def output_format(self)->Tuple[int, int]:
+        """
+        Native (sample_rate, channels) of this device,
+        which decoded audio should be converted to before playback.
+        """
+        return audio.get_native_format(self.properties)
+
     @classmethod
     def by_device_index(
         cls,
@@ -195,9 +250,15 @@ class AudioDevice():
 
             # Lets see if the signature is now ready to be processed by __init__()
             if (isinstance(signature, DeviceHostAPISignature)):
+                _device_snapshot = snapshot.get_snapshot()
+                _device_index = _device_snapshot.get_device_index(**signature)
+
+                if (_device_index is not None):
+                    return cls.from_snapshot(_device_index, _device_snapshot)
+
                 # Using DeviceSignature mode, simply build it using __init__()
                 try:
-                    _p = api.pya
+                    _p = api.get_pya()
                     _device_info = _p.get_device_info_by_host_api_device_index(
                         **signature
                     )
@@ -230,19 +291,21 @@ class AudioDevice():
         Getting the default input or output device
         """
 
-        _p = api.pya
+        _device_snapshot = snapshot.get_snapshot()
 
         output = not input
         
         if (input):
-            _device_info = _p.get_default_input_device_info()
+            _device_index = _device_snapshot.default_input_index
         elif (output):
-            _device_info = _p.get_default_output_device_info()
+            _device_index = _device_snapshot.default_output_index
 
+        if (_device_index is None):
+            return exceptions.DeviceNotFound(
+                f"No default {'input' if input else 'output'} device available."
+            )
 
-        return cls.by_device_index(
-            device_index=_device_info.get("index")
-        )
+        return cls.from_snapshot(_device_index, _device_snapshot)
 
     @classmethod
     def list(
@@ -253,14 +316,10 @@ class AudioDevice():
         """
         Return a list of all devices available
         """
-        _p = api.pya
+        _device_snapshot = snapshot.get_snapshot()
 
-        for _device in map(
-            cls.by_device_index,
-            range(_p.get_device_count())
-        ):
-            if (_device):
-                yield _device
+        for _device_index in _device_snapshot.devices:
+            yield cls.from_snapshot(_device_index, _device_snapshot)
 
     @classmethod
     def find(
@@ -282,18 +341,16 @@ class AudioDevice():
         Note that all criteria are AND operated - meaning if input=True and ouput=True, nothing will be produced.
         """
         output = not input  # default output is True, so if input=True, its deliberate. We assume that if that's the case, then output should be False.
-        
-        for _device in cls.list():
-            if (input and not _device.canInput): continue
-            if (output and not _device.canOutput): continue
-
-            if (isinstance(name, str)):
-                # If its an empty string, this will return everything
-                if (not name.lower() in _device.name.lower()): continue
-            elif (isinstance(name, re.Pattern)):
-                if (not name.match(_device.name)): continue
-            
-            yield _device
+
+        # Filter on the snapshot first; only the matching devices are ever constructed.
+        _device_snapshot = snapshot.get_snapshot()
+
+        for _device_index in _device_snapshot.find(
+            input = input,
+            output = output,
+            name = name,
+        ):
+            yield cls.from_snapshot(_device_index, _device_snapshot)
 
     @classmethod
     def find_first(
@@ -316,6 +373,111 @@ class AudioDevice():
         return None
 
 
+    @classmethod
+    def start_shared_wav_stream(
+        cls,
+        io:"remote_audio.io.base_io.StreamIO",
+        devices:Iterable["AudioDevice"],
+        chunk_size:int=1024,
+        start:bool=True,
+        timeout:float=DEFAULT_TIMEOUT,
+        exit_interrupt:bool=False,
+        **kwargs,
+    )->AudioStreamGroup:
+        """
+        Play one StreamIO, e.g. a FFmpegStreamIO, on several devices at once.
+        The source is only decoded once, however many devices there are.
+
+        The devices should share the same native format, as the source can only be decoded into one;
+        see AudioDevice.output_format.
+
+        Returns a AudioStreamGroup;
+        use this function as context manager:
+        ```
+        with AudioDevice.start_shared_wav_stream(_io, devices=[_device1, _device2]) as _streams:
+            pass
+        ```
+        """
+        return audio.start_shared_wav_stream(
+            io=io,
+            device_indices=[ _device.device_index for _device in devices ],
+            chunk_size=chunk_size,
+            start=start,
+            timeout=timeout,
+            exit_interrupt=exit_interrupt,
+            **kwargs,
+        )
+
+    def persistent_output(
+        self,
+        **kwargs,
+    )->Union[
+        "remote_audio.output.PersistentOutput",
+        Exception,
+    ]:
+        """
+        Get the PersistentOutput of this device, which keeps its stream open between playbacks;
+        opened in the native format of this device on first use.
+        Returns InvalidInputParameters if `latency` is not a known profile.
+
+        Usage:
+        ```
+        _device.persistent_output().play_file("chime.wav")
+        ```
+        """
+        # output imports audio, which imports this module
+        from remote_audio import output
+
+        _sample_rate, _channels = self.output_format
+
+        return output.get_persistent_output(
+            device_index = self.device_index,
+            **{
+                "sample_rate":  _sample_rate,
+                "channels":     _channels,
+                **kwargs,
+            },
+        )
+
+    def playlist(
+        self,
+        preload:int=1,
+        timeout:float=DEFAULT_TIMEOUT,
+        crossfade:float=None,
+        exit_interrupt:bool=False,
+        **kwargs,
+    )->Union[
+        "remote_audio.playlist.Playlist",
+        Exception,
+    ]:
+        """
+        Play a sequence of sources gaplessly on the PersistentOutput of this device;
+        the next `preload` items are decoded while the current one plays.
+        With `crossfade` seconds, consecutive items overlap with an equal-power crossfade instead.
+        `kwargs` are passed to .persistent_output().
+
+        Usage:
+        ```
+        with _device.playlist() as _playlist:
+            _playlist.add_file("intro.mp3")
+            _playlist.add_file("track.flac")
+        ```
+        """
+        from remote_audio import playlist
+
+        _output = self.persistent_output(**kwargs)
+
+        if (isinstance(_output, Exception)):
+            return _output
+
+        return playlist.Playlist(
+            output=_output,
+            preload=preload,
+            timeout=timeout,
+            crossfade=crossfade,
+            exit_interrupt=exit_interrupt,
+        )
+
     def start_wav_stream(
         self,
         io:BinaryIO,
@@ -357,12 +519,19 @@ class AudioDevice():
         timeout:float=DEFAULT_TIMEOUT,
         exit_interrupt:bool=False,
         callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+        sample_rate:int=None,
+        channels:int=None,
+        start_at:Union[float, str]=None,
+        end_at:Union[float, str]=None,
         **kwargs,
     )->AudioStream:
         """
         Play a local audio file.
         If `format` is not provided, it will use the file suffix.
 
+        Unless `sample_rate` and `channels` are provided, FFmpeg will decode into this device's native format.
+        Use `start_at` and `end_at` (in seconds) to play only part of the source.
+
         Returns a AudioStream;
         use this function as context manager:
         ```
@@ -370,6 +539,8 @@ class AudioDevice():
             pass
         ```
         """
+        _sample_rate, _channels = self.output_format
+
         return audio.play_file(
             path=path,
             format=format,
@@ -380,6 +551,10 @@ class AudioDevice():
             timeout=timeout,
             exit_interrupt=exit_interrupt,
             callback=callback,
+            sample_rate=sample_rate or _sample_rate,
+            channels=channels or _channels,
+            start_at=start_at,
+            end_at=end_at,
             **kwargs,
         )
 
@@ -393,12 +568,19 @@ class AudioDevice():
         timeout:float=DEFAULT_TIMEOUT,
         exit_interrupt:bool=False,
         callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+        sample_rate:int=None,
+        channels:int=None,
+        start_at:Union[float, str]=None,
+        end_at:Union[float, str]=None,
         **kwargs,
     )->AudioStream:
         """
         Play an audio over HTTP.
         If `format` is not provided, it will use the file suffix.
 
+        Unless `sample_rate` and `channels` are provided, FFmpeg will decode into this device's native format.
+        Use `start_at` and `end_at` (in seconds) to play only part of the source.
+
         Returns a AudioStream;
         use this function as context manager:
         ```
@@ -406,6 +588,7 @@ class AudioDevice():
             pass
         ```
         """
+        _sample_rate, _channels = self.output_format
 
         return audio.play_http(
             url=url,
@@ -417,5 +600,93 @@ class AudioDevice():
             timeout=timeout,
             exit_interrupt=exit_interrupt,
             callback=callback,
+            sample_rate=sample_rate or _sample_rate,
+            channels=channels or _channels,
+            start_at=start_at,
+            end_at=end_at,
+            **kwargs,
+        )
+
+    def play_bytes(
+        self,
+        data:bytes,
+        format:str,
+        chunk_size:int=1024,
+        start:bool=True,
+        bytes_total:int=None,
+        timeout:float=DEFAULT_TIMEOUT,
+        exit_interrupt:bool=False,
+        callback:Callable[[remote_audio.io.ffmpeg.command.FFmpegCommand, int], None] = None,
+        sample_rate:int=None,
+        channels:int=None,
+        **kwargs,
+    )->AudioStream:
+        """
+        Play audio data already in memory, e.g. a compressed clip.
+        `format` is required, as there is no file suffix to go by.
+
+        Unless `sample_rate` and `channels` are provided, FFmpeg will decode into this device's native format.
+
+        Returns a AudioStream;
+        use this function as context manager:
+        ```
+        with _device.play_bytes(_mp3_data, "mp3") as _stream:
+            pass
+        ```
+        """
+        _sample_rate, _channels = self.output_format
+
+        return audio.play_bytes(
+            data=data,
+            format=format,
+            device_index=self.device_index,
+            chunk_size=chunk_size,
+            start=start,
+            bytes_total=bytes_total,
+            timeout=timeout,
+            exit_interrupt=exit_interrupt,
+            callback=callback,
+            sample_rate=sample_rate or _sample_rate,
+            channels=channels or _channels,
+            **kwargs,
+        )
+
+    def record(
+        self,
+        format:str=None,
+        sample_rate:int=None,
+        channels:int=None,
+        start:bool=True,
+        **kwargs,
+    )->"remote_audio.capture.CaptureStream":
+        """
+        Capture from this device into a StreamIO, available as .io of the returned CaptureStream.
+        Raw WAV unless `format` is given, e.g. "opus", in which case FFmpeg encodes it as it is captured.
+
+        Unless `sample_rate` and `channels` are provided, this device's native format is captured.
+
+        Usage:
+        ```
+        with _device.record(format="opus") as _capture:
+            timer.sleep(5)
+
+        _opus = _capture.io.read()
+        ```
+        """
+        if (not self.canInput):
+            return exceptions.DeviceNotFound(
+                f"Device {repr(self.name)} cannot capture."
+            )
+
+        from remote_audio import capture
+
+        _sample_rate, _channels = audio.get_native_format(self.properties, input=True)
+
+        return capture.record(
+            device_index=self.device_index,
+            format=format,
+            sample_rate=sample_rate or _sample_rate,
+            channels=channels or _channels,
+            start=start,
             **kwargs,
         )
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os, sys
+import platform
+from typing import Any, Dict, Iterable, Union
+
+"""
+On-disk cache of DeviceSnapshots, so that a new process can look up devices without waiting for PortAudio to scan.
+
+A cached snapshot is only used if the fingerprint of the audio configuration still matches the one it was saved with.
+The fingerprint is cheap to compute - on Linux it is built from the contents of /proc/asound and
+the ALSA configuration files - and does not involve PortAudio at all.
+
+Set the environment variable `REMOTE_AUDIO_DEVICE_CACHE` to a path to relocate the cache, or to "0" to disable it.
+"""
+
+CACHE_VERSION = 1
+CACHE_ENV_VAR = "REMOTE_AUDIO_DEVICE_CACHE"
+CACHE_FILE_NAME = "devices.json"
+
+# Files describing the audio hardware and ALSA virtual PCMs; any change to these invalidates the cache.
+FINGERPRINT_CONTENTS = (
+    "/proc/asound/cards",
+    "/proc/asound/devices",
+    "/proc/asound/pcm",
+)
+FINGERPRINT_MTIMES = (
+    "/etc/asound.conf",
+    "/usr/share/alsa/alsa.conf",
+    os.path.expanduser("~/.asoundrc"),
+)
+
+
+def get_cache_path()->Union[
+    str,
+    None,
+]:
+    """
+    Path of the cache file; None if caching is disabled.
+    """
+
+    _path = os.environ.get(CACHE_ENV_VAR, None)
+
+    if (_path is not None):
+        return None if (_path.strip().lower() in ("", "0", "false", "no", "off")) else _path
+
+    _cache_home = os.environ.get("XDG_CACHE_HOME", None) or os.path.expanduser("~/.cache")
+
+    return os.path.join(_cache_home, "remote_audio", CACHE_FILE_NAME)
+
+def get_fingerprint(
+    contents:Iterable[str] = FINGERPRINT_CONTENTS,
+    mtimes:Iterable[str] = FINGERPRINT_MTIMES,
+)->str:
+    """
+    A hash identifying the current audio configuration of this machine.
+    """
+
+    _hash = hashlib.sha1()
+    _hash.update(f"{platform.node()}|{sys.platform}|{platform.release()}".encode("utf-8"))
+
+    for _path in contents:
+        try:
+            with open(_path, "rb") as _fHnd:
+                _hash.update(_path.encode("utf-8") + b"\x00" + _fHnd.read())
+        except OSError as e:
+            continue
+
+    for _path in mtimes:
+        try:
+            _hash.update(f"{_path}\x00{os.stat(_path).st_mtime_ns}".encode("utf-8"))
+        except OSError as e:
+            continue
+
+    return _hash.hexdigest()
+
+def load(
+    fingerprint:str = None,
+    path:str = None,
+)->Union[
+    Dict[str, Any],
+    None,
+]:
+    """
+    Load the cached snapshot data if it was saved with `fingerprint`.
+    Returns None if there is no usable cache.
+    """
+
+    path = path or get_cache_path()
+
+    if (not path):
+        return None
+
+    try:
+        with open(path, "r") as _fHnd:
+            _cache = json.load(_fHnd)
+    except (OSError, ValueError) as e:
+        return None
+
+    if (not isinstance(_cache, dict) or \
+        _cache.get("version") != CACHE_VERSION or \
+        _cache.get("fingerprint") != (fingerprint or get_fingerprint())
+    ):
+        return None
+
+    return _cache.get("snapshot", None)
+
+def save(
+    data:Dict[str, Any],
+    fingerprint:str = None,
+    path:str = None,
+)->bool:
+    """
+    Save snapshot data to the cache, tagged with `fingerprint`.
+    The file is replaced atomically, so concurrent processes never see a partial cache.
+
+    Returns False if caching is disabled or the file cannot be written.
+    """
+
+    path = path or get_cache_path()
+
+    if (not path):
+        return False
+
+    _tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(_tmp_path, "w") as _fHnd:
+            json.dump(
+                {
+                    "version":      CACHE_VERSION,
+                    "fingerprint":  fingerprint or get_fingerprint(),
+                    "snapshot":     data,
+                },
+                _fHnd,
+            )
+
+        os.replace(_tmp_path, path)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        try:
+            os.remove(_tmp_path)
+        except OSError:
+            pass
+
+        return False
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+
+import threading
+from typing import Callable, Union
+
+import numpy as np
+
+from remote_audio import mixer
+from remote_audio.exceptions import InvalidInputParameters
+
+"""
+Per-stream processing of PCM chunks on their way to PortAudio.
+
+Samples are scaled as NumPy views of each chunk, into buffers allocated once per stream,
+so that the stage is cheap enough to run on every callback.
+"""
+
+DEFAULT_FADE_DURATION = 0.01        # Seconds; long enough to avoid a click, short enough not to be heard as a fade
+DEFAULT_MAX_FRAMES = 4096           # Frames per chunk the buffers are allocated for; they grow if a larger chunk comes
+
+
+class GainStage():
+    """
+    Applies a per-stream gain to PCM chunks, ramping smoothly between levels.
+
+    The level applied to the samples always moves to a new value linearly over `fade` seconds
+    rather than jumping there, which would be heard as a click. This covers:
+    - changes to .gain while playing;
+    - .fade_in() when a stream starts, from silence;
+    - .fade_out() before a stream stops or seeks, to silence; its `callback` is called once silent.
+
+    At a steady gain of 1, chunks are returned untouched.
+    """
+
+    def __init__(
+        self,
+        channels:int,
+        sample_width:int,
+        sample_rate:int,
+        gain:float = 1.0,
+        fade:float = DEFAULT_FADE_DURATION,
+        max_frames:int = DEFAULT_MAX_FRAMES,
+        clipping:"mixer.ClippingMode" = mixer.ClippingMode.HARD,
+    )->None:
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.fade = fade or 0
+        self.clipping = clipping
+
+        self.dtype = mixer.get_dtype(sample_width)
+        if (isinstance(self.dtype, Exception)):
+            raise self.dtype
+
+        self.accumulator_dtype = mixer.ACCUMULATOR_DTYPES[sample_width]
+
+        # Reentrant, so that fade_out() callbacks can fade in again
+        self.lock = threading.RLock()
+
+        self._gain = float(gain)
+        self._level = float(gain)           # Level actually applied to the last frame
+        self._target = float(gain)
+        self._step = 0.0                    # Change of level per frame while ramping
+        self._ramp_frames = 0               # Frames left until _target is reached
+        self._on_target = None
+        self._fading_out = False
+
+        self.silent = threading.Event()
+
+        self._allocate(max_frames)
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(channels={self.channels}, sample_width={self.sample_width}, sample_rate={self.sample_rate}, gain={self.gain}, level={self._level:.3f})"
+
+    def _allocate(
+        self,
+        max_frames:int,
+    )->None:
+        """
+        (Re)allocate the working buffers for chunks of up to `max_frames` frames.
+        """
+        self.max_frames = max_frames
+
+        self._ramp = np.arange(1, max_frames+1, dtype=self.accumulator_dtype)
+        self._ramp_levels = np.empty((max_frames, 1), dtype=self.accumulator_dtype)
+        # One level per sample rather than per frame; multiplying by a broadcast column allocates on every call
+        self._levels = np.empty((max_frames, self.channels), dtype=self.accumulator_dtype)
+        self._buffer = np.empty((max_frames, self.channels), dtype=self.accumulator_dtype)
+        self._output = np.empty((max_frames, self.channels), dtype=self.dtype)
+
+    @property
+    def gain(
+        self,
+    )->float:
+        return self._gain
+
+    @gain.setter
+    def gain(
+        self,
+        value:float,
+    )->None:
+        self.set_gain(value)
+
+    @property
+    def level(
+        self,
+    )->float:
+        """
+        Level currently applied, including any fade.
+        """
+        return self._level
+
+    @property
+    def ramping(
+        self,
+    )->bool:
+        return bool(self._ramp_frames)
+
+    def _ramp_to(
+        self,
+        target:float,
+        duration:float = None,
+        callback:Callable[[], None] = None,
+    )->None:
+        """
+        Start moving the level to `target` over `duration` seconds. Call with .lock held.
+        """
+        _frames = int((self.fade if (duration is None) else duration) * self.sample_rate)
+
+        self._target = float(target)
+        self._on_target = callback
+
+        if (_frames > 0 and self._target != self._level):
+            self._step = (self._target - self._level) / _frames
+            self._ramp_frames = _frames
+        else:
+            # Applied from the start of the next chunk
+            self._level = self._target
+            self._step = 0.0
+            self._ramp_frames = 0
+
+        if (self._target):
+            self.silent.clear()
+
+    def set_gain(
+        self,
+        gain:float,
+        duration:float = None,
+    )->None:
+        """
+        Ramp to `gain` over `duration` seconds, `fade` by default.
+        While faded out, the new gain is only applied by the next .fade_in().
+        """
+        with self.lock:
+            self._gain = float(gain)
+
+            if (not self._fading_out):
+                self._ramp_to(self._gain, duration)
+
+    def fade_in(
+        self,
+        duration:float = None,
+    )->None:
+        """
+        Ramp from silence to .gain over `duration` seconds, `fade` by default.
+        """
+        with self.lock:
+            self._fading_out = False
+            self._level = 0.0
+            self._ramp_to(self._gain, duration)
+
+    def fade_out(
+        self,
+        duration:float = None,
+        callback:Callable[[], None] = None,
+    )->None:
+        """
+        Ramp to silence over `duration` seconds, `fade` by default; .silent is set once there.
+
+        `callback` is called from the thread processing the chunks, once silent and before the next chunk is processed,
+        e.g. to reposition the source; that thread calls .run_pending() before reading the chunk, so that it is read after.
+        """
+        with self.lock:
+            self._fading_out = True
+            self._ramp_to(0.0, duration, callback=callback)
+
+            if (not self._ramp_frames and callback is None):
+                self.silent.set()
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * self.sample_width
+
+    def run_pending(
+        self,
+    )->None:
+        """
+        Call the .fade_out() callback if silence had been reached by the end of the last chunk.
+
+        Called by .process_into() anyway; call it before reading the next chunk from the source,
+        so that a callback repositioning the source applies to that chunk, rather than the one after.
+        """
+        with self.lock:
+            if (self._on_target is not None and not self._ramp_frames):
+                _callback, self._on_target = self._on_target, None
+                _callback()
+
+            if (self._fading_out and not self._ramp_frames and self._on_target is None):
+                self.silent.set()
+
+    def process_into(
+        self,
+        samples:np.ndarray,
+        out:np.ndarray = None,
+    )->bool:
+        """
+        Apply the gain to `samples`, a (frames, channels) array of .dtype, writing into `out` - `samples` itself by default.
+
+        Returns False if the gain is a steady 1 and nothing was written.
+        For chunks of .max_frames frames, nothing is allocated.
+        """
+        if (out is None):
+            out = samples
+
+        with self.lock:
+            # Target may have been reached by the end of the last chunk
+            self.run_pending()
+
+            if (not self._ramp_frames and self._level == 1):
+                return False
+
+            _frames = len(samples)
+
+            if (_frames > self.max_frames):
+                self._allocate(_frames)
+
+            if (_frames == self.max_frames):
+                # Slicing would create new views every time
+                _levels = self._levels
+                _buffer = self._buffer
+            else:
+                _levels = self._levels[:_frames]
+                _buffer = self._buffer[:_frames]
+
+            _silent = not self._ramp_frames and not self._level
+
+            if (self._ramp_frames):
+                _ramp_frames = min(self._ramp_frames, _frames)
+                _ramp_levels = self._ramp_levels[:_frames]
+
+                # level + step * (1, 2, 3, ...), then hold at the target
+                np.multiply(self._ramp[:_ramp_frames], self._step, out=_ramp_levels[:_ramp_frames, 0])
+                _ramp_levels[:_ramp_frames] += self._level
+                _ramp_levels[_ramp_frames:] = self._target
+                np.copyto(_levels, _ramp_levels)
+
+                self._ramp_frames -= _ramp_frames
+                self._level = self._target if (not self._ramp_frames) else float(_ramp_levels[_ramp_frames-1, 0])
+            elif (not _silent):
+                _levels.fill(self._level)
+
+        if (_silent):
+            out.fill(0)
+        else:
+            # Cast first; a ufunc mixing dtypes would allocate a casting buffer
+            np.copyto(_buffer, samples)
+            np.multiply(_buffer, _levels, out=_buffer)
+            mixer.clip(_buffer, self.dtype, self.clipping)
+            np.rint(_buffer, out=_buffer)
+            np.copyto(out, _buffer, casting="unsafe")
+
+        return True
+
+    def process(
+        self,
+        data:bytes,
+    )->bytes:
+        """
+        Apply the gain to a chunk of PCM data, returning new bytes unless the gain is a steady 1.
+        """
+        _frames = len(data) // self.frame_size
+
+        with self.lock:
+            if (_frames > self.max_frames):
+                self._allocate(_frames)
+
+            _output = self._output[:_frames]
+
+        _samples = np.frombuffer(data, dtype=self.dtype, count=_frames*self.channels).reshape(_frames, self.channels)
+
+        if (not self.process_into(_samples, out=_output)):
+            return data
+
+        return _output.tobytes() + data[_frames*self.frame_size:]
+
+def create_gain_stage(
+    channels:int,
+    sample_width:int,
+    sample_rate:int,
+    gain:float = None,
+    fade:float = None,
+    **kwargs,
+)->Union[
+    GainStage,
+    None,
+]:
+    """
+    GainStage for a stream in this format, faded in if `fade` is given.
+    None if NumPy has no dtype for `sample_width`, e.g. 8 or 24-bit; such streams are passed through untouched.
+    """
+    if (isinstance(mixer.get_dtype(sample_width), InvalidInputParameters)):
+        return None
+
+    _stage = GainStage(
+        channels = channels,
+        sample_width = sample_width,
+        sample_rate = sample_rate,
+        gain = 1.0 if (gain is None) else gain,
+        fade = fade,
+        **kwargs,
+    )
+
+    if (fade):
+        _stage.fade_in()
+
+    return _stage
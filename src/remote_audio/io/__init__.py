@@ -3,9 +3,16 @@ import remote_audio.io.file as file
 import remote_audio.io.http as http
 import remote_audio.io.conversion as conversion
 import remote_audio.io.base_io as base_io
+import remote_audio.io.writer as writer
+import remote_audio.io.pcm as pcm
 
 import remote_audio.io.ffmpeg as ffmpeg
 
 from remote_audio.io.base_io import StreamIO, \
                                     WaveStreamIO
-                            
\ No newline at end of file
+
+from remote_audio.io.pcm import PCMSource, \
+                               PCMSink, \
+                               BytesPCMSink, \
+                               CallbackPCMSink, \
+                               WavePCMSink
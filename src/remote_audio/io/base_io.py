@@ -10,6 +10,9 @@ import remote_audio.io.file as file
 import remote_audio.io.http as http
 import remote_audio.exceptions as exceptions
 
+DEFAULT_DISCARD_THRESHOLD = 2**20
+JITTER_SMOOTHING = 16              # As in RFC 3550; each new interval moves the estimates by 1/16
+
 
 class StreamIO(io.BytesIO):
     """
@@ -18,7 +21,10 @@ class StreamIO(io.BytesIO):
     Typically .read() and .write() requests are done by different threads;
     this class is thread-safe by putting a threading.Lock.
     There is performance degradation in the short blocking time.
-    
+
+    Multiple consumers can read the same data independently through .reader(),
+    each getting its own read cursor over the shared buffer.
+    Data that all readers have passed is discarded from memory.
     """
 
     def __init__(
@@ -32,6 +38,16 @@ class StreamIO(io.BytesIO):
         self.bytes_written = 0
         self.bytes_total = bytes_total
 
+        self.readers = []
+        self.bytes_discarded = 0                # Absolute position of the first byte still in the buffer
+        self.discard_threshold = DEFAULT_DISCARD_THRESHOLD
+        self._primary_read = False              # Whether .read() of this object itself is also a consumer
+
+        # Timing of writes, so that consumers can judge how much to buffer
+        self.last_write = None
+        self.write_interval = None              # Smoothed seconds between writes
+        self.write_jitter = None                # Smoothed deviation from write_interval, in seconds
+
         super().__init__(*args, **kwargs)   # Do not put the initial_bytes in - otherwise bytes_written will be wrong
 
         if (initial_bytes):
@@ -49,8 +65,143 @@ class StreamIO(io.BytesIO):
         """
 
         with self.lock:
-            return super().read(*args, **kwargs)
-            
+            self._primary_read = True
+            _return = super().read(*args, **kwargs)
+
+            if (self.readers):
+                self._discard()
+
+            return _return
+
+    def readinto(
+        self,
+        b:Union[bytearray, memoryview],
+    )->int:
+        """
+        Read bytes into a preallocated buffer within thread lock.
+        """
+
+        with self.lock:
+            self._primary_read = True
+            _return = super().readinto(b)
+
+            if (self.readers):
+                self._discard()
+
+            return _return
+
+    def reader(
+        self,
+    )->"StreamIOReader":
+        """
+        Create an independent read cursor over this object's data.
+
+        Each reader starts from the oldest data still held, and reads at its own pace;
+        create all readers before any of them starts reading, so that none misses the start of the data.
+        """
+
+        with self.lock:
+            _reader = StreamIOReader(
+                source = self,
+                position = self.bytes_discarded,
+            )
+            self.readers.append(_reader)
+
+        return _reader
+
+    def _read_at(
+        self,
+        reader:"StreamIOReader",
+        size:int = -1,
+    )->bytes:
+        """
+        Read bytes for `reader` from its own position, then advance it.
+        """
+
+        with self.lock:
+            _start = max(reader.position - self.bytes_discarded, 0)
+
+            with self.getbuffer() as _view:
+                _end = len(_view) if (size is None or size < 0) else min(len(_view), _start + size)
+                _data = bytes(_view[_start:_end])
+
+            reader.position = self.bytes_discarded + _start + len(_data)
+
+            self._discard()
+
+        return _data
+
+    def _readinto_at(
+        self,
+        reader:"StreamIOReader",
+        b:Union[bytearray, memoryview],
+    )->int:
+        """
+        Read bytes for `reader` from its own position into `b`, then advance it.
+        """
+
+        with self.lock:
+            _start = max(reader.position - self.bytes_discarded, 0)
+
+            with self.getbuffer() as _view:
+                _size = max(min(len(_view) - _start, len(b)), 0)
+                b[:_size] = _view[_start:_start+_size]
+
+            reader.position = self.bytes_discarded + _start + _size
+
+            self._discard()
+
+        return _size
+
+    def _detach(
+        self,
+        reader:"StreamIOReader",
+    )->None:
+        """
+        Stop tracking `reader`, so that it no longer holds data in memory.
+        """
+
+        with self.lock:
+            if (reader in self.readers):
+                self.readers.remove(reader)
+
+    def _discard(
+        self,
+    )->None:
+        """
+        Free the data that all consumers had already read.
+
+        Must be called within thread lock.
+        Only done once the freed data is larger than both `discard_threshold` and the remaining data,
+        so the cost of moving the remaining data is amortised.
+        """
+
+        if (not self.readers):
+            return
+
+        _relative_positions = [ _reader.position - self.bytes_discarded for _reader in self.readers ]
+        if (self._primary_read):
+            _relative_positions.append(super().tell())
+
+        _freed = min(_relative_positions)
+        with self.getbuffer() as _view:
+            _remaining = len(_view) - _freed
+
+        if (_freed <= 0 or _freed < max(self.discard_threshold, _remaining)):
+            return
+
+        with self.getbuffer() as _view:
+            _tail = bytes(_view[_freed:])
+
+        _pos = super().tell()
+
+        super().seek(0, io.SEEK_SET)
+        super().write(_tail)
+        super().truncate(len(_tail))
+        super().seek(max(_pos - _freed, 0), io.SEEK_SET)
+
+        self.bytes_discarded += _freed
+
 
     def write(
         self,
@@ -77,7 +228,29 @@ class StreamIO(io.BytesIO):
 
             self.bytes_written += len(b)
 
+            self._record_write()
+
         return _return
+
+    def _record_write(
+        self,
+    )->None:
+        """
+        Update the write interval and jitter estimates.
+        """
+        _now = timer.perf_counter()
+
+        if (self.last_write is not None):
+            _interval = _now - self.last_write
+
+            if (self.write_interval is None):
+                self.write_interval = _interval
+                self.write_jitter = 0.0
+            else:
+                self.write_jitter += (abs(_interval - self.write_interval) - self.write_jitter) / JITTER_SMOOTHING
+                self.write_interval += (_interval - self.write_interval) / JITTER_SMOOTHING
+
+        self.last_write = _now
     
     def await_data(
         self,
@@ -105,6 +278,188 @@ class StreamIO(io.BytesIO):
 
             timer.sleep(interval)
 
+    @property
+    def complete(
+        self,
+    )->bool:
+        """
+        Whether all the data had been written; only known once the producer had set .bytes_total.
+        """
+        _bytes_total = self.bytes_total
+        return isinstance(_bytes_total, int) and self.bytes_written >= _bytes_total
+
+    def await_complete(
+        self,
+        timeout:float=3,
+        interval:float=0.01,
+    )->bool:
+        """
+        A blocking function that only finish when either
+        - all data had been written, or
+        - nothing had been written for `timeout` seconds
+
+        Returns whether the data is complete.
+        """
+        _start = timer.perf_counter()
+
+        while (not self.complete):
+            _last_write = self.last_write if (self.last_write is not None) else _start
+
+            if (timer.perf_counter() - max(_last_write, _start) >= timeout):
+                break
+
+            timer.sleep(interval)
+
+        return self.complete
+
+
+class StreamIOReader(StreamIO):
+    """
+    An independent read cursor over a StreamIO, created by StreamIO.reader().
+
+    It is read-only; .bytes_written and .bytes_total reflect the source StreamIO,
+    so it can be used anywhere a StreamIO is expected, e.g. as the io of a StreamStatus.
+
+    .close() the reader when done, otherwise the source will keep the unread data in memory.
+    """
+
+    def __init__(
+        self,
+        source:StreamIO,
+        position:int = 0,
+    )->None:
+        # The buffer of this object is never used - all data lives in source.
+        io.BytesIO.__init__(self)
+
+        self.source = source
+        self.position = position
+        self.lock = source.lock
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(source={type(self.source).__name__}, position={self.position})"
+
+    @property
+    def bytes_written(
+        self,
+    )->int:
+        return self.source.bytes_written
+
+    @property
+    def bytes_total(
+        self,
+    )->int:
+        return self.source.bytes_total
+
+    @property
+    def last_write(
+        self,
+    )->float:
+        return self.source.last_write
+
+    @property
+    def write_interval(
+        self,
+    )->float:
+        return self.source.write_interval
+
+    @property
+    def write_jitter(
+        self,
+    )->float:
+        return self.source.write_jitter
+
+    def read(
+        self,
+        size:int = -1,
+    )->bytes:
+        """
+        Read bytes from this reader's own position.
+        """
+        if (self.closed):
+            raise ValueError("I/O operation on closed file.")
+
+        return self.source._read_at(self, size)
+
+    def readinto(
+        self,
+        b:Union[bytearray, memoryview],
+    )->int:
+        """
+        Read bytes from this reader's own position into a preallocated buffer.
+        """
+        if (self.closed):
+            raise ValueError("I/O operation on closed file.")
+
+        return self.source._readinto_at(self, b)
+
+    def reader(
+        self,
+    )->"StreamIOReader":
+        """
+        Create another reader over the same source.
+        """
+        return self.source.reader()
+
+    def readable(
+        self,
+    )->bool:
+        return True
+
+    def writable(
+        self,
+    )->bool:
+        return False
+
+    def write(
+        self,
+        b:bytes,
+        *args,
+        **kwargs,
+    ):
+        raise io.UnsupportedOperation(
+            f"{type(self).__name__} is read-only; write to its source instead."
+        )
+
+    def tell(
+        self,
+    )->int:
+        return self.position
+
+    def seek(
+        self,
+        offset:int,
+        whence:int = io.SEEK_SET,
+    )->int:
+        """
+        Move the read position.
+        Positions are absolute from the start of the source's data;
+        data already discarded cannot be seeked to.
+        """
+        _base = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self.position,
+            io.SEEK_END: self.source.bytes_written,
+        }.get(whence, 0)
+
+        with self.lock:
+            _position = _base + offset
+            if (_position < self.source.bytes_discarded):
+                raise exceptions.StreamIOError(
+                    f"Cannot seek to {_position}; data before {self.source.bytes_discarded} had been discarded."
+                )
+
+            self.position = min(_position, self.source.bytes_written)
+
+        return self.position
+
+    def close(
+        self,
+    )->None:
+        self.source._detach(self)
+        super().close()
+
 
 class WaveStreamIO(StreamIO):
     """
@@ -177,35 +532,117 @@ class WaveStreamIO(StreamIO):
             **kwargs,
         )
 
+    @classmethod
+    def from_bytes(
+        cls,
+        data:bytes,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+    )->Union[
+        "WaveStreamIO",
+        Exception,
+    ]:
+        """
+        Play a WAV file already in memory.
+        """
+
+        _header = file.WavHeader.from_data(data)
+
+        if (not _header):
+            return _header.is_valid
+
+        _io = cls(
+            initial_bytes = data,
+            bytes_total = _header.data_size,
+        )
+
+        if (callback):
+            callback(
+                None, # None instead of FFmpegCommand - we didn't use one
+                len(data),
+            )
+
+        return _io
+
     @classmethod
     def from_file(
         cls,
         path:str,
         chunk_size:int=file.DEFAULT_FILE_CHUNK_SIZE,
         callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
     ):
         """
         Play a WAV file from local file.
 
         Uses threading to load the file in chunks - does not read the whole file in one block.
         This allows for slow I/O like memory cards or network storages to not block execution.
+
+        If `start_at` or `end_at` (in seconds) is provided, the file is seeked straight to the
+        corresponding frame, and a header is synthesized for the remaining data;
+        nothing before `start_at` is read.
         """
 
         # This is a bit weird, but we ought to at least get the header of the file through before we start a stream.
-        # So we should at least read the first 44 bytes of the file, and feed it as initial_bytes.
-        chunk_size = max(chunk_size, 44)
+        # So we should at least read the whole header of the file, and feed it as initial_bytes.
+        chunk_size = max(chunk_size, file.WAV_MAX_HEADER_SIZE)
         _size = file.get_file_size(path=path)
 
         if (_size):
-            _f = open(path, "r+b")
-            
+            _f = open(path, "rb")
+
             try:
-                _initial_bytes = _f.read(chunk_size)
+                if (start_at is None and end_at is None):
+                    _initial_bytes = _f.read(chunk_size)
+                    _bytes_remaining = None     # Read until EOF
+
+                    _header = file.WavHeader.from_data(_initial_bytes)
+
+                    if (not _header):
+                        _f.close()
+                        return _header.is_valid
+
+                    # Data only, as StreamStatus counts; a file cut short ends where it does
+                    _bytes_total = min(_header.data_size, _size - _header.header_size)
+                else:
+                    _header = file.WavHeader.from_data(_f.read(file.WAV_MAX_HEADER_SIZE))
+
+                    if (not _header):
+                        _f.close()
+                        return _header.is_valid
+
+                    _start, _end = _header.get_byte_range(
+                        start_at = start_at,
+                        end_at = end_at,
+                    )
+                    _end = min(_end, _size)
+
+                    if (_end <= _start):
+                        _f.close()
+                        return exceptions.InvalidInputParameters(
+                            f"Nothing to play from {path} between start_at={start_at} and end_at={end_at}."
+                        )
+
+                    _header = _header.resize(_end - _start)
+
+                    _f.seek(_start, io.SEEK_SET)
+                    _bytes_remaining = _end - _start
+
+                    _data = _f.read(min(chunk_size, _bytes_remaining))
+                    _bytes_remaining -= len(_data)
+
+                    _initial_bytes = _header.construct() + _data
+                    _bytes_total = _end - _start
+
                 _io = cls(
                     initial_bytes = _initial_bytes,
-                    bytes_total = _size,
+                    bytes_total = _bytes_total,
                 )
 
+            except exceptions.InvalidInputParameters as e:
+                # start_at or end_at could not be parsed
+                _f.close()
+                return e
             except (
                     IOError,
                     OSError,
@@ -214,6 +651,19 @@ class WaveStreamIO(StreamIO):
                 _f.close()
                 return exceptions.FileIOError(f"Fails to read header from {path}.")
 
+            def _read_chunk()->bytes:
+                """
+                Read the next chunk, stopping at the end of the requested range if any.
+                """
+                nonlocal _bytes_remaining
+
+                if (_bytes_remaining is None):
+                    return _f.read(chunk_size)
+                else:
+                    _data = _f.read(min(chunk_size, _bytes_remaining))
+                    _bytes_remaining -= len(_data)
+                    return _data
+
             # This is the function to hand off to threading
             def _iter_callback(
                 gen:Callable[[], bytes],
@@ -243,7 +693,7 @@ class WaveStreamIO(StreamIO):
 
             # Fire and forget: start piping file to IO
             threading.Thread(target=lambda : _iter_callback(
-                        gen = lambda : _f.read(chunk_size),
+                        gen = _read_chunk,
                         push_data = _io.write,
                     )).start()
 
@@ -259,6 +709,8 @@ class WaveStreamIO(StreamIO):
         chunk_size:int = http.DEFAULT_HTTP_CHUNK_SIZE,
         params:Dict[str, Any]={},
         callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
         **kwargs,
     )->Union[
         "WaveStreamIO",
@@ -269,59 +721,102 @@ class WaveStreamIO(StreamIO):
 
         Uses threading to load the request in chunks - does not read the whole file in one block.
         This allows for slow connection to not block exeuction.
+
+        If `start_at` or `end_at` (in seconds) is provided, only the header and the requested
+        frames are downloaded, using HTTP Range requests; a header is synthesized for the remaining data.
         """
 
-        # Request returned 200 OK
-        _data_generator = http.iter_http_data(
-            url = url,
-            params = params,
-            timeout = timeout,
-            chunk_size = max(46, chunk_size), # chunk_size cannot be smaller than a single header
-            **kwargs,
-        )
+        if (start_at is None and end_at is None):
+            # Request returned 200 OK
+            _data_generator = http.iter_http_data(
+                url = url,
+                params = params,
+                timeout = timeout,
+                chunk_size = max(46, chunk_size), # chunk_size cannot be smaller than a single header
+                **kwargs,
+            )
 
-        if (_data_generator):
-            # If a valid generator was returned
+            if (not _data_generator):
+                return _data_generator
 
             _data_chunk = next(_data_generator)
             _header = file.WavHeader.from_data(_data_chunk)
+        else:
+            # Fetch the header alone first, so we know where to seek to
+            _header_bytes = http.get_http_data(
+                url = url,
+                byte_range = (0, file.WAV_MAX_HEADER_SIZE-1),
+                params = params,
+                timeout = timeout,
+                **kwargs,
+            )
+
+            if (not isinstance(_header_bytes, bytes)):
+                return _header_bytes
+
+            _header = file.WavHeader.from_data(_header_bytes)
 
             if (_header):
-                # If the header is complete and valid, build our WaveStreamIO object
-                _io = cls(
-                    initial_bytes = _data_chunk,
-                    bytes_total = _header.data_size,
-                )
-                
-            else:
-                # If the header it not valid, it will be an Exception already detailing what went wrong
-                return _header
-        
-            # Loop for rest of generator to download data
-            def _iter_callback(
-                gen:Iterable[bytes],
-                push_data:Callable[[bytes], None],
-            )->None:
-                bytes_total = 0
-                for _data_chunk in gen:
-                    # Thread?
-                    bytes_total += len(_data_chunk)
-                    push_data(_data_chunk)
-                
-                if (callback):
-                    callback(
-                        None, # None instead of FFmpegCommand - we didn't use one
-                        bytes_total,
+                try:
+                    _start, _end = _header.get_byte_range(
+                        start_at = start_at,
+                        end_at = end_at,
                     )
+                except exceptions.InvalidInputParameters as e:
+                    return e
 
-            # Fire and forget: start downloading
-            threading.Thread(target=lambda : _iter_callback(
-                        gen = _data_generator,
-                        push_data = _io.write,
-                    )).start()
+                if (_end <= _start):
+                    return exceptions.InvalidInputParameters(
+                        f"Nothing to play from {url} between start_at={start_at} and end_at={end_at}."
+                    )
+
+                _header = _header.resize(_end - _start)
+                _data_chunk = _header.construct()
+
+                _data_generator = http.iter_http_data(
+                    url = url,
+                    params = params,
+                    timeout = timeout,
+                    chunk_size = chunk_size,
+                    byte_range = (_start, _end-1),
+                    **kwargs,
+                )
+
+                if (not _data_generator):
+                    return _data_generator
+
+        if (_header):
+            # If the header is complete and valid, build our WaveStreamIO object
+            _io = cls(
+                initial_bytes = _data_chunk,
+                bytes_total = _header.data_size,
+            )
             
-            return _io
-    
         else:
-            return _data_generator
+            # If the header it not valid, it will be an Exception already detailing what went wrong
+            return _header.is_valid
+    
+        # Loop for rest of generator to download data
+        def _iter_callback(
+            gen:Iterable[bytes],
+            push_data:Callable[[bytes], None],
+        )->None:
+            bytes_total = 0
+            for _data_chunk in gen:
+                # Thread?
+                bytes_total += len(_data_chunk)
+                push_data(_data_chunk)
+            
+            if (callback):
+                callback(
+                    None, # None instead of FFmpegCommand - we didn't use one
+                    bytes_total,
+                )
 
+        # Fire and forget: start downloading
+        threading.Thread(target=lambda : _iter_callback(
+                    gen = _data_generator,
+                    push_data = _io.write,
+                )).start()
+        
+        return _io
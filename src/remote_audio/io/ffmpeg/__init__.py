@@ -1,11 +1,19 @@
 from remote_audio.io.ffmpeg.formats import FFMPEG_FORMATS
+from remote_audio.io.ffmpeg.format_index import \
+    FORMAT_ALIASES, \
+    FORMAT_CODECS, \
+    FORMAT_EXTENSIONS, \
+    FORMAT_MIME_TYPES, \
+    resolve_format
 
+import remote_audio.io.ffmpeg.format_index as format_index
 import remote_audio.io.ffmpeg.classes as classes
 import remote_audio.io.ffmpeg.stream_specifier as stream_specifier
 
 import remote_audio.io.ffmpeg.io_protocol as io_protocol
 import remote_audio.io.ffmpeg.io_devices as io_devices
 import remote_audio.io.ffmpeg.main_options as main_options
+import remote_audio.io.ffmpeg.audio_options as audio_options
 import remote_audio.io.ffmpeg.command as command
 
 
@@ -55,5 +63,9 @@ from remote_audio.io.ffmpeg.main_options import \
     FFmpegOptionTimestamp, \
     FFmpegOptionTo
 
+from remote_audio.io.ffmpeg.audio_options import \
+    FFmpegOptionAudioChannels, \
+    FFmpegOptionAudioRate
+
 from remote_audio.io.ffmpeg.command import \
     FFmpegCommand
\ No newline at end of file
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import shlex
+
+from remote_audio.io.ffmpeg.stream_specifier import FFmpegStreamSpecifier
+import remote_audio.io.ffmpeg.classes as classes
+
+"""
+FFmpeg Audio options
+https://ffmpeg.org/ffmpeg.html#Audio-Options
+
+Only `-ar` and `-ac` are implemented, which is what resampling to a device needs;
+`-aframes`, `-aq`, `-an`, `-acodec`, `-sample_fmt` and `-af` are not.
+"""
+
+
+@classes.ffmpegioclass
+class FFmpegOptionAudioRate(classes.FFmpegMainOptions):
+    """
+    `-ar[:stream_specifier] freq (input/output,per-stream)`
+
+    Set the audio sampling frequency. For output streams it is set by default to the frequency of the corresponding input stream. For input streams this option only makes sense for audio grabbing devices and raw demuxers and is mapped to the corresponding demuxer options.
+    """
+    freq:int = None
+    stream_specifier:FFmpegStreamSpecifier = FFmpegStreamSpecifier()
+    parameter_name:str = "ar"
+    option_type:classes.FFmpegOptionType = classes.FFmpegOptionType.INPUT_OUTPUT
+
+    @property
+    def io_string(
+        self,
+    )->list:
+        _super_io = super().io_string
+        _super_io[-1] += self.stream_specifier.as_suffix(":")
+
+        return _super_io + [
+            f"{shlex.quote(str(self.freq))}",
+        ]
+
+    @classmethod
+    def create(
+        cls,
+        freq:int,
+        stream_specifier:FFmpegStreamSpecifier = FFmpegStreamSpecifier(),
+        option_type:classes.FFmpegOptionType = classes.FFmpegOptionType.OUTPUT,
+        *args,
+        **kwargs,
+    ):
+        """
+        Create an instance of the class using format.
+
+        This class method is necessary because the class inheritance messed up the
+        ordering of parameters of __init__.
+        Currently __init__(
+            option_type,
+            ...
+        )
+        which makes it hard to call __init__ intuitively.
+        """
+
+        return cls(
+            freq = freq,
+            stream_specifier = stream_specifier,
+            option_type = option_type,
+            *args,
+            **kwargs,
+        )
+
+@classes.ffmpegioclass
+class FFmpegOptionAudioChannels(classes.FFmpegMainOptions):
+    """
+    `-ac[:stream_specifier] channels (input/output,per-stream)`
+
+    Set the number of audio channels. For output streams it is set by default to the number of input audio channels. For input streams this option only makes sense for audio grabbing devices and raw demuxers and is mapped to the corresponding demuxer options.
+    """
+    channels:int = None
+    stream_specifier:FFmpegStreamSpecifier = FFmpegStreamSpecifier()
+    parameter_name:str = "ac"
+    option_type:classes.FFmpegOptionType = classes.FFmpegOptionType.INPUT_OUTPUT
+
+    @property
+    def io_string(
+        self,
+    )->list:
+        _super_io = super().io_string
+        _super_io[-1] += self.stream_specifier.as_suffix(":")
+
+        return _super_io + [
+            f"{shlex.quote(str(self.channels))}",
+        ]
+
+    @classmethod
+    def create(
+        cls,
+        channels:int,
+        stream_specifier:FFmpegStreamSpecifier = FFmpegStreamSpecifier(),
+        option_type:classes.FFmpegOptionType = classes.FFmpegOptionType.OUTPUT,
+        *args,
+        **kwargs,
+    ):
+        """
+        Create an instance of the class using format.
+
+        This class method is necessary because the class inheritance messed up the
+        ordering of parameters of __init__.
+        Currently __init__(
+            option_type,
+            ...
+        )
+        which makes it hard to call __init__ intuitively.
+        """
+
+        return cls(
+            channels = channels,
+            stream_specifier = stream_specifier,
+            option_type = option_type,
+            *args,
+            **kwargs,
+        )
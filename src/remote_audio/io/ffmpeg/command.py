@@ -127,4 +127,18 @@ class FFmpegCommand(ShellCommand):
 
         if (value is not None):
             # Allow super().__init__() to call a meaningless self.command
-            raise RuntimeError(f"{type(self).__name__}.command is read only.")
\ No newline at end of file
+            raise RuntimeError(f"{type(self).__name__}.command is read only.")
+
+    def close_stdin(
+        self,
+    )->None:
+        """
+        Close stdin of the FFmpeg process, signalling the end of input data.
+
+        Only meaningful when the input is a pipe; FFmpeg will not finish until this is called.
+        """
+
+        _stdin = getattr(getattr(self, "process", None), "stdin", None)
+
+        if (_stdin is not None and not _stdin.closed):
+            _stdin.close()
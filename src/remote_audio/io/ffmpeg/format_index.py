@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+
+import os
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Union
+from urllib.parse import urlparse
+
+from remote_audio.io.ffmpeg.formats import FFMPEG_FORMATS
+
+"""
+Precomputed lookup of FFmpeg demuxers by alias, file extension, MIME type and codec.
+
+FFMPEG_FORMATS is keyed by demuxer name, which can be a comma separated list of aliases,
+e.g. "mov,mp4,m4a,3gp,3g2,mj2"; some aliases also appear as keys on their own for muxers only,
+e.g. "mp4". The indices below only ever point to demux capable entries, so whatever they return
+can be used as an input format.
+
+All indices are built once at import and are read only.
+"""
+
+# File extensions that do not coincide with a demuxer alias.
+# Entries for demuxers that FFmpeg cannot demux are dropped when the index is built.
+_EXTENSIONS = {
+    "aif":      "aiff",
+    "aifc":     "aiff",
+    "m4b":      "m4a",
+    "m4r":      "m4a",
+    "mka":      "matroska",
+    "mkv":      "matroska",
+    "mpga":     "mp3",
+    "oga":      "ogg",
+    "ogv":      "ogg",
+    "opus":     "ogg",
+    "spx":      "ogg",
+    "snd":      "au",
+    "wave":     "wav",
+    "wma":      "asf",
+    "wmv":      "asf",
+    "ra":       "rm",
+    "mp+":      "mpc",
+    "mpp":      "mpc",
+}
+
+_MIME_TYPES = {
+    "application/ogg":          "ogg",
+    "audio/3gpp":               "3gp",
+    "audio/3gpp2":              "3g2",
+    "audio/aac":                "aac",
+    "audio/aacp":               "aac",
+    "audio/ac3":                "ac3",
+    "audio/aiff":               "aiff",
+    "audio/amr":                "amr",
+    "audio/basic":              "au",
+    "audio/eac3":               "eac3",
+    "audio/flac":               "flac",
+    "audio/m4a":                "m4a",
+    "audio/mp3":                "mp3",
+    "audio/mp4":                "m4a",
+    "audio/mpeg":               "mp3",
+    "audio/mpeg3":              "mp3",
+    "audio/ogg":                "ogg",
+    "audio/opus":               "ogg",
+    "audio/vnd.rn-realaudio":   "rm",
+    "audio/vnd.wave":           "wav",
+    "audio/vorbis":             "ogg",
+    "audio/wav":                "wav",
+    "audio/wave":               "wav",
+    "audio/webm":               "webm",
+    "audio/x-aac":              "aac",
+    "audio/x-aiff":             "aiff",
+    "audio/x-caf":              "caf",
+    "audio/x-flac":             "flac",
+    "audio/x-m4a":              "m4a",
+    "audio/x-matroska":         "matroska",
+    "audio/x-mpeg":             "mp3",
+    "audio/x-mpeg-3":           "mp3",
+    "audio/x-ms-wma":           "asf",
+    "audio/x-pn-realaudio":     "rm",
+    "audio/x-wav":              "wav",
+    "audio/x-wavpack":          "wv",
+    "video/mp4":                "mp4",
+    "video/ogg":                "ogg",
+    "video/quicktime":          "mov",
+    "video/webm":               "webm",
+    "video/x-matroska":         "matroska",
+    "video/x-ms-asf":           "asf",
+}
+
+# Codec names, e.g. from `ffprobe` or the `codecs=` parameter of a MIME type,
+# mapped to the container they are most commonly found in on their own.
+_CODECS = {
+    "aac":      "aac",
+    "ac3":      "ac3",
+    "alac":     "m4a",
+    "eac3":     "eac3",
+    "flac":     "flac",
+    "mp3":      "mp3",
+    "opus":     "ogg",
+    "pcm_s16le":"wav",
+    "pcm_s24le":"wav",
+    "pcm_f32le":"wav",
+    "speex":    "ogg",
+    "truehd":   "truehd",
+    "vorbis":   "ogg",
+    "wavpack":  "wv",
+    "wmav2":    "asf",
+}
+
+
+def build_alias_index(
+    formats:Dict[str, Dict[str, Union[str, bool]]] = FFMPEG_FORMATS,
+)->Mapping[str, str]:
+    """
+    Map every alias of every demux capable format to its demuxer name.
+    """
+
+    _index = {}
+
+    for _demuxer, _properties in formats.items():
+        if (_properties.get("demux")):
+            for _alias in _demuxer.split(","):
+                _index.setdefault(_alias.lower(), _demuxer)
+
+    return MappingProxyType(_index)
+
+def build_index(
+    mapping:Dict[str, str],
+    aliases:Mapping[str, str],
+)->Mapping[str, str]:
+    """
+    Resolve the values of `mapping` from aliases to demuxer names,
+    dropping anything that has no demuxer.
+    """
+
+    return MappingProxyType({
+        _key.lower():aliases[_alias] \
+            for _key, _alias in mapping.items() \
+                if _alias in aliases
+    })
+
+
+FORMAT_ALIASES = build_alias_index()
+FORMAT_EXTENSIONS = MappingProxyType({
+    **FORMAT_ALIASES,
+    **build_index(_EXTENSIONS, FORMAT_ALIASES),
+})
+FORMAT_MIME_TYPES = build_index(_MIME_TYPES, FORMAT_ALIASES)
+FORMAT_CODECS = build_index(_CODECS, FORMAT_ALIASES)
+
+
+def get_input_format(
+    demuxer:str,
+)->str:
+    """
+    The name to pass to FFmpeg `-f` for a demuxer, i.e. its first alias.
+    """
+    return demuxer.split(",")[0]
+
+def _lookup(
+    key:str,
+    indices:Iterable[Mapping[str, str]],
+)->Union[
+    str,
+    None,
+]:
+    if (not key):
+        return None
+
+    for _index in indices:
+        _demuxer = _index.get(key)
+
+        if (_demuxer):
+            return get_input_format(_demuxer)
+
+    return None
+
+def from_alias(
+    alias:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve a format name or any of its aliases, e.g. "m4a", to an input format.
+    """
+    return _lookup(str(alias).strip().lower(), (FORMAT_ALIASES, ))
+
+def from_extension(
+    extension:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve a file extension, with or without the leading dot, to an input format.
+    """
+    return _lookup(str(extension).strip().lower().lstrip("."), (FORMAT_EXTENSIONS, ))
+
+def from_mime_type(
+    mime_type:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve a MIME type, e.g. a Content-Type header such as "audio/mpeg; charset=binary", to an input format.
+    """
+    if (not mime_type):
+        return None
+
+    _mime_type, *_parameters = str(mime_type).lower().split(";")
+    _format = _lookup(_mime_type.strip(), (FORMAT_MIME_TYPES, ))
+
+    if (not _format):
+        # Generic types such as "application/octet-stream" may still carry a usable codecs parameter
+        for _parameter in _parameters:
+            _name, _, _value = _parameter.partition("=")
+
+            if (_name.strip() == "codecs"):
+                _format = from_codec(_value.strip(" \"'").split(",")[0])
+                break
+
+    return _format
+
+def from_codec(
+    codec:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve a codec name, e.g. "vorbis", to the input format it is usually contained in.
+    """
+    return _lookup(str(codec).strip().lower(), (FORMAT_CODECS, ))
+
+def from_path(
+    path:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve the extension of a local path or URL to an input format.
+    Query strings and fragments of URLs are ignored.
+    """
+    if (not path):
+        return None
+
+    _path = urlparse(path).path if "://" in path else path
+    _extension = os.path.splitext(_path)[1]
+
+    return from_extension(_extension) if _extension else None
+
+def resolve_format(
+    format:str,
+)->Union[
+    str,
+    None,
+]:
+    """
+    Resolve anything that could describe a format - an alias, a file extension, a MIME type or a codec -
+    to an input format. Returns None if none of the indices know it.
+    """
+    if (not format):
+        return None
+
+    if ("/" in format):
+        return from_mime_type(format)
+
+    return from_alias(format) or \
+           from_extension(format) or \
+           from_codec(format)
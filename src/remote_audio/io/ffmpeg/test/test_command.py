@@ -0,0 +1,84 @@
+import quicktest as unittest
+
+from remote_audio.io.ffmpeg.command import FFmpegCommand
+import remote_audio.io.ffmpeg.classes as classes
+import remote_audio.io.ffmpeg.main_options as main_options
+import remote_audio.io.ffmpeg.audio_options as audio_options
+import remote_audio.io.ffmpeg.io_protocol as io_protocol
+
+
+class TestFFmpegCommand(unittest.TestCase):
+    def test_argument_order(self):
+        """
+        Test input options, including -ss and -to for input seeking, go before -i; output options after it, before the output.
+        """
+        _command = FFmpegCommand(
+            input = io_protocol.FFmpegProtocolFile.create(path="./test.mp3"),
+            output = io_protocol.FFmpegProtocolPipe.create(pipe=1),
+            options = [
+                # Deliberately out of order; the type of each option decides where it goes
+                main_options.FFmpegOptionFormat.create(
+                    format = "s16le",
+                    option_type = classes.FFmpegOptionType.OUTPUT,
+                ),
+                main_options.FFmpegOptionSeek.create(
+                    position = 1.5,
+                    option_type = classes.FFmpegOptionType.INPUT,
+                ),
+                audio_options.FFmpegOptionAudioRate.create(
+                    freq = 48000,
+                ),
+                main_options.FFmpegOptionTo.create(
+                    position = "00:00:04",
+                    option_type = classes.FFmpegOptionType.INPUT,
+                ),
+                main_options.FFmpegOptionFormat.create(
+                    format = "mp3",
+                    option_type = classes.FFmpegOptionType.INPUT,
+                ),
+            ],
+        )
+
+        self.assertNotIsInstance(_command, Exception)
+        self.assertListEqual(
+            _command.command,
+            [
+                "ffmpeg",
+                "-ss", "1.5",
+                "-to", "00:00:04",
+                "-f", "mp3",
+                "-i", "file:./test.mp3",
+                "-f", "s16le",
+                "-ar", "48000",
+                "pipe:1",
+            ],
+        )
+
+    def test_output_seek(self):
+        """
+        Test -ss and -to given as output options go after -i, where FFmpeg decodes up to the position rather than seeking.
+        """
+        _command = FFmpegCommand(
+            input = io_protocol.FFmpegProtocolPipe.create(pipe=0),
+            output = io_protocol.FFmpegProtocolPipe.create(pipe=1),
+            options = [
+                main_options.FFmpegOptionSeek.create(
+                    position = 2,
+                    option_type = classes.FFmpegOptionType.OUTPUT,
+                ),
+                main_options.FFmpegOptionTo.create(
+                    position = 3,
+                    option_type = classes.FFmpegOptionType.OUTPUT,
+                ),
+            ],
+        )
+
+        self.assertNotIsInstance(_command, Exception)
+        self.assertListEqual(
+            _command.command,
+            ["ffmpeg", "-i", "pipe:0", "-ss", "2", "-to", "3", "pipe:1"],
+        )
+
+
+if (__name__=="__main__"):
+    unittest.main()
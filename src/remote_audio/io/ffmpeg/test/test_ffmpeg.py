@@ -7,6 +7,7 @@ from remote_audio.io.ffmpeg.stream_specifier import FFmpegStreamSpecifier, \
                                                     FFmpegStreamType
 import remote_audio.io.ffmpeg.classes as classes
 import remote_audio.io.ffmpeg.main_options as main_options
+import remote_audio.io.ffmpeg.audio_options as audio_options
 
 
 class TestFFmpeg(unittest.TestCase):
@@ -270,6 +271,35 @@ class TestFFmpeg(unittest.TestCase):
         _answer = ["-"+_option.parameter_name]
         self.assertListEqual(_option.io_string, _answer)
 
+    def test_audio_options(self):
+        """
+        Test all FFmpeg audio options to ensure .io_string is producing what we expected.
+        """
+
+        _freq = 48000
+        _channels = 2
+
+        _option = audio_options.FFmpegOptionAudioRate.create(
+                freq=_freq,
+            )
+        _answer = ["-"+_option.parameter_name, str(_freq)]
+        self.assertListEqual(_option.io_string, _answer)
+        self.assertIs(_option.option_type, classes.FFmpegOptionType.OUTPUT)
+
+        _option = audio_options.FFmpegOptionAudioRate.create(
+                freq=_freq,
+                stream_specifier= FFmpegStreamSpecifier(0, "a"),
+            )
+        _answer = ["-"+_option.parameter_name+":a:0", str(_freq)]
+        self.assertListEqual(_option.io_string, _answer)
+
+        _option = audio_options.FFmpegOptionAudioChannels.create(
+                channels=_channels,
+            )
+        _answer = ["-"+_option.parameter_name, str(_channels)]
+        self.assertListEqual(_option.io_string, _answer)
+        self.assertIs(_option.option_type, classes.FFmpegOptionType.OUTPUT)
+
 
 if (__name__=="__main__"):
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import quicktest as unittest
+
+import remote_audio.io.ffmpeg.format_index as format_index
+
+
+class TestFormatIndex(unittest.TestCase):
+    def test_aliases(self):
+        """
+        Test aliases resolve to demux capable formats, even where a mux only format shares the name.
+        """
+        self.assertEqual(format_index.resolve_format("mp3"), "mp3")
+        self.assertEqual(format_index.resolve_format("M4A"), "mov")
+        self.assertEqual(format_index.resolve_format("mp4"), "mov")
+        self.assertEqual(format_index.resolve_format("webm"), "matroska")
+
+        self.assertIsNone(format_index.resolve_format("not_a_format"))
+
+        for _demuxer in format_index.FORMAT_EXTENSIONS.values():
+            self.assertTrue(format_index.FFMPEG_FORMATS[_demuxer]["demux"])
+
+    def test_extensions(self):
+        """
+        Test file extensions, paths and URLs resolve to formats.
+        """
+        self.assertEqual(format_index.from_extension(".oga"), "ogg")
+        self.assertEqual(format_index.from_extension("aif"), "aiff")
+        self.assertEqual(format_index.from_path("/tmp/Track 01.flac"), "flac")
+        self.assertEqual(format_index.from_path("https://somedomain.com/file.m4a?token=a.b"), "mov")
+
+        self.assertIsNone(format_index.from_path("https://somedomain.com/stream"))
+
+    def test_mime_types(self):
+        """
+        Test Content-Type headers resolve to formats.
+        """
+        self.assertEqual(format_index.resolve_format("audio/mpeg"), "mp3")
+        self.assertEqual(format_index.resolve_format("Audio/OGG; codecs=opus"), "ogg")
+        self.assertEqual(format_index.from_mime_type("application/octet-stream; codecs=\"flac\""), "flac")
+
+        self.assertIsNone(format_index.from_mime_type("text/html; charset=utf-8"))
+
+    def test_immutable(self):
+        """
+        Test the indices cannot be modified.
+        """
+        with self.assertRaises(TypeError):
+            format_index.FORMAT_MIME_TYPES["audio/mpeg"] = "wav"
+
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -3,10 +3,11 @@
 import os, sys
 from enum import Enum
 import io
+import re
 
 from typing import Any, Dict, Tuple, Union
 
-from remote_audio.exceptions import FileIOError, WavFormatError
+from remote_audio.exceptions import FileIOError, InvalidInputParameters, WavFormatError
 
 
 """
@@ -19,6 +20,7 @@ http://www-mmsp.ece.mcgill.ca/Documents/AudioFormats/WAVE/WAVE.html
 
 DEFAULT_FILE_CHUNK_SIZE = 2**20
 WAV_MAX_CHUNKSIZE = 0xFFFFFFFF-36
+WAV_MAX_HEADER_SIZE = 68    # EXTENSIBLE fmt chunk (40 bytes) + RIFF, fmt and data chunk headers
 
 class WavFMTVariant(Enum):
     PCM = 16
@@ -379,7 +381,7 @@ class WavHeader(dict):
         """
 
         if (_return := self.is_valid):
-            return self.get("Subchunk1Size", 16) + 20 + 8 # Count ChunkID and ChunkSize
+            return self.get("Subchunk1Size", WavFMTVariant.PCM).value + 20 + 8 # Count ChunkID and ChunkSize
         else:
             return _return
 
@@ -417,6 +419,63 @@ class WavHeader(dict):
             return _return
 
 
+    def get_frame_offset(
+        self,
+        position:Union[float, str],
+    )->int:
+        """
+        Byte offset of `position` (in seconds) from the start of the data chunk.
+
+        The offset is aligned to BlockAlign, so that it always lands on the start of a frame,
+        and is clamped to the data chunk.
+        """
+
+        position = parse_duration(position)
+
+        _frames = max(int(position * self.get("SampleRate", 0)), 0)
+        _block_align = self.get("BlockAlign", 1) or 1
+        _data_size = self.get("Subchunk2Size", 0)
+
+        return min(
+            _frames * _block_align,
+            _data_size - (_data_size % _block_align),
+        )
+
+    def get_byte_range(
+        self,
+        start_at:Union[float, str]=None,
+        end_at:Union[float, str]=None,
+    )->Tuple[int, int]:
+        """
+        Absolute (start, end) byte positions in the file for the data between `start_at` and `end_at`,
+        `end` being exclusive.
+
+        This allows a WAV source to be seeked without reading anything before `start`.
+        """
+
+        _data_start = self.header_size
+
+        _start = _data_start + (self.get_frame_offset(start_at) if (start_at is not None) else 0)
+        _end = _data_start + (self.get_frame_offset(end_at) if (end_at is not None) else self.get("Subchunk2Size", 0))
+
+        return _start, max(_start, _end)
+
+    def resize(
+        self,
+        size:int,
+    )->"WavHeader":
+        """
+        Return a copy of this header with the data chunk resized to `size` bytes.
+
+        Use to synthesize a header for part of a WAV file.
+        """
+
+        _header = type(self)(self)
+        _header["Subchunk2Size"]    = size
+        _header["ChunkSize"]        = size + _header.get("Subchunk1Size").value + 20
+
+        return _header
+
     #TODO make a construct() method that regenerates the bytes?
     def construct(
         self
@@ -451,6 +510,66 @@ class WavHeader(dict):
 
         return _bytes
 
+def create_wav(
+    data:bytes,
+    channels:int = 2,
+    sample_width:int = 2,
+    sample_rate:int = 44100,
+)->io.BytesIO:
+    """
+    Wrap raw PCM `data` in a WAV header; e.g. to make sources for tests and benchmarks.
+    Returns a BytesIO at its start.
+    """
+    return io.BytesIO(
+        WavHeader.new(
+            data,
+            NumChannels = channels,
+            SampleRate = sample_rate,
+            BitsPerSample = sample_width * 8,
+        ).construct() + data
+    )
+
+def parse_duration(
+    value:Union[float, int, str],
+)->float:
+    """
+    Convert a duration to seconds.
+
+    Accepts a number of seconds, or a string in FFmpeg time duration syntax, i.e.
+    `[-][HH:]MM:SS[.m...]` or `[-]S+[.m...][s|ms|us]`.
+    """
+
+    if (isinstance(value, (int, float))):
+        return float(value)
+
+    _value = str(value).strip()
+
+    _parsed = re.match(
+        r"^(?P<sign>-)?(?:(?P<hours>\d+):)?(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d*)?)$",
+        _value,
+    )
+    if (_parsed):
+        _seconds = int(_parsed.group("hours") or 0) * 3600 + \
+                   int(_parsed.group("minutes")) * 60 + \
+                   float(_parsed.group("seconds"))
+        return -_seconds if _parsed.group("sign") else _seconds
+
+    _parsed = re.match(
+        r"^(?P<seconds>-?\d+(?:\.\d*)?)(?P<unit>s|ms|us)?$",
+        _value,
+    )
+    if (_parsed):
+        return float(_parsed.group("seconds")) / {
+            None:   1,
+            "s":    1,
+            "ms":   1e3,
+            "us":   1e6,
+        }.get(_parsed.group("unit"))
+
+    raise InvalidInputParameters(
+        f"'{value}' is not a valid time duration."
+    )
+
 def get_file_size(
     path:str,
 )->int:
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from typing import Any, Callable, Dict, Union
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
 
 from http import HTTPStatus
 import requests
@@ -51,30 +51,138 @@ def get_http_size(
         return build_exception(_response)
 
 
+def get_http_content_type(
+    url:str,
+    timeout:float = DEFAULT_HTTP_TIMEOUT,
+    params:Dict[str, Any]={},
+    **kwargs,
+)->str:
+    """
+    Send header request to query the Content-Type of a file
+    """
+
+    try:
+        _response = requests.head(
+            url=url,
+            timeout=timeout,
+            params=params,
+            allow_redirects=True,
+            **kwargs,
+        )
+    except requests.exceptions.RequestException as e:
+        # Timed out or could not connect; the caller falls back to not knowing the type
+        return HTTPIOError(f"Error occured during HTTP operation: {e}")
+
+    _content_type = _response.headers.get("content-type", None)
+
+    if (_response.status_code == HTTPStatus.OK):
+        if (_content_type):
+            return _content_type
+        else:
+            return HTTPIOError("Returned header does not contain content-type.")
+    else:
+        return build_exception(_response)
+
+
+def trim_http_data(
+    gen:Iterable[bytes],
+    skip:int = 0,
+    limit:int = None,
+)->Iterable[bytes]:
+    """
+    Drop the first `skip` bytes of a data generator, and stop after `limit` bytes.
+
+    Used when a server ignores a Range request and sends the whole file.
+    """
+
+    for _data_chunk in gen:
+        if (skip):
+            _skipped = min(skip, len(_data_chunk))
+            _data_chunk = _data_chunk[_skipped:]
+            skip -= _skipped
+
+        if (limit is not None):
+            _data_chunk = _data_chunk[:limit]
+            limit -= len(_data_chunk)
+
+        if (_data_chunk):
+            yield _data_chunk
+
+        if (limit is not None and limit <= 0):
+            break
+
 def iter_http_data(
     url:str,
     timeout:float = DEFAULT_HTTP_TIMEOUT,
     chunk_size:int = DEFAULT_HTTP_CHUNK_SIZE,
     params:Dict[str, Any]={},
+    byte_range:Tuple[int, int] = None,
     **kwargs,
 ):
     """
     Returns a generator to iterate through the content of a HTTP file.
+
+    If `byte_range` is provided as (start, end), end being inclusive,
+    only that part of the file is requested through a Range header.
     """
 
+    _headers = {}
+    if (byte_range):
+        _headers["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+
     _response = requests.get(
         url = url,
         timeout = timeout,
         params=params,
+        headers=_headers,
         allow_redirects=True,
         stream = True,
     )
 
-    if (_response.status_code == HTTPStatus.OK):
+    if (_response.status_code == HTTPStatus.PARTIAL_CONTENT and byte_range):
         return _response.iter_content(
             chunk_size = chunk_size,
             decode_unicode = False,
         )
+    elif (_response.status_code == HTTPStatus.OK):
+        _data_generator = _response.iter_content(
+            chunk_size = chunk_size,
+            decode_unicode = False,
+        )
+
+        if (byte_range):
+            # Server does not support Range; discard what we did not ask for
+            _data_generator = trim_http_data(
+                _data_generator,
+                skip = byte_range[0],
+                limit = byte_range[1] - byte_range[0] + 1,
+            )
+
+        return _data_generator
     else:
         return build_exception(_response)
 
+def get_http_data(
+    url:str,
+    byte_range:Tuple[int, int],
+    timeout:float = DEFAULT_HTTP_TIMEOUT,
+    params:Dict[str, Any]={},
+    **kwargs,
+)->bytes:
+    """
+    Get a part of a HTTP file as bytes, `byte_range` being (start, end) with end inclusive.
+    """
+
+    _data_generator = iter_http_data(
+        url = url,
+        timeout = timeout,
+        params = params,
+        byte_range = byte_range,
+        **kwargs,
+    )
+
+    if (_data_generator):
+        return b"".join(_data_generator)
+    else:
+        return _data_generator
+
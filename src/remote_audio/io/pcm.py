@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+
+import abc
+import io
+import threading
+import time as timer
+from typing import Any, BinaryIO, Callable, Union
+import wave
+
+import remote_audio.io.base_io as base_io
+from remote_audio.exceptions import StreamIOError, WavFormatError
+from remote_audio.stream import StreamStatus, DEFAULT_TIMEOUT
+
+"""
+Consumers of decoded PCM that do not involve PortAudio.
+
+Any StreamIO - e.g. `remote_audio.classes.MP3StreamIO.from_http(...)` - can be drained into a PCMSink
+instead of a device, so that the fetch/decode pipeline runs on machines without sound hardware:
+```
+with remote_audio.io.pcm.WavePCMSink("output.wav") as _sink:
+    remote_audio.io.pcm.drain(_io, _sink)
+```
+Nothing in here imports pyaudio.
+"""
+
+DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_POLL_INTERVAL = 0.01
+
+
+class PCMSink(abc.ABC):
+    """
+    Abstract consumer of PCM frames.
+
+    .open() is called once with the format of the data, before any .write().
+    """
+
+    channels:int = None
+    sample_width:int = None
+    sample_rate:int = None
+    bytes_written:int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def open(
+        self,
+        channels:int,
+        sample_width:int,
+        sample_rate:int,
+    )->None:
+        """
+        Set the format of the data that will follow.
+        """
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        """
+        Size of one frame in bytes; None if not yet opened.
+        """
+        if (self.channels and self.sample_width):
+            return self.channels * self.sample_width
+        else:
+            return None
+
+    @abc.abstractmethod
+    def write(
+        self,
+        data:bytes,
+    )->int:
+        """
+        Consume PCM frames. Returns the number of bytes consumed.
+        """
+
+    def close(
+        self,
+    )->None:
+        """
+        Finalise the sink. No more data will be written.
+        """
+        pass
+
+
+class CallbackPCMSink(PCMSink):
+    """
+    Pass each chunk of PCM frames to `callback`.
+    """
+
+    def __init__(
+        self,
+        callback:Callable[[bytes], Any],
+    )->None:
+        self.callback = callback
+
+    def write(
+        self,
+        data:bytes,
+    )->int:
+        self.callback(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+
+class BytesPCMSink(PCMSink):
+    """
+    Collect all PCM frames in memory.
+    """
+
+    def __init__(
+        self,
+    )->None:
+        self.buffer = io.BytesIO()
+
+    def write(
+        self,
+        data:bytes,
+    )->int:
+        self.bytes_written += len(data)
+        return self.buffer.write(data)
+
+    def getvalue(
+        self,
+    )->bytes:
+        """
+        All PCM frames collected so far, without any header.
+        """
+        return self.buffer.getvalue()
+
+
+class WavePCMSink(PCMSink):
+    """
+    Write PCM frames into a WAV file, either a path or a binary IO.
+
+    Can be opened again in the same format while still open, so that several streams can be written into one file.
+    """
+
+    def __init__(
+        self,
+        file:Union[
+            str,
+            BinaryIO,
+        ],
+    )->None:
+        self.file = file
+        self.wHnd = None
+
+    def open(
+        self,
+        channels:int,
+        sample_width:int,
+        sample_rate:int,
+    )->None:
+        if (self.wHnd is not None):
+            if ((channels, sample_width, sample_rate) != (self.channels, self.sample_width, self.sample_rate)):
+                raise WavFormatError(
+                    f"{type(self).__name__} is already open as (channels, sample_width, sample_rate)={(self.channels, self.sample_width, self.sample_rate)}; cannot write {(channels, sample_width, sample_rate)} into the same file."
+                )
+
+            return
+
+        super().open(
+            channels = channels,
+            sample_width = sample_width,
+            sample_rate = sample_rate,
+        )
+
+        self.wHnd = wave.open(self.file, "wb")
+        self.wHnd.setnchannels(channels)
+        self.wHnd.setsampwidth(sample_width)
+        self.wHnd.setframerate(sample_rate)
+
+    def write(
+        self,
+        data:bytes,
+    )->int:
+        if (self.wHnd is None):
+            raise StreamIOError(f"{type(self).__name__} has to be opened before writing.")
+
+        self.wHnd.writeframesraw(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def close(
+        self,
+    )->None:
+        if (self.wHnd is not None):
+            # Patches the header with the final size
+            self.wHnd.close()
+            self.wHnd = None
+
+
+class PCMSource():
+    """
+    Pull frames out of WAV data on demand, tracking completion through a StreamStatus.
+
+    This is the consumer side of one playback - whoever renders the output, e.g. a PersistentOutput,
+    calls .read() for as many frames as it needs. .read() never blocks; it returns fewer frames if the producer is behind.
+    """
+
+    def __init__(
+        self,
+        io:Union[
+            BinaryIO,
+            str,
+        ],
+        bytes_total:Union[
+            int,
+            "base_io.StreamIO",
+            None,
+        ] = None,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+    )->None:
+        """
+        Raises WavFormatError if `io` has no valid WAV header.
+
+        `gain` is applied by whoever renders the source, e.g. a Mixer.
+        """
+        try:
+            self.wHnd = wave.open(io, "rb")
+        except (wave.Error, EOFError) as e:
+            raise WavFormatError(f"Cannot read WAV data from {repr(io)}: {str(e)}")
+
+        if (bytes_total is None):
+            if (isinstance(io, base_io.StreamIO)):
+                # StreamStatus supports having a StreamIO as bytes_total
+                bytes_total = io
+            else:
+                # Static file; the header is final
+                bytes_total = self.wHnd.getnframes() * self.frame_size
+
+        # Bytes of header before the data, to tell how much data a completed StreamIO holds
+        try:
+            self.data_offset = io.tell() if (isinstance(io, base_io.StreamIO)) else None
+        except (OSError, AttributeError) as e:
+            self.data_offset = None
+
+        self.io = io
+        self.gain = gain
+        self.stream_status = StreamStatus(
+            io = io,
+            bytes_total = bytes_total,
+            timeout = timeout,
+        )
+        self.done = threading.Event()
+        self.started = False
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(io={repr(self.io)}, played={self.stream_status.bytes_played:,}, finished={self.finished})"
+
+    @property
+    def channels(
+        self,
+    )->int:
+        return self.wHnd.getnchannels()
+
+    @property
+    def sample_width(
+        self,
+    )->int:
+        return self.wHnd.getsampwidth()
+
+    @property
+    def sample_rate(
+        self,
+    )->int:
+        return self.wHnd.getframerate()
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * self.sample_width
+
+    @property
+    def finished(
+        self,
+    )->bool:
+        return self.done.is_set()
+
+    @property
+    def frames_remaining(
+        self,
+    )->Union[
+        int,
+        None,
+    ]:
+        """
+        Frames left to be read, if known; for a StreamIO, only once its producer had finished.
+        """
+        if (isinstance(self.io, base_io.StreamIO)):
+            if (self.data_offset is None or not self.io.complete):
+                return None
+
+            # Some StreamIOs count their header in .bytes_total and some do not; everything written includes it
+            _bytes_total = self.io.bytes_written - self.data_offset
+        else:
+            _bytes_total = self.stream_status.bytes_total
+
+            if (not isinstance(_bytes_total, int)):
+                return None
+
+        return max(0, _bytes_total - self.stream_status.bytes_played) // self.frame_size
+
+    def read(
+        self,
+        frame_count:int,
+    )->bytes:
+        """
+        Read up to `frame_count` frames; returns b"" once finished.
+        """
+        if (self.finished):
+            return b""
+
+        if (not self.started):
+            # A queued source may have waited longer than `timeout` for its turn; the timeout counts from the first read
+            self.started = True
+            self.stream_status.update_last_data()
+
+        if (not self.stream_status):
+            self.finish()
+            return b""
+
+        _data = self.wHnd.readframes(frame_count)
+        self.stream_status.played(len(_data))
+
+        if (not self.stream_status or self.frames_remaining == 0):
+            # Completed on this read; the data still needs to be played
+            self.finish()
+
+        return _data
+
+    def finish(
+        self,
+    )->None:
+        self.stream_status.set(False)
+        self.done.set()
+
+    stop = finish
+
+    def wait(
+        self,
+        timeout:float = None,
+    )->bool:
+        """
+        Block until this source had finished playing. Returns False if timed out.
+        """
+        return self.done.wait(timeout)
+
+
+def drain(
+    io:Union[
+        BinaryIO,
+        str,
+    ],
+    sink:PCMSink,
+    chunk_size:int = DEFAULT_CHUNK_SIZE,
+    bytes_total:Union[
+        int,
+        "base_io.StreamIO",
+        None,
+    ] = None,
+    timeout:float = DEFAULT_TIMEOUT,
+    interval:float = DEFAULT_POLL_INTERVAL,
+    stream_status:StreamStatus = None,
+)->Union[
+    int,
+    Exception,
+]:
+    """
+    Read WAV data from `io` and write the frames into `sink`, until the data is complete or times out.
+
+    This is the headless counterpart of `remote_audio.audio.start_wav_stream`:
+    it stops on the same conditions as an AudioStream, but blocks instead of returning immediately.
+    `sink` is opened but not closed.
+
+    Returns the number of bytes written to `sink`, or a WavFormatError if `io` has no valid header.
+    """
+
+    try:
+        _wHnd = wave.open(io, "rb")
+    except (wave.Error, EOFError) as e:
+        return WavFormatError(f"Cannot read WAV data from {repr(io)}: {str(e)}")
+
+    if (bytes_total is None and isinstance(io, base_io.StreamIO)):
+        # StreamStatus supports having a StreamIO as bytes_total
+        bytes_total = io
+
+    if (stream_status is None):
+        stream_status = StreamStatus(
+            io = io,
+            bytes_total = bytes_total,
+            timeout = timeout,
+        )
+
+    sink.open(
+        channels = _wHnd.getnchannels(),
+        sample_width = _wHnd.getsampwidth(),
+        sample_rate = _wHnd.getframerate(),
+    )
+
+    _bytes_written = 0
+    while (stream_status):
+        _data = _wHnd.readframes(chunk_size)
+
+        if (_data):
+            stream_status.played(len(_data))
+            _bytes_written += sink.write(_data)
+        elif (isinstance(io, base_io.StreamIO)):
+            # Producer is still going; wait for more
+            timer.sleep(interval)
+        else:
+            # Static source had ended
+            break
+
+    return _bytes_written
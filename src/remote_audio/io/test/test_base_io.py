@@ -0,0 +1,83 @@
+import threading
+
+import quicktest as unittest
+
+from remote_audio.io.base_io import StreamIO, \
+                                    StreamIOReader
+
+
+class TestStreamIOReader(unittest.TestCase):
+    def test_independent_readers(self):
+        """
+        Test each reader gets all of the data, at its own pace.
+        """
+        _io = StreamIO()
+        _reader1 = _io.reader()
+        _reader2 = _io.reader()
+
+        self.assertIsInstance(_reader1, StreamIOReader)
+
+        _io.write(b"0123456789")
+
+        self.assertEqual(_reader1.read(4), b"0123")
+        self.assertEqual(_reader2.read(), b"0123456789")
+        self.assertEqual(_reader1.read(), b"456789")
+
+        _io.write(b"abc")
+        self.assertEqual(_reader1.read(), b"abc")
+        self.assertEqual(_reader2.read(), b"abc")
+
+        self.assertEqual(_reader1.bytes_written, 13)
+
+    def test_discard(self):
+        """
+        Test data is only freed once the slowest reader had passed it.
+        """
+        _io = StreamIO()
+        _io.discard_threshold = 8
+        _reader1 = _io.reader()
+        _reader2 = _io.reader()
+
+        _io.write(b"0123456789"*4)
+
+        _reader1.read(30)
+        self.assertEqual(_io.bytes_discarded, 0)
+
+        _reader2.read(20)
+        self.assertEqual(_io.bytes_discarded, 20)
+        self.assertEqual(len(_io.getvalue()), 20)
+
+        # Discarded data is gone, but the readers carry on unaffected
+        self.assertEqual(_reader2.read(), b"0123456789"*2)
+        self.assertEqual(_reader1.read(), b"0123456789")
+
+        # A closed reader no longer holds data
+        _reader2.close()
+        self.assertListEqual(_io.readers, [_reader1])
+
+    def test_concurrent_write(self):
+        """
+        Test readers receive the exact data while another thread is writing.
+        """
+        _chunks = [ bytes([_i % 256])*100 for _i in range(500) ]
+
+        _io = StreamIO()
+        _io.discard_threshold = 1000
+        _readers = [ _io.reader() for _ in range(3) ]
+
+        _writer = threading.Thread(target=lambda: [ _io.write(_chunk) for _chunk in _chunks ])
+        _writer.start()
+
+        _received = [ b"" for _ in _readers ]
+        while (_writer.is_alive() or any(len(_data) < 50000 for _data in _received)):
+            for _i, _reader in enumerate(_readers):
+                _received[_i] += _reader.read(777)
+
+        _writer.join()
+
+        for _data in _received:
+            self.assertEqual(_data, b"".join(_chunks))
+
+
+if (__name__=="__main__"):
+    unittest.main()
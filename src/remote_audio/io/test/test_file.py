@@ -0,0 +1,89 @@
+import io
+import os
+import tempfile
+import wave
+
+import quicktest as unittest
+
+from remote_audio.exceptions import InvalidInputParameters
+from remote_audio.io.base_io import WaveStreamIO
+import remote_audio.io.file as file
+
+
+# 2 seconds of 16-bit stereo at 8kHz, where each frame is distinguishable by its position
+PCM_DATA = b"".join(_frame.to_bytes(4, "little") for _frame in range(16000))
+
+
+class TestWavSeek(unittest.TestCase):
+    def test_parse_duration(self):
+        """
+        Test FFmpeg style time durations are converted to seconds.
+        """
+        self.assertEqual(file.parse_duration(12), 12.0)
+        self.assertEqual(file.parse_duration("12.5"), 12.5)
+        self.assertEqual(file.parse_duration("1500ms"), 1.5)
+        self.assertEqual(file.parse_duration("01:02.5"), 62.5)
+        self.assertEqual(file.parse_duration("01:00:02"), 3602.0)
+
+        with self.assertRaises(file.InvalidInputParameters):
+            file.parse_duration("twelve")
+
+    def test_byte_range(self):
+        """
+        Test seek offsets land on frame boundaries and stay within the data chunk.
+        """
+        _data = file.create_wav(PCM_DATA, sample_rate=8000).getvalue()
+        _header = file.WavHeader.from_data(_data)
+
+        self.assertEqual(_header.header_size, 44)
+        self.assertTupleEqual(_header.get_byte_range(), (44, len(_data)))
+        self.assertTupleEqual(_header.get_byte_range(0.5, 1.5), (44+4*4000, 44+4*12000))
+
+        # Not aligned to a frame in seconds - must still be aligned in bytes
+        _start, _end = _header.get_byte_range(1/3)
+        self.assertEqual((_start-44) % _header.BlockAlign, 0)
+
+        # Beyond the end of file
+        self.assertTupleEqual(_header.get_byte_range(10, 20), (len(_data), len(_data)))
+
+    def test_resize(self):
+        """
+        Test a synthesized header for part of a file is readable by wave.
+        """
+        _data = file.create_wav(PCM_DATA, sample_rate=8000).getvalue()
+        _header = file.WavHeader.from_data(_data)
+
+        _start, _end = _header.get_byte_range(0.5, 1.0)
+        _resized = _header.resize(_end-_start)
+
+        self.assertTrue(_resized.is_valid)
+
+        with wave.open(io.BytesIO(_resized.construct() + _data[_start:_end]), "rb") as _wHnd:
+            self.assertEqual(_wHnd.getnframes(), 4000)
+            self.assertEqual(_wHnd.getframerate(), 8000)
+            self.assertEqual(_wHnd.readframes(1), _data[_start:_start+4])
+
+    def test_from_file_range(self):
+        """
+        Test an unparsable or empty range returns an error instead of raising or playing nothing.
+        """
+        with tempfile.TemporaryDirectory() as _directory:
+            _path = os.path.join(_directory, "test.wav")
+            with open(_path, "wb") as _file:
+                _file.write(file.create_wav(PCM_DATA, sample_rate=8000).getvalue())
+
+            for _start_at, _end_at in (("bogus", None), (1.5, 0.5), (10, None)):
+                self.assertIsInstance(WaveStreamIO.from_file(_path, start_at=_start_at, end_at=_end_at), InvalidInputParameters)
+
+            _io = WaveStreamIO.from_file(_path, start_at=0.5, end_at=1.0)
+            _io.await_complete()
+
+            # The data of the range only, as StreamStatus counts it
+            self.assertEqual(_io.bytes_total, 4000*4)
+
+            with wave.open(_io, "rb") as _wHnd:
+                self.assertEqual(_wHnd.getnframes(), 4000)
+
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,74 @@
+import io
+import os
+import subprocess
+import sys
+import wave
+
+import quicktest as unittest
+
+import remote_audio
+from remote_audio.io.base_io import WaveStreamIO
+from remote_audio.io.file import create_wav
+import remote_audio.io.pcm as pcm
+
+
+# 8000 frames of 16-bit stereo
+PCM_DATA = bytes(_i % 256 for _i in range(8000*4))
+
+
+class TestPCM(unittest.TestCase):
+    def test_drain(self):
+        """
+        Test all frames of a StreamIO end up in the sink, with the right format.
+        """
+        _data = create_wav(PCM_DATA, sample_rate=8000).getvalue()
+        _io = WaveStreamIO.from_bytes(_data)
+
+        _sink = pcm.BytesPCMSink()
+        self.assertEqual(pcm.drain(_io, _sink, timeout=1), 32000)
+
+        self.assertEqual(_sink.sample_rate, 8000)
+        self.assertEqual(_sink.frame_size, 4)
+        self.assertEqual(_sink.getvalue(), _data[44:])
+
+    def test_wave_sink(self):
+        """
+        Test a WavePCMSink produces a readable WAV file.
+        """
+        _data = create_wav(PCM_DATA[:1000*4], sample_rate=22050).getvalue()
+        _output = io.BytesIO()
+
+        with pcm.WavePCMSink(_output) as _sink:
+            pcm.drain(WaveStreamIO.from_bytes(_data), _sink, chunk_size=300, timeout=1)
+
+        _output.seek(0)
+        with wave.open(_output, "rb") as _wHnd:
+            self.assertEqual(_wHnd.getframerate(), 22050)
+            self.assertEqual(_wHnd.getnframes(), 1000)
+
+    def test_headless_import(self):
+        """
+        Test the IO pipeline can be imported without loading pyaudio.
+        """
+        _process = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, remote_audio.io, remote_audio.classes; print('pyaudio' in sys.modules)",
+            ],
+            env = {
+                **os.environ,
+                "PYTHONPATH": os.pathsep.join(filter(None, (
+                    os.path.dirname(os.path.dirname(remote_audio.__file__)),
+                    os.environ.get("PYTHONPATH"),
+                ))),
+            },
+            capture_output = True,
+            text = True,
+        )
+
+        self.assertEqual(_process.stdout.strip(), "False", _process.stderr)
+
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+
+import quicktest as unittest
+
+from remote_audio.exceptions import StreamIOError
+from remote_audio.io.writer import BatchedWriter
+
+
+class BlockingSink():
+    """
+    A sink that holds on to every call until released, as a full pipe would.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, b):
+        self.entered.set()
+        self.release.wait(5)
+        self.calls.append(b)
+
+
+class TestBatchedWriter(unittest.TestCase):
+    def test_coalesce(self):
+        """
+        Test writes made while the sink is busy are delivered in one call, in order.
+        """
+        _sink = BlockingSink()
+
+        with BatchedWriter(_sink) as _writer:
+            _writer.write(b"first")
+            self.assertTrue(_sink.entered.wait(5))
+
+            for _i in range(10):
+                self.assertEqual(_writer.write(bytes([ord("0") + _i])), 1)
+
+            self.assertEqual(_writer.bytes_pending, 10)
+            _sink.release.set()
+
+            self.assertTrue(_writer.flush(5))
+
+        self.assertListEqual(_sink.calls, [b"first", b"0123456789"])
+        self.assertEqual(_writer.writes, 2)
+        self.assertEqual(_writer.bytes_written, 15)
+
+    def test_bounded(self):
+        """
+        Test .write() only blocks once `max_buffered` bytes are pending.
+        """
+        _sink = BlockingSink()
+        _writer = BatchedWriter(_sink, max_buffered=4)
+
+        _writer.write(b"a")
+        self.assertTrue(_sink.entered.wait(5))
+
+        # Fills the buffer without blocking
+        _writer.write(b"bcde")
+
+        _blocked = threading.Thread(target=_writer.write, args=(b"f", ), daemon=True)
+        _blocked.start()
+        _blocked.join(0.2)
+        self.assertTrue(_blocked.is_alive())
+
+        _sink.release.set()
+        _blocked.join(5)
+        self.assertFalse(_blocked.is_alive())
+
+        _writer.close(5)
+        self.assertEqual(b"".join(_sink.calls), b"abcdef")
+
+    def test_close(self):
+        """
+        Test close() delivers everything pending before calling `on_close`, and refuses further writes.
+        """
+        _sink = BlockingSink()
+        _closed = []
+        _writer = BatchedWriter(_sink, on_close=lambda: _closed.append(b"".join(_sink.calls)))
+
+        _writer.write(b"0123")
+        self.assertTrue(_sink.entered.wait(5))
+        _writer.write(b"4567")
+
+        _sink.release.set()
+        _writer.close(5)
+
+        self.assertListEqual(_closed, [b"01234567"])
+        self.assertIsNone(_writer.exception)
+
+        with self.assertRaises(StreamIOError):
+            _writer.write(b"89")
+
+    def test_broken_pipe(self):
+        """
+        Test a sink going away stops the writer, with .write() raising instead of blocking.
+        """
+        def _sink(b):
+            raise BrokenPipeError(32, "Broken pipe")
+
+        _closed = threading.Event()
+        _writer = BatchedWriter(_sink, max_buffered=4, on_close=_closed.set)
+
+        _writer.write(b"0123")
+        self.assertTrue(_closed.wait(5))
+
+        self.assertIsInstance(_writer.exception, BrokenPipeError)
+        self.assertTrue(_writer.closed)
+        self.assertEqual(_writer.bytes_pending, 0)
+        self.assertEqual(_writer.bytes_written, 0)
+
+        with self.assertRaises(StreamIOError):
+            _writer.write(b"4567")
+
+        # Already stopped; returns straight away
+        _writer.close(5)
+
+
+if (__name__=="__main__"):
+    unittest.main()
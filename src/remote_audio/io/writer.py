@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import threading
+from typing import Any, Callable
+
+from remote_audio.exceptions import StreamIOError
+
+"""
+Asynchronous writers, for handing off data to slow consumers such as an FFmpeg stdin pipe
+without blocking the producer.
+"""
+
+DEFAULT_MAX_BUFFERED = 2**24
+
+
+class BatchedWriter():
+    """
+    Hand off .write() calls to a dedicated thread, which pushes the data into `sink`.
+
+    While `sink` is busy, further writes are coalesced into one buffer,
+    so that many small writes become a single large write once `sink` is free.
+
+    The buffer is bounded by `max_buffered`; .write() only blocks if that much data is already pending.
+    """
+
+    def __init__(
+        self,
+        sink:Callable[[bytes], Any],
+        max_buffered:int = DEFAULT_MAX_BUFFERED,
+        on_close:Callable[[], Any] = None,
+        name:str = None,
+    )->None:
+        self.sink = sink
+        self.max_buffered = max_buffered
+        self.on_close = on_close if (callable(on_close)) else None
+
+        self.bytes_written = 0      # Bytes actually delivered to sink
+        self.writes = 0             # Number of calls made to sink
+        self.exception = None
+
+        self.closed = False
+        self._buffer = bytearray()
+        self._busy = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(
+            target = self._run,
+            name = name or type(self).__name__,
+            daemon = True,
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def bytes_pending(
+        self,
+    )->int:
+        """
+        Bytes accepted by .write() but not yet delivered to sink.
+        """
+        return len(self._buffer)
+
+    def write(
+        self,
+        b:bytes,
+    )->int:
+        """
+        Queue bytes to be written to sink. Returns immediately unless the buffer is full.
+        """
+        if (not b):
+            return 0
+
+        with self._condition:
+            while (len(self._buffer) >= self.max_buffered and not self.closed):
+                self._condition.wait()
+
+            if (self.closed):
+                raise StreamIOError(
+                    f"{type(self).__name__} is closed; {len(b):,} bytes cannot be written." + \
+                    (f" Sink failed with {repr(self.exception)}." if self.exception else "")
+                )
+
+            self._buffer += b
+            self._condition.notify_all()
+
+        return len(b)
+
+    def flush(
+        self,
+        timeout:float = None,
+    )->bool:
+        """
+        Block until all pending bytes are delivered to sink.
+        Returns False if timed out.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (self._buffer or self._busy) or not self._thread.is_alive(),
+                timeout = timeout,
+            )
+
+    def close(
+        self,
+        timeout:float = None,
+    )->None:
+        """
+        Deliver all pending bytes, then stop the writer thread and call `on_close`.
+        """
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+        if (self._thread is not threading.current_thread()):
+            self._thread.join(timeout)
+
+    def _run(
+        self,
+    )->None:
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._buffer or self.closed)
+
+                    if (not self._buffer):
+                        # Closed, and nothing left to write
+                        break
+
+                    # Take everything that had accumulated so far in one go
+                    _data = bytes(self._buffer)
+                    self._buffer.clear()
+                    self._busy = True
+                    self._condition.notify_all()
+
+                try:
+                    self.sink(_data)
+                    self.bytes_written += len(_data)
+                    self.writes += 1
+                finally:
+                    with self._condition:
+                        self._busy = False
+                        self._condition.notify_all()
+
+        except (OSError, ValueError) as e:
+            # Typically BrokenPipeError - the consumer had gone away
+            self.exception = e
+
+            with self._condition:
+                self.closed = True
+                self._buffer.clear()
+                self._condition.notify_all()
+
+        finally:
+            if (self.on_close):
+                try:
+                    self.on_close()
+                except (OSError, ValueError) as e:
+                    pass
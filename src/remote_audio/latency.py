@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+from enum import Enum
+import math
+from typing import Any, Dict, Union
+
+from remote_audio.exceptions import InvalidInputParameters
+
+"""
+Latency profiles, for sizing PortAudio buffers to the device and the source rather than using a fixed chunk size.
+
+A profile picks a target output latency from what the device reports -
+`defaultLowOutputLatency` and `defaultHighOutputLatency` in `AudioDevice.properties` -
+and converts it into `frames_per_buffer`. It also decides how much of the source to buffer before starting,
+from the jitter measured on the StreamIO being played.
+
+PyAudio does not expose PortAudio's `suggestedLatency`; it always asks for the device's low latency.
+The buffer size is the only latency control available through it, so that is what the profiles set.
+"""
+
+MIN_FRAMES_PER_BUFFER = 64
+MAX_FRAMES_PER_BUFFER = 16384
+
+# Used if the device does not report its latencies
+FALLBACK_LOW_LATENCY = 0.01
+FALLBACK_HIGH_LATENCY = 0.1
+
+
+class LatencyProfile(Enum):
+    LOW = "low"
+    BALANCED = "balanced"
+    ROBUST = "robust"
+
+
+@dataclass(frozen=True)
+class LatencyProfileSettings():
+    """
+    - `latency_weight`: where the target latency sits between the device's low (0) and high (1) latency
+    - `latency_multiplier`: applied to the target latency after weighting
+    - `jitter_multiplier`: prebuffer this many times the measured source jitter, on top of one write interval
+    - `min_prebuffer` / `default_jitter`: in seconds; default_jitter is assumed if none had been measured yet
+    """
+    latency_weight:float
+    latency_multiplier:float
+    jitter_multiplier:float
+    min_prebuffer:float
+    default_jitter:float
+
+
+PROFILE_SETTINGS = {
+    LatencyProfile.LOW:         LatencyProfileSettings(0, 1, 2, 0, 0),
+    LatencyProfile.BALANCED:    LatencyProfileSettings(0.5, 1, 4, 0.05, 0.02),
+    LatencyProfile.ROBUST:      LatencyProfileSettings(1, 2, 8, 0.25, 0.1),
+}
+
+
+@dataclass(frozen=True)
+class BufferSettings():
+    """
+    Buffer sizes derived from a LatencyProfile.
+    """
+    profile:LatencyProfile
+    frames_per_buffer:int
+    latency:float           # Output latency in seconds implied by frames_per_buffer
+    prebuffer_bytes:int     # Bytes of the source to have before starting playback
+
+    @property
+    def chunk_size(
+        self,
+    )->int:
+        return self.frames_per_buffer
+
+
+def get_profile(
+    profile:Union[
+        LatencyProfile,
+        str,
+    ],
+)->Union[
+    LatencyProfile,
+    InvalidInputParameters,
+]:
+    if (isinstance(profile, LatencyProfile)):
+        return profile
+
+    try:
+        return LatencyProfile(str(profile).lower().replace("-latency", "").replace("_latency", ""))
+    except ValueError as e:
+        return InvalidInputParameters(f"Unknown latency profile {repr(profile)}; expected one of {[ _profile.value for _profile in LatencyProfile ]}.")
+
+def get_buffer_settings(
+    profile:Union[
+        LatencyProfile,
+        str,
+    ],
+    device_info:Dict[str, Any],
+    sample_rate:int,
+    frame_size:int,
+    write_interval:float = None,
+    write_jitter:float = None,
+)->Union[
+    BufferSettings,
+    InvalidInputParameters,
+]:
+    """
+    Derive the buffer sizes for playing a source of `sample_rate` and `frame_size` on a device.
+
+    `write_interval` and `write_jitter` are what the source StreamIO had measured so far, if anything.
+    """
+
+    profile = get_profile(profile)
+
+    if (isinstance(profile, Exception)):
+        return profile
+
+    _settings = PROFILE_SETTINGS[profile]
+
+    _low = float((device_info or {}).get("defaultLowOutputLatency") or FALLBACK_LOW_LATENCY)
+    _high = max(_low, float((device_info or {}).get("defaultHighOutputLatency") or FALLBACK_HIGH_LATENCY))
+
+    _target = (_low + (_high - _low) * _settings.latency_weight) * _settings.latency_multiplier
+
+    # Power of two buffers are the most widely supported
+    _frames = 2 ** max(0, round(math.log2(max(1, _target * sample_rate))))
+    _frames = min(max(_frames, MIN_FRAMES_PER_BUFFER), MAX_FRAMES_PER_BUFFER)
+
+    if (write_jitter is None):
+        write_jitter = _settings.default_jitter
+
+    _prebuffer = max(
+        _settings.min_prebuffer,
+        (write_interval or 0) + write_jitter * _settings.jitter_multiplier,
+    ) if (_settings.min_prebuffer or write_jitter) else 0
+
+    return BufferSettings(
+        profile = profile,
+        frames_per_buffer = _frames,
+        latency = _frames / sample_rate,
+        prebuffer_bytes = int(_prebuffer * sample_rate) * frame_size,
+    )
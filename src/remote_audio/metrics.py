@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+import bisect
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Tuple
+
+"""
+Instrumentation of the playback path.
+
+Every stream has a StreamMetrics in its StreamStatus, which counts the status flags PortAudio passes to the callback,
+times each callback against the period of the buffer it fills, and tracks the output latency reported in `time_info`.
+
+A glitch with no late callbacks around it came from the device or the host API, not from our code.
+"""
+
+# Same values as in pyaudio, without having to import pyaudio
+PA_INPUT_UNDERFLOW = 1
+PA_INPUT_OVERFLOW = 2
+PA_OUTPUT_UNDERFLOW = 4
+PA_OUTPUT_OVERFLOW = 8
+PA_PRIMING_OUTPUT = 16
+
+# Upper edges of the histogram buckets of callback time, as a fraction of the buffer period;
+# a callback taking more than the whole period is late.
+DEFAULT_LOAD_EDGES = (0.1, 0.25, 0.5, 0.75, 1.0)
+LATENCY_SMOOTHING = 16          # Each new latency moves the mean by 1/16, as the jitter of StreamIO
+
+
+@dataclass(frozen=True)
+class StreamStats():
+    """
+    Snapshot of a StreamMetrics.
+
+    `load_histogram` counts callbacks by the fraction of the buffer period they took, bucketed by `load_edges`;
+    the last bucket is callbacks that took longer than the whole period.
+    Latencies are in seconds; None if the host API does not report them.
+    """
+    callbacks:int
+    input_underflows:int
+    input_overflows:int
+    output_underflows:int
+    output_overflows:int
+    priming_outputs:int
+    late_callbacks:int
+    load_edges:Tuple[float, ...]
+    load_histogram:Tuple[int, ...]
+    callback_time_mean:float
+    callback_time_max:float
+    max_load:float
+    output_latency:float
+    output_latency_mean:float
+    output_latency_min:float
+    output_latency_max:float
+
+    def __str__(
+        self,
+    )->str:
+        """
+        One line summary, to be logged.
+        """
+        _latency = f"{self.output_latency_mean*1000:.1f}ms" if (self.output_latency_mean is not None) else "n/a"
+
+        return (
+            f"callbacks={self.callbacks} "
+            f"underflows={self.output_underflows} overflows={self.output_overflows} "
+            f"late={self.late_callbacks} "
+            f"callback_mean={self.callback_time_mean*1000:.3f}ms callback_max={self.callback_time_max*1000:.3f}ms "
+            f"max_load={self.max_load:.0%} "
+            f"output_latency={_latency}"
+        )
+
+    @property
+    def glitches_from_callback(
+        self,
+    )->bool:
+        """
+        Whether underflows could be explained by late callbacks.
+        """
+        return bool(self.output_underflows and self.late_callbacks)
+
+    def as_dict(
+        self,
+    )->Dict[str, Any]:
+        """
+        All the figures, e.g. for structured logging or JSON.
+        """
+        return asdict(self)
+
+
+class StreamMetrics():
+    """
+    Counters and timings of one stream, updated by the thread feeding it.
+
+    `sample_rate` is needed to relate callback times to buffer periods; without it, no load is recorded.
+    """
+
+    def __init__(
+        self,
+        sample_rate:int = None,
+        load_edges:Iterable[float] = DEFAULT_LOAD_EDGES,
+    )->None:
+        self.sample_rate = sample_rate
+        self.load_edges = tuple(load_edges)
+
+        self.reset()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}({str(self.stats())})"
+
+    def reset(
+        self,
+    )->None:
+        self.callbacks = 0
+
+        self.input_underflows = 0
+        self.input_overflows = 0
+        self.output_underflows = 0
+        self.output_overflows = 0
+        self.priming_outputs = 0
+
+        self.load_histogram = [0] * (len(self.load_edges) + 1)
+        self.callback_time_total = 0.0
+        self.callback_time_max = 0.0
+        self.max_load = 0.0
+
+        self.output_latency = None
+        self.output_latency_mean = None
+        self.output_latency_min = None
+        self.output_latency_max = None
+
+    @property
+    def late_callbacks(
+        self,
+    )->int:
+        return self.load_histogram[-1]
+
+    def record_flags(
+        self,
+        status_flags:int,
+    )->None:
+        """
+        Count the status flags PortAudio passed to a callback.
+        """
+        if (status_flags):
+            if (status_flags & PA_OUTPUT_UNDERFLOW):
+                self.output_underflows += 1
+            if (status_flags & PA_OUTPUT_OVERFLOW):
+                self.output_overflows += 1
+            if (status_flags & PA_INPUT_UNDERFLOW):
+                self.input_underflows += 1
+            if (status_flags & PA_INPUT_OVERFLOW):
+                self.input_overflows += 1
+            if (status_flags & PA_PRIMING_OUTPUT):
+                self.priming_outputs += 1
+
+    def record_underflow(
+        self,
+    )->None:
+        """
+        Count an output underflow detected without a callback, e.g. by the blocking engine.
+        """
+        self.output_underflows += 1
+
+    def record_time_info(
+        self,
+        time_info:Dict[str, float],
+    )->None:
+        """
+        Track the output latency - from now until the first frame of this buffer is heard - reported by PortAudio.
+        Host APIs that do not report the times pass zeros, which are ignored.
+        """
+        _current_time = time_info.get("current_time", 0)
+        _dac_time = time_info.get("output_buffer_dac_time", 0)
+
+        if (not (_current_time and _dac_time) or _dac_time < _current_time):
+            return
+
+        _latency = _dac_time - _current_time
+        self.output_latency = _latency
+
+        if (self.output_latency_mean is None):
+            self.output_latency_mean = _latency
+            self.output_latency_min = _latency
+            self.output_latency_max = _latency
+        else:
+            self.output_latency_mean += (_latency - self.output_latency_mean) / LATENCY_SMOOTHING
+            self.output_latency_min = min(self.output_latency_min, _latency)
+            self.output_latency_max = max(self.output_latency_max, _latency)
+
+    def record_callback(
+        self,
+        duration:float,
+        frame_count:int,
+    )->None:
+        """
+        Record a callback that took `duration` seconds to fill a buffer of `frame_count` frames.
+        """
+        self.callbacks += 1
+        self.callback_time_total += duration
+
+        if (duration > self.callback_time_max):
+            self.callback_time_max = duration
+
+        if (self.sample_rate and frame_count):
+            _load = duration * self.sample_rate / frame_count
+
+            if (_load > self.max_load):
+                self.max_load = _load
+
+            self.load_histogram[bisect.bisect_left(self.load_edges, _load)] += 1
+
+    def stats(
+        self,
+    )->StreamStats:
+        return StreamStats(
+            callbacks = self.callbacks,
+            input_underflows = self.input_underflows,
+            input_overflows = self.input_overflows,
+            output_underflows = self.output_underflows,
+            output_overflows = self.output_overflows,
+            priming_outputs = self.priming_outputs,
+            late_callbacks = self.late_callbacks,
+            load_edges = self.load_edges,
+            load_histogram = tuple(self.load_histogram),
+            callback_time_mean = self.callback_time_total / self.callbacks if (self.callbacks) else 0.0,
+            callback_time_max = self.callback_time_max,
+            max_load = self.max_load,
+            output_latency = self.output_latency,
+            output_latency_mean = self.output_latency_mean,
+            output_latency_min = self.output_latency_min,
+            output_latency_max = self.output_latency_max,
+        )
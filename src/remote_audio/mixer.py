@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+
+from enum import Enum
+import threading
+from typing import Any, Iterable, List, Union
+
+import numpy as np
+
+from remote_audio.exceptions import InvalidInputParameters
+
+"""
+Software mixing of any number of PCM sources into one output.
+
+Rather than opening one PortAudio stream per playback - which many ALSA devices refuse, and which costs
+one callback each - all concurrent sources are summed into a single buffer with NumPy.
+"""
+
+# Integer PCM only; 8-bit WAV is unsigned and 24-bit has no NumPy dtype.
+SAMPLE_DTYPES = {
+    2: np.int16,
+    4: np.int32,
+}
+
+# Accumulate 16-bit in float32; 32-bit needs float64 to keep its precision.
+ACCUMULATOR_DTYPES = {
+    2: np.float32,
+    4: np.float64,
+}
+
+
+class ClippingMode(Enum):
+    HARD = "hard"       # Clamp to full scale
+    SOFT = "soft"       # tanh saturation above SOFT_CLIP_THRESHOLD of full scale
+    NONE = "none"       # Wrap around, as integer addition would - only if the sources are known not to overflow
+
+SOFT_CLIP_THRESHOLD = 0.75
+
+
+def get_dtype(
+    sample_width:int,
+)->Union[
+    type,
+    InvalidInputParameters,
+]:
+    """
+    NumPy dtype of samples `sample_width` bytes wide.
+    """
+    _dtype = SAMPLE_DTYPES.get(sample_width, None)
+
+    if (_dtype is None):
+        return InvalidInputParameters(f"Mixing is only supported for sample widths of {list(SAMPLE_DTYPES)} bytes, not {sample_width}.")
+
+    return _dtype
+
+def clip(
+    samples:np.ndarray,
+    dtype:type,
+    mode:ClippingMode = ClippingMode.HARD,
+)->np.ndarray:
+    """
+    Bring floating point `samples` back into the range of `dtype`, in place where possible.
+    """
+    _info = np.iinfo(dtype)
+
+    if (mode is ClippingMode.SOFT):
+        _threshold = _info.max * SOFT_CLIP_THRESHOLD
+        _headroom = _info.max - _threshold
+
+        _over = np.abs(samples) > _threshold
+        if (_over.any()):
+            _excess = np.abs(samples[_over]) - _threshold
+            samples[_over] = np.sign(samples[_over]) * (_threshold + _headroom * np.tanh(_excess / _headroom))
+
+    if (mode is ClippingMode.NONE):
+        # Casting out of range floats to integers is undefined; wrap them into range here instead.
+        # Rounded first, so that the rounding afterwards cannot push them out of range again.
+        np.rint(samples, out=samples)
+        np.subtract(samples, _info.min, out=samples)
+        np.mod(samples, float(_info.max) - _info.min + 1, out=samples)
+        np.add(samples, _info.min, out=samples)
+    else:
+        # Rather than np.clip, which allocates on every call
+        np.minimum(samples, _info.max, out=samples)
+        np.maximum(samples, _info.min, out=samples)
+
+    return samples
+
+def apply_gain(
+    data:bytes,
+    gain:float,
+    sample_width:int,
+    mode:ClippingMode = ClippingMode.HARD,
+)->bytes:
+    """
+    Scale PCM data by `gain`.
+    """
+    if (gain == 1 or not data):
+        return data
+
+    _dtype = get_dtype(sample_width)
+
+    if (isinstance(_dtype, Exception)):
+        raise _dtype
+
+    _samples = np.frombuffer(data, dtype=_dtype) * ACCUMULATOR_DTYPES[sample_width](gain)
+
+    return np.rint(clip(_samples, _dtype, mode)).astype(_dtype).tobytes()
+
+def crossfade(
+    outgoing:bytes,
+    incoming:bytes,
+    position:int,
+    length:int,
+    channels:int,
+    sample_width:int,
+    outgoing_gain:float = 1.0,
+    incoming_gain:float = 1.0,
+    mode:ClippingMode = ClippingMode.HARD,
+)->bytes:
+    """
+    Mix `outgoing` fading out with `incoming` fading in, as frames `position` onwards of an equal-power crossfade
+    `length` frames long. The result is as long as `outgoing`; `incoming` is padded with silence if shorter.
+
+    Only the overlap is computed here, in one go; the frames before and after it are left untouched by the caller.
+    """
+    _dtype = get_dtype(sample_width)
+
+    if (isinstance(_dtype, Exception)):
+        raise _dtype
+
+    _accumulator_dtype = ACCUMULATOR_DTYPES[sample_width]
+    _frame_size = channels * sample_width
+    _frames = len(outgoing) // _frame_size
+    _incoming_frames = min(len(incoming) // _frame_size, _frames)
+
+    # The gains are the cosine and sine of the same angle, so their powers always add up to 1;
+    # sampled at the middle of each frame, so that neither source is ever at exactly 0 or 1 within the overlap.
+    _angle = np.arange(position, position + _frames, dtype=_accumulator_dtype)
+    _angle += 0.5
+    _angle *= np.pi / 2 / length
+
+    _samples = np.frombuffer(outgoing, dtype=_dtype, count=_frames*channels).reshape(_frames, channels)
+    _mixed = _samples * (np.cos(_angle) * _accumulator_dtype(outgoing_gain))[:, np.newaxis]
+
+    if (_incoming_frames):
+        _samples = np.frombuffer(incoming, dtype=_dtype, count=_incoming_frames*channels).reshape(_incoming_frames, channels)
+        _mixed[:_incoming_frames] += _samples * (np.sin(_angle[:_incoming_frames]) * _accumulator_dtype(incoming_gain))[:, np.newaxis]
+
+    return np.rint(clip(_mixed, _dtype, mode)).astype(_dtype).tobytes()
+
+
+class MixerVoice():
+    """
+    One source being mixed, with its own gain.
+
+    `source` can be anything with .read(frame_count)->bytes and .finished, e.g. a PCMSource or a SourceQueue.
+    Unless `gain` is given, the voice follows `source.gain` if it has one, so that it can be adjusted while playing.
+    """
+
+    def __init__(
+        self,
+        source:Any,
+        gain:float = None,
+    )->None:
+        self.source = source
+        self._gain = gain
+
+    @property
+    def gain(
+        self,
+    )->float:
+        if (self._gain is not None):
+            return self._gain
+        else:
+            return getattr(self.source, "gain", 1.0)
+
+    @gain.setter
+    def gain(
+        self,
+        value:float,
+    )->None:
+        self._gain = value
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(source={repr(self.source)}, gain={self.gain})"
+
+    @property
+    def finished(
+        self,
+    )->bool:
+        return self.source.finished
+
+    def read(
+        self,
+        frame_count:int,
+    )->bytes:
+        return self.source.read(frame_count)
+
+    def stop(
+        self,
+    )->None:
+        if (hasattr(self.source, "stop")):
+            self.source.stop()
+
+
+class Mixer():
+    """
+    Sums any number of sources in the same format into one stream of frames.
+
+    Finished sources are dropped automatically. With a single source at unity gain,
+    its data is passed through without touching NumPy at all.
+
+    Mixing is done in working buffers that are only reallocated for a longer buffer than before;
+    .render() is therefore to be called from one thread at a time, e.g. the stream callback.
+    """
+
+    def __init__(
+        self,
+        channels:int,
+        sample_width:int,
+        sample_rate:int,
+        clipping:ClippingMode = ClippingMode.HARD,
+    )->None:
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.clipping = clipping
+
+        self.dtype = get_dtype(sample_width)
+        if (isinstance(self.dtype, Exception)):
+            raise self.dtype
+
+        self.accumulator_dtype = ACCUMULATOR_DTYPES[sample_width]
+
+        self.voices = []
+        self.lock = threading.Lock()
+
+        self.max_samples = 0
+        self._allocate(0)
+
+    def __len__(
+        self,
+    )->int:
+        return len(self.voices)
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * self.sample_width
+
+    def _allocate(
+        self,
+        max_samples:int,
+    )->None:
+        """
+        (Re)allocate the working buffers for buffers of up to `max_samples` samples.
+        """
+        self.max_samples = max_samples
+
+        self._mix = np.empty(max_samples, dtype=self.accumulator_dtype)
+        self._scaled = np.empty(max_samples, dtype=self.accumulator_dtype)
+        self._output = np.empty(max_samples, dtype=self.dtype)
+
+    def add(
+        self,
+        source:Any,
+        gain:float = None,
+    )->Union[
+        MixerVoice,
+        InvalidInputParameters,
+    ]:
+        """
+        Start mixing `source` in. Returns its MixerVoice, whose .gain can be changed while playing.
+        """
+        _source_format = (source.channels, source.sample_width, source.sample_rate)
+        _format = (self.channels, self.sample_width, self.sample_rate)
+
+        if (_source_format != _format):
+            return InvalidInputParameters(
+                f"Source format (channels, sample_width, sample_rate)={_source_format} does not match mixer {_format}."
+            )
+
+        _voice = MixerVoice(source, gain=gain)
+
+        with self.lock:
+            self.voices.append(_voice)
+
+        return _voice
+
+    def remove(
+        self,
+        voice:MixerVoice,
+    )->None:
+        with self.lock:
+            if (voice in self.voices):
+                self.voices.remove(voice)
+
+    def render(
+        self,
+        frame_count:int,
+    )->bytes:
+        """
+        Mix the next `frame_count` frames of all voices.
+        """
+        _bytes_required = frame_count * self.frame_size
+
+        with self.lock:
+            _voices = list(self.voices)
+
+        _chunks = [
+            (_voice, _voice.read(frame_count)) \
+                for _voice in _voices
+        ]
+
+        _finished = [ _voice for _voice in _voices if _voice.finished ]
+        if (_finished):
+            with self.lock:
+                self.voices = [ _voice for _voice in self.voices if _voice not in _finished ]
+
+        _chunks = [ (_voice, _data) for _voice, _data in _chunks if _data ]
+
+        if (not _chunks):
+            return b"\x00" * _bytes_required
+
+        if (len(_chunks) == 1 and _chunks[0][0].gain == 1):
+            # Nothing to mix
+            _data = _chunks[0][1]
+            return _data + b"\x00" * (_bytes_required - len(_data))
+
+        _sample_count = _bytes_required // self.sample_width
+
+        if (_sample_count > self.max_samples):
+            self._allocate(_sample_count)
+
+        _mix = self._mix[:_sample_count]
+        _mix.fill(0)
+
+        for _voice, _data in _chunks:
+            _samples = np.frombuffer(_data, dtype=self.dtype)
+            _scaled = self._scaled[:len(_samples)]
+
+            # Cast first; a ufunc mixing dtypes would allocate a casting buffer
+            np.copyto(_scaled, _samples)
+
+            if (_voice.gain != 1):
+                np.multiply(_scaled, _voice.gain, out=_scaled)
+
+            _mixed = _mix[:len(_samples)]
+            np.add(_mixed, _scaled, out=_mixed)
+
+        clip(_mix, self.dtype, self.clipping)
+        np.rint(_mix, out=_mix)
+
+        _output = self._output[:_sample_count]
+        np.copyto(_output, _mix, casting="unsafe")
+
+        return _output.tobytes()
+
+    def clear(
+        self,
+    )->None:
+        """
+        Stop and remove all voices.
+        """
+        with self.lock:
+            _voices = self.voices
+            self.voices = []
+
+        for _voice in _voices:
+            _voice.stop()
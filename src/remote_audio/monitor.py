@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+from enum import Enum
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+import warnings
+
+from remote_audio import api
+from remote_audio import device_cache
+from remote_audio import snapshot
+
+"""
+Detect audio devices being plugged in or removed while the process is running.
+
+PortAudio only sees devices that existed when it was initialised. DeviceMonitor polls the cheap
+`device_cache.get_fingerprint()`, and only when it changes re-initialises PortAudio through `api.refresh()`,
+rescans the devices and notifies subscribers of what was added or removed.
+"""
+
+DEFAULT_POLL_INTERVAL = 1
+
+
+class DeviceEventType(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+
+
+@dataclass(frozen=True)
+class DeviceEvent():
+    """
+    A device appearing or disappearing.
+
+    `device_index` refers to the snapshot the event came from:
+    the new snapshot for ADDED, and the old one for REMOVED.
+    """
+    type:DeviceEventType
+    device_index:int
+    device_info:Dict[str, Any]
+    host_api:str = None
+
+    @property
+    def name(
+        self,
+    )->str:
+        return self.device_info.get("name", None)
+
+
+def get_device_keys(
+    device_snapshot:"snapshot.DeviceSnapshot",
+)->Dict[Tuple[str, str, int], int]:
+    """
+    Identify devices across snapshots by (host API name, device name, occurrence),
+    as device indices are reassigned whenever PortAudio is re-initialised.
+
+    Returns a mapping of key -> device_index.
+    """
+
+    _keys = {}
+    _occurrences = {}
+
+    for _device_index, _info in device_snapshot.devices.items():
+        _host_api_index = _info.get("hostApi", None)
+        _host_api = device_snapshot.host_apis[_host_api_index] \
+            if isinstance(_host_api_index, int) and _host_api_index < len(device_snapshot.host_apis) \
+            else _host_api_index
+
+        _name = (_host_api, _info.get("name", None))
+        _occurrence = _occurrences.get(_name, 0)
+        _occurrences[_name] = _occurrence + 1
+
+        _keys[(*_name, _occurrence)] = _device_index
+
+    return _keys
+
+def diff_snapshots(
+    old:"snapshot.DeviceSnapshot",
+    new:"snapshot.DeviceSnapshot",
+)->List[DeviceEvent]:
+    """
+    List the devices removed from `old` and added in `new`.
+    """
+
+    _old_keys = get_device_keys(old) if old is not None else {}
+    _new_keys = get_device_keys(new) if new is not None else {}
+
+    return [
+        DeviceEvent(
+            type = DeviceEventType.REMOVED,
+            device_index = _old_keys[_key],
+            device_info = old.devices[_old_keys[_key]],
+            host_api = _key[0],
+        ) \
+            for _key in _old_keys \
+                if _key not in _new_keys
+    ] + [
+        DeviceEvent(
+            type = DeviceEventType.ADDED,
+            device_index = _new_keys[_key],
+            device_info = new.devices[_new_keys[_key]],
+            host_api = _key[0],
+        ) \
+            for _key in _new_keys \
+                if _key not in _old_keys
+    ]
+
+
+class DeviceMonitor():
+    """
+    Watch for device changes in a background thread.
+
+    Usage:
+    ```
+    def on_change(event:DeviceEvent):
+        print (event.type, event.name)
+
+    with DeviceMonitor() as _monitor:
+        _monitor.subscribe(on_change)
+        ...
+    ```
+
+    Re-initialising PortAudio closes every stream opened through it,
+    so by default a refresh is deferred until no stream is in use; see `defer_while_playing` and `api.has_active_streams()`.
+
+    `pya_factory` makes the PyAudio handle of each refresh instead of pyaudio.PyAudio,
+    e.g. `remote_audio.null.NullPyAudio` to test without a sound card.
+    """
+
+    def __init__(
+        self,
+        interval:float = DEFAULT_POLL_INTERVAL,
+        fingerprint:Callable[[], str] = device_cache.get_fingerprint,
+        defer_while_playing:bool = True,
+        pya_factory:Callable[[], "pyaudio.PyAudio"] = None,
+    )->None:
+        self.interval = interval
+        self.fingerprint = fingerprint
+        self.defer_while_playing = defer_while_playing
+        self.pya_factory = pya_factory
+
+        self.subscribers = []
+        self.last_fingerprint = None
+        self.pending = False        # A change had been detected but not yet acted upon
+        self.refreshes = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    @property
+    def running(
+        self,
+    )->bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(
+        self,
+        callback:Callable[[DeviceEvent], Any],
+    )->Callable[[], None]:
+        """
+        Call `callback` with every DeviceEvent, from the monitor thread.
+        Returns a function that unsubscribes it.
+        """
+
+        with self._lock:
+            self.subscribers.append(callback)
+
+        def _unsubscribe()->None:
+            with self._lock:
+                if (callback in self.subscribers):
+                    self.subscribers.remove(callback)
+
+        return _unsubscribe
+
+    def start(
+        self,
+    )->"DeviceMonitor":
+        if (not self.running):
+            self.last_fingerprint = self.fingerprint()
+            self._stop.clear()
+
+            self._thread = threading.Thread(
+                target = self._run,
+                name = type(self).__name__,
+                daemon = True,
+            )
+            self._thread.start()
+
+        return self
+
+    def stop(
+        self,
+        timeout:float = None,
+    )->None:
+        self._stop.set()
+
+        if (self._thread is not None and self._thread is not threading.current_thread()):
+            self._thread.join(timeout)
+
+    def check(
+        self,
+    )->List[DeviceEvent]:
+        """
+        Poll once: if the fingerprint had changed, refresh PortAudio and notify subscribers.
+        Returns the events emitted; can be called directly without starting the thread.
+        """
+
+        _fingerprint = self.fingerprint()
+
+        if (_fingerprint != self.last_fingerprint):
+            self.last_fingerprint = _fingerprint
+            self.pending = True
+
+        if (not self.pending):
+            return []
+
+        if (not api.is_initialised()):
+            # Nothing had been scanned yet; the first scan will see the new topology anyway.
+            snapshot.invalidate()
+            self.pending = False
+            return []
+
+        # Checking for streams and refreshing under one lock, so that no stream is opened in between
+        with api.lock:
+            if (self.defer_while_playing and api.has_active_streams()):
+                return []
+
+            _old = snapshot.get_snapshot()
+
+            api.refresh(pya=self.pya_factory() if (self.pya_factory is not None) else None)
+
+        self.refreshes += 1
+        self.pending = False
+
+        _events = diff_snapshots(_old, snapshot.get_snapshot())
+        self.notify(_events)
+
+        return _events
+
+    def notify(
+        self,
+        events:Iterable[DeviceEvent],
+    )->None:
+        with self._lock:
+            _subscribers = list(self.subscribers)
+
+        for _event in events:
+            for _callback in _subscribers:
+                try:
+                    _callback(_event)
+                except Exception as e:
+                    # One misbehaving subscriber must not stop the others, nor the monitor
+                    warnings.warn(
+                        RuntimeWarning(
+                            f"{type(self).__name__} subscriber {repr(_callback)} raised {repr(e)} on {repr(_event)}."
+                        )
+                    )
+
+    def _run(
+        self,
+    )->None:
+        while (not self._stop.wait(self.interval)):
+            try:
+                self.check()
+            except OSError as e:
+                warnings.warn(
+                    RuntimeWarning(
+                        f"{type(self).__name__} failed to refresh devices: {repr(e)}"
+                    )
+                )
@@ -0,0 +1,872 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+import threading
+import time as timer
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Tuple, Union
+
+from remote_audio.device import AudioDevice
+from remote_audio.exceptions import InvalidInputParameters
+from remote_audio.io.pcm import WavePCMSink
+from remote_audio.stream import DEFAULT_TIMEOUT
+
+"""
+Audio devices without sound hardware.
+
+NullPyAudio and NullStream stand in for pyaudio.PyAudio and pyaudio.Stream.
+A NullStream consumes audio through the same contract as PortAudio - the stream callback is called for
+`frames_per_buffer` frames at a time, short buffers are padded and complete the stream, and blocking writes block -
+paced by a VirtualClock at real time, a multiple of it, or as fast as the data comes.
+
+NullAudioDevice plugs them into the normal playback pipeline:
+```
+with NullAudioDevice(speed=10).play_file("file.mp3") as _stream:
+    pass
+```
+FileAudioDevice renders everything played into a WAV file instead, as fast as the sources allow.
+"""
+
+# Same values as in pyaudio, without having to import pyaudio
+PA_CONTINUE = 0
+PA_COMPLETE = 1
+PA_ABORT = 2
+
+PA_OUTPUT_UNDERFLOW = 4
+
+PA_FLOAT32 = 1
+PA_INT32 = 2
+PA_INT24 = 4
+PA_INT16 = 8
+PA_INT8 = 16
+PA_UINT8 = 32
+
+SAMPLE_SIZES = {
+    PA_FLOAT32: 4,
+    PA_INT32:   4,
+    PA_INT24:   3,
+    PA_INT16:   2,
+    PA_INT8:    1,
+    PA_UINT8:   1,
+}
+
+DEFAULT_FRAMES_PER_BUFFER = 1024    # As pyaudio.PyAudio.open
+DEFAULT_SAMPLE_RATE = 48000
+DEFAULT_CHANNELS = 2
+DEFAULT_LOW_LATENCY = 0.01
+DEFAULT_HIGH_LATENCY = 0.1
+IDLE_INTERVAL = 0.001               # How often an idle unpaced stream checks for something to play
+
+
+class VirtualClock():
+    """
+    Stream time of a NullStream, advanced by the duration of every buffer consumed.
+
+    With `speed` 1, consumption is paced to real time; with `speed` 10, ten times as fast;
+    with `speed` None or 0, not paced at all.
+    If the next buffer arrives after the previous one had finished playing, it is counted as an underrun.
+    """
+
+    def __init__(
+        self,
+        speed:float = 1.0,
+    )->None:
+        self.speed = speed
+        self.time = 0.0
+        self.underruns = 0
+
+        self._origin = None     # (real time, stream time) that pacing is measured from
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(speed={repr(self.speed)}, time={self.time:.3f}, underruns={self.underruns})"
+
+    def reset(
+        self,
+    )->None:
+        """
+        Restart pacing from now, e.g. after the stream had been stopped.
+        """
+        self._origin = None
+
+    def due(
+        self,
+    )->Union[
+        float,
+        None,
+    ]:
+        """
+        Real time at which everything up to the current stream time will have been played;
+        None if not paced, or nothing had been played yet.
+        """
+        if (not self.speed or self._origin is None):
+            return None
+
+        return self._origin[0] + (self.time - self._origin[1]) / self.speed
+
+    @property
+    def buffered(
+        self,
+    )->float:
+        """
+        Seconds of stream time consumed but not yet due.
+        """
+        _due = self.due()
+
+        if (_due is None):
+            return 0.0
+
+        return max(0.0, (_due - timer.perf_counter()) * self.speed)
+
+    def advance(
+        self,
+        duration:float,
+        lookahead:float = 0.0,
+    )->None:
+        """
+        Move the clock forward by `duration` seconds of audio,
+        sleeping until only `lookahead` seconds of it are still to be played.
+
+        Deadlines are measured from the origin rather than from the last call, so that the pace does not drift.
+        """
+        _now = timer.perf_counter()
+        _due = self.due()
+
+        if (_due is None or _due < _now):
+            if (_due is not None):
+                # Ran dry before this buffer arrived; the device would have played silence meanwhile
+                self.underruns += 1
+
+            self._origin = (_now, self.time)
+
+        self.time += duration
+
+        if (self.speed):
+            _delay = self.due() - lookahead / self.speed - timer.perf_counter()
+
+            if (_delay > 0):
+                timer.sleep(_delay)
+
+
+class NullStream():
+    """
+    An output stream that consumes audio without playing it.
+
+    With a `stream_callback`, a thread calls it for every buffer, as PortAudio would;
+    otherwise .write() blocks until the data has nearly been played.
+    If `sink` is given, e.g. a `remote_audio.io.pcm.PCMSink`, everything consumed is written into it.
+
+    Unlike PortAudio, the callback is not called while `skip_while()` is True;
+    e.g. so that an idle PersistentOutput does not render endless silence into a sink when not paced.
+
+    An input stream calls back with `frames_per_buffer` frames at a time of raw PCM read from `source`;
+    unlike PortAudio, it completes once `source` runs out, so that everything captured is known.
+    """
+
+    def __init__(
+        self,
+        pya:"NullPyAudio",
+        rate:int,
+        channels:int,
+        format:int,
+        input:bool = False,
+        output:bool = False,
+        frames_per_buffer:int = DEFAULT_FRAMES_PER_BUFFER,
+        start:bool = True,
+        stream_callback:Callable[[Union[bytes, None], int, Dict[str, float], int], Tuple[bytes, int]] = None,
+        speed:float = 1.0,
+        sink:"remote_audio.io.pcm.PCMSink" = None,
+        skip_while:Callable[[], bool] = None,
+        source:BinaryIO = None,
+        **kwargs,
+    )->None:
+        self.pya = pya
+        self.rate = rate
+        self.channels = channels
+        self.format = format
+        self.input = input
+        self.frames_per_buffer = frames_per_buffer or DEFAULT_FRAMES_PER_BUFFER
+        self.stream_callback = stream_callback
+        self.sink = sink if (not input) else None
+        self.source = source if (input) else None
+        self.skip_while = skip_while
+
+        self.clock = VirtualClock(speed)
+        self.frames_played = 0
+        self.buffers_played = 0
+        self.render_time = 0.0          # Seconds spent producing and consuming buffers, excluding idle time
+
+        self._last_consumed = None
+        self._active = False
+        self._closed = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        if (self.sink is not None):
+            self.sink.open(
+                channels = channels,
+                sample_width = self.sample_width,
+                sample_rate = rate,
+            )
+
+        if (start):
+            self.start_stream()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(rate={self.rate}, channels={self.channels}, sample_width={self.sample_width}, frames_played={self.frames_played:,}, active={self.is_active()})"
+
+    @property
+    def sample_width(
+        self,
+    )->int:
+        return SAMPLE_SIZES[self.format]
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * self.sample_width
+
+    def _consume(
+        self,
+        data:bytes,
+        frame_count:int = None,
+    )->None:
+        """
+        Play `data`, taking `frame_count` frames of time if given.
+        """
+        if (self.sink is not None and data):
+            self.sink.write(data)
+
+        if (frame_count is None):
+            frame_count = len(data) // self.frame_size
+
+        _now = timer.perf_counter()
+        if (self._last_consumed is not None):
+            self.render_time += _now - self._last_consumed
+        self._last_consumed = _now
+
+        self.frames_played += frame_count
+        self.buffers_played += 1
+
+        # As PortAudio, ask for the next buffer while this one is still playing
+        self.clock.advance(
+            frame_count / self.rate,
+            lookahead = self.get_output_latency(),
+        )
+
+    def _run(
+        self,
+    )->None:
+        """
+        Call the stream callback for every buffer, until it completes or the stream is stopped.
+        """
+        _bytes_required = self.frames_per_buffer * self.frame_size
+        _underruns = self.clock.underruns
+
+        try:
+            while (not self._stop.is_set()):
+                if (self.skip_while is not None and self.skip_while()):
+                    self._stop.wait(IDLE_INTERVAL)
+                    self.clock.reset()
+                    self._last_consumed = timer.perf_counter()
+                    continue
+
+                _status_flags = PA_OUTPUT_UNDERFLOW if (self.clock.underruns > _underruns) else 0
+                _underruns = self.clock.underruns
+
+                _data, _status = self.stream_callback(
+                    None,
+                    self.frames_per_buffer,
+                    {
+                        "input_buffer_adc_time":    0,
+                        "current_time":             self.clock.time,
+                        "output_buffer_dac_time":   self.clock.time + self.get_output_latency(),
+                    },
+                    _status_flags,
+                )
+
+                # As PortAudio, copy the data out; the callback may reuse its buffer
+                _data = bytes(_data)[:_bytes_required] if (_data is not None) else b""
+
+                if (len(_data) < _bytes_required):
+                    # As in PyAudio: a short buffer is padded with silence, and completes the stream
+                    _status = PA_COMPLETE
+
+                if (_status == PA_ABORT):
+                    break
+
+                self._consume(_data, self.frames_per_buffer)
+
+                if (_status != PA_CONTINUE):
+                    break
+        finally:
+            self._active = False
+
+    def _run_input(
+        self,
+    )->None:
+        """
+        Call the stream callback with every buffer of `source`, until it runs out or the stream is stopped.
+        """
+        _bytes_required = self.frames_per_buffer * self.frame_size
+
+        try:
+            while (not self._stop.is_set()):
+                _data = self.source.read(_bytes_required) if (self.source is not None) else b""
+
+                if (len(_data) < _bytes_required):
+                    break
+
+                _, _status = self.stream_callback(
+                    _data,
+                    self.frames_per_buffer,
+                    {
+                        "input_buffer_adc_time":    self.clock.time,
+                        "current_time":             self.clock.time,
+                        "output_buffer_dac_time":   0,
+                    },
+                    0,
+                )
+
+                if (_status == PA_ABORT):
+                    break
+
+                self._consume(b"", self.frames_per_buffer)
+
+                if (_status != PA_CONTINUE):
+                    break
+        finally:
+            self._active = False
+
+    def start_stream(
+        self,
+    )->None:
+        if (self._active):
+            return
+
+        self._stop.clear()
+        self.clock.reset()
+        self._last_consumed = timer.perf_counter()
+        self._active = True
+
+        if (self.stream_callback is not None):
+            self._thread = threading.Thread(
+                target = self._run_input if (self.input) else self._run,
+                name = type(self).__name__,
+                daemon = True,
+            )
+            self._thread.start()
+
+    def stop_stream(
+        self,
+    )->None:
+        self._stop.set()
+
+        if (self._thread is not None and self._thread is not threading.current_thread()):
+            self._thread.join()
+
+        self._thread = None
+        self._active = False
+
+    def close(
+        self,
+    )->None:
+        if (not self._closed):
+            self.stop_stream()
+            self._closed = True
+            self.pya._remove_stream(self)
+
+    def is_active(
+        self,
+    )->bool:
+        return self._active
+
+    def is_stopped(
+        self,
+    )->bool:
+        return not self._active
+
+    def get_time(
+        self,
+    )->float:
+        return self.clock.time
+
+    def get_output_latency(
+        self,
+    )->float:
+        return self.frames_per_buffer / self.rate
+
+    def get_cpu_load(
+        self,
+    )->float:
+        return 0.0
+
+    def get_write_available(
+        self,
+    )->int:
+        if (not self.clock.speed):
+            # Not paced; writes never wait, and the buffer never runs dry
+            return 0
+
+        return max(0, self.frames_per_buffer - int(self.clock.buffered * self.rate))
+
+    def write(
+        self,
+        frames:bytes,
+        num_frames:int = None,
+        exception_on_underflow:bool = False,
+    )->None:
+        """
+        Consume `frames`, blocking until only one buffer of them is still to be played.
+        """
+        if (self._closed):
+            raise OSError(f"{type(self).__name__} had been closed.")
+
+        # As PyAudio, copy the frames out; the writer may reuse its buffer
+        frames = bytes(frames)
+
+        if (num_frames is not None):
+            frames = frames[:num_frames * self.frame_size]
+
+        self._consume(frames)
+
+
+class NullPyAudio():
+    """
+    Stands in for pyaudio.PyAudio, with a single output device; every stream opened is a NullStream.
+
+    Can be passed as `pya` to `remote_audio.audio.start_wav_stream`.
+    With `input_channels`, the device can capture too, e.g. through `remote_audio.capture.record`;
+    input streams read raw PCM from `source`.
+    """
+
+    def __init__(
+        self,
+        sample_rate:int = DEFAULT_SAMPLE_RATE,
+        channels:int = DEFAULT_CHANNELS,
+        speed:float = 1.0,
+        sink:"remote_audio.io.pcm.PCMSink" = None,
+        name:str = "Null",
+        input_channels:int = 0,
+        source:BinaryIO = None,
+    )->None:
+        self.speed = speed
+        self.sink = sink
+        self.source = source
+        self.device_info = {
+            "index":                    0,
+            "structVersion":            2,
+            "name":                     name,
+            "hostApi":                  0,
+            "maxInputChannels":         input_channels,
+            "maxOutputChannels":        channels,
+            "defaultLowInputLatency":   DEFAULT_LOW_LATENCY,
+            "defaultLowOutputLatency":  DEFAULT_LOW_LATENCY,
+            "defaultHighInputLatency":  DEFAULT_HIGH_LATENCY,
+            "defaultHighOutputLatency": DEFAULT_HIGH_LATENCY,
+            "defaultSampleRate":        float(sample_rate),
+        }
+        self.host_api_info = {
+            "index":                0,
+            "structVersion":        1,
+            "type":                 0,
+            "name":                 name,
+            "deviceCount":          1,
+            "defaultInputDevice":   0 if (input_channels) else -1,
+            "defaultOutputDevice":  0,
+        }
+
+        self._streams = set()
+        self._closed_render_time = 0.0
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(name={repr(self.device_info['name'])}, speed={repr(self.speed)}, streams={len(self._streams)})"
+
+    @property
+    def streams(
+        self,
+    )->Iterable[NullStream]:
+        return list(self._streams)
+
+    @property
+    def render_time(
+        self,
+    )->float:
+        """
+        Seconds spent rendering by all streams, open or closed.
+        """
+        return self._closed_render_time + sum(_stream.render_time for _stream in self.streams)
+
+    def open(
+        self,
+        *args,
+        **kwargs,
+    )->NullStream:
+        _stream = NullStream(
+            self,
+            *args,
+            **{
+                "speed":    self.speed,
+                "sink":     self.sink,
+                "source":   self.source,
+                **kwargs,
+            },
+        )
+        self._streams.add(_stream)
+
+        return _stream
+
+    def _remove_stream(
+        self,
+        stream:NullStream,
+    )->None:
+        if (stream in self._streams):
+            self._streams.discard(stream)
+            self._closed_render_time += stream.render_time
+
+    def terminate(
+        self,
+    )->None:
+        for _stream in self.streams:
+            _stream.close()
+
+    def get_format_from_width(
+        self,
+        width:int,
+        unsigned:bool = True,
+    )->int:
+        if (width == 1):
+            return PA_UINT8 if (unsigned) else PA_INT8
+
+        _format = {
+            2: PA_INT16,
+            3: PA_INT24,
+            4: PA_FLOAT32,
+        }.get(width, None)
+
+        if (_format is None):
+            raise ValueError(f"Invalid width: {width}")
+
+        return _format
+
+    def get_sample_size(
+        self,
+        format:int,
+    )->int:
+        return SAMPLE_SIZES[format]
+
+    def is_format_supported(
+        self,
+        *args,
+        **kwargs,
+    )->bool:
+        return True
+
+    def get_host_api_count(
+        self,
+    )->int:
+        return 1
+
+    def get_default_host_api_info(
+        self,
+    )->Dict[str, Any]:
+        return dict(self.host_api_info)
+
+    def get_host_api_info_by_index(
+        self,
+        host_api_index:int,
+    )->Dict[str, Any]:
+        if (host_api_index != 0):
+            raise OSError(f"Invalid host api index: {host_api_index}")
+
+        return dict(self.host_api_info)
+
+    def get_device_count(
+        self,
+    )->int:
+        return 1
+
+    def get_device_info_by_index(
+        self,
+        device_index:int,
+    )->Dict[str, Any]:
+        if (device_index != 0):
+            raise OSError(f"Invalid device index: {device_index}")
+
+        return dict(self.device_info)
+
+    def get_device_info_by_host_api_device_index(
+        self,
+        host_api_index:int,
+        host_api_device_index:int,
+    )->Dict[str, Any]:
+        self.get_host_api_info_by_index(host_api_index)
+
+        return self.get_device_info_by_index(host_api_device_index)
+
+    def get_default_output_device_info(
+        self,
+    )->Dict[str, Any]:
+        return dict(self.device_info)
+
+    def get_default_input_device_info(
+        self,
+    )->Dict[str, Any]:
+        if (not self.device_info["maxInputChannels"]):
+            raise OSError("No Default Input Device Available")
+
+        return dict(self.device_info)
+
+
+class NullAudioDevice(AudioDevice):
+    """
+    An AudioDevice that plays into a NullPyAudio, for running the whole playback pipeline without sound hardware.
+
+    Everything played is paced at `speed` times real time, or not at all if `speed` is None;
+    pass a `sink` to keep what was played.
+    Accepts the same arguments as AudioDevice for .start_wav_stream(), .play_file(), .play_http() and .play_bytes().
+    """
+
+    def __init__(
+        self,
+        sample_rate:int = DEFAULT_SAMPLE_RATE,
+        channels:int = DEFAULT_CHANNELS,
+        speed:float = 1.0,
+        sink:"remote_audio.io.pcm.PCMSink" = None,
+        name:str = "Null",
+    )->None:
+        self.pya = NullPyAudio(
+            sample_rate = sample_rate,
+            channels = channels,
+            speed = speed,
+            sink = sink,
+            name = name,
+        )
+
+        self.properties = self.pya.get_default_output_device_info()
+        self.device_index = 0
+        self.signature = None
+
+        # Passed on to audio.start_wav_stream by all the playback methods
+        self.stream_kwargs = {
+            "pya":  self.pya,
+        }
+
+    def persistent_output(
+        self,
+        **kwargs,
+    )->Union[
+        "remote_audio.output.PersistentOutput",
+        Exception,
+    ]:
+        """
+        A PersistentOutput on this device; unlike on real devices, it is not shared.
+        """
+        from remote_audio import output
+
+        _sample_rate, _channels = self.output_format
+
+        try:
+            return output.PersistentOutput(
+                device_index = self.device_index,
+                **{
+                    "sample_rate":  _sample_rate,
+                    "channels":     _channels,
+                    "pya":          self.pya,
+                    **kwargs,
+                },
+            )
+        except InvalidInputParameters as e:
+            return e
+
+    def start_wav_stream(
+        self,
+        *args,
+        **kwargs,
+    )->"remote_audio.stream.AudioStream":
+        return super().start_wav_stream(
+            *args,
+            **{
+                **self.stream_kwargs,
+                **kwargs,
+            },
+        )
+
+    def play_file(
+        self,
+        *args,
+        **kwargs,
+    )->"remote_audio.stream.AudioStream":
+        return super().play_file(
+            *args,
+            **{
+                **self.stream_kwargs,
+                **kwargs,
+            },
+        )
+
+    def play_http(
+        self,
+        *args,
+        **kwargs,
+    )->"remote_audio.stream.AudioStream":
+        return super().play_http(
+            *args,
+            **{
+                **self.stream_kwargs,
+                **kwargs,
+            },
+        )
+
+    def play_bytes(
+        self,
+        *args,
+        **kwargs,
+    )->"remote_audio.stream.AudioStream":
+        return super().play_bytes(
+            *args,
+            **{
+                **self.stream_kwargs,
+                **kwargs,
+            },
+        )
+
+
+@dataclass(frozen=True)
+class RenderReport():
+    """
+    How much audio a FileAudioDevice had rendered, and how fast.
+    """
+    frames:int
+    sample_rate:int
+    render_time:float       # Seconds spent rendering, excluding time with nothing to play
+
+    @property
+    def duration(
+        self,
+    )->float:
+        """
+        Seconds of audio rendered.
+        """
+        return self.frames / self.sample_rate
+
+    @property
+    def realtime_multiple(
+        self,
+    )->float:
+        """
+        Render speed as a multiple of real time; e.g. 50 means one minute of audio took 1.2 seconds.
+        """
+        if (self.render_time <= 0):
+            return float("inf") if (self.frames) else 0.0
+
+        return self.duration / self.render_time
+
+
+class FileAudioDevice(NullAudioDevice):
+    """
+    An AudioDevice that renders everything played into a WAV file, as fast as the sources allow.
+
+    Usage:
+    ```
+    with FileAudioDevice("announcement.wav") as _device:
+        with _device.play_file("chime.wav"):
+            pass
+        with _device.play_http("https://somedomain.com/announcement.mp3"):
+            pass
+
+    print (_device.report().realtime_multiple)
+    ```
+
+    Everything played goes through the same pipeline as on a real device - decoded by FFmpeg into the format of the
+    device, fed through the stream callback or writer, mixed and gained by a PersistentOutput - and is written back to back.
+    StreamIOs are decoded completely before they start playing, so that the output does not depend on how fast they were decoded.
+    A stream with a known length ends with its last frame, rather than being kept alive with silence until its timeout.
+    The WAV header is completed on .close().
+    """
+
+    def __init__(
+        self,
+        file:Union[
+            str,
+            BinaryIO,
+        ],
+        sample_rate:int = DEFAULT_SAMPLE_RATE,
+        channels:int = DEFAULT_CHANNELS,
+        name:str = "File",
+    )->None:
+        self.sink = WavePCMSink(file)
+
+        super().__init__(
+            sample_rate = sample_rate,
+            channels = channels,
+            speed = None,
+            sink = self.sink,
+            name = name,
+        )
+
+        self.stream_kwargs["buffer_all"] = True
+
+        # So that the header is valid even if nothing is played
+        self.sink.open(
+            channels = channels,
+            sample_width = 2,
+            sample_rate = sample_rate,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(
+        self,
+    )->None:
+        """
+        Close all streams, and complete the WAV file.
+        """
+        self.pya.terminate()
+        self.sink.close()
+
+    def report(
+        self,
+    )->RenderReport:
+        return RenderReport(
+            frames = self.sink.bytes_written // self.sink.frame_size,
+            sample_rate = self.sink.sample_rate,
+            render_time = self.pya.render_time,
+        )
+
+    def persistent_output(
+        self,
+        **kwargs,
+    )->Union[
+        "remote_audio.output.PersistentOutput",
+        Exception,
+    ]:
+        """
+        A PersistentOutput on this device, which only renders while it has something to play.
+        """
+        _output = super().persistent_output(
+            **{
+                "start":    False,
+                **kwargs,
+            },
+        )
+
+        if (isinstance(_output, Exception)):
+            return _output
+
+        _output.stream_kwargs["skip_while"] = lambda: _output.idle
+
+        if (kwargs.get("start", True)):
+            _output.open()
+
+        return _output
+
@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+
+import collections
+import threading
+import time as timer
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Tuple, Union
+
+from remote_audio import api
+from remote_audio import audio
+import remote_audio.classes as classes
+from remote_audio.exceptions import InvalidInputParameters, WavFormatError
+from remote_audio.io.pcm import PCMSource
+import remote_audio.latency as latency_profiles
+from remote_audio import metrics
+from remote_audio import mixer
+from remote_audio.stream import DEFAULT_TIMEOUT
+
+"""
+Output streams that stay open between playbacks.
+
+Opening a PortAudio stream can take hundreds of milliseconds on Bluetooth and HDMI sinks, and some of them clip
+the start of every playback while waking up. A PersistentOutput opens its stream once, plays silence while idle,
+and plays whatever is queued onto it as soon as the next buffer is due.
+Sources can also be mixed in on top of the queue, e.g. a chime over speech.
+"""
+
+DEFAULT_SAMPLE_WIDTH = 2        # FFmpegStreamIO always decodes into s16le
+
+# Same values as pyaudio.paContinue and pyaudio.paComplete, without having to import pyaudio
+PA_CONTINUE = 0
+PA_COMPLETE = 1
+
+
+class SourceQueue():
+    """
+    Plays PCMSources one after the other, all in the same format.
+
+    .render() always returns exactly the number of frames asked for, padded with silence
+    when the queue is empty or the current source is waiting for data.
+
+    With `crossfade` seconds, the end of each source overlaps the start of the next with an equal-power crossfade.
+    This needs the length of the source playing to be known by the time it is within `crossfade` of its end
+    - for a StreamIO, its decoder has to have finished by then - and the next source to be queued already;
+    otherwise the crossfade is shortened, down to none at all. 8 and 24-bit sources are never crossfaded.
+
+    A SourceQueue never finishes, so that it can be a permanent voice of a Mixer.
+    """
+
+    finished = False
+
+    def __init__(
+        self,
+        channels:int,
+        sample_width:int,
+        sample_rate:int,
+        crossfade:float = 0,
+        clipping:"mixer.ClippingMode" = mixer.ClippingMode.HARD,
+    )->None:
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.crossfade = crossfade
+        self.clipping = clipping
+
+        self.sources = collections.deque()
+        self.lock = threading.Lock()
+
+        self._fading = None             # Source being crossfaded out of
+        self._fade_length = 0           # Frames of its crossfade, as of when it started
+
+    def __len__(
+        self,
+    )->int:
+        return len(self.sources)
+
+    @property
+    def frame_size(
+        self,
+    )->int:
+        return self.channels * self.sample_width
+
+    @property
+    def idle(
+        self,
+    )->bool:
+        return not self.sources
+
+    @property
+    def crossfade_frames(
+        self,
+    )->int:
+        if (not self.crossfade or isinstance(mixer.get_dtype(self.sample_width), Exception)):
+            return 0
+
+        return int(self.crossfade * self.sample_rate)
+
+    def check_format(
+        self,
+        source:PCMSource,
+    )->Union[
+        None,
+        InvalidInputParameters,
+    ]:
+        """
+        Returns InvalidInputParameters if `source` cannot be played without conversion.
+        """
+        _source_format = (source.channels, source.sample_width, source.sample_rate)
+        _format = (self.channels, self.sample_width, self.sample_rate)
+
+        if (_source_format != _format):
+            return InvalidInputParameters(
+                f"Source format (channels, sample_width, sample_rate)={_source_format} does not match output {_format}; " + \
+                "decode it with FFmpeg into the output format first."
+            )
+
+        return None
+
+    def put(
+        self,
+        source:PCMSource,
+    )->Union[
+        PCMSource,
+        InvalidInputParameters,
+    ]:
+        _error = self.check_format(source)
+
+        if (_error is not None):
+            return _error
+
+        with self.lock:
+            self.sources.append(source)
+
+        return source
+
+    def clear(
+        self,
+    )->None:
+        """
+        Stop and remove all sources, including the one currently playing.
+        """
+        with self.lock:
+            _sources = list(self.sources)
+            self.sources.clear()
+            self._fading = None
+
+        for _source in _sources:
+            _source.stop()
+
+    def render(
+        self,
+        frame_count:int,
+    )->bytes:
+        _bytes_required = frame_count * self.frame_size
+        _chunks = []
+        _bytes_rendered = 0
+        _fade_frames = self.crossfade_frames
+
+        with self.lock:
+            while (self.sources and _bytes_rendered < _bytes_required):
+                _source = self.sources[0]
+                _frames = (_bytes_required - _bytes_rendered) // self.frame_size
+
+                _next = self.sources[1] if (_fade_frames and len(self.sources) > 1) else None
+                _remaining = _source.frames_remaining if (_next is not None) else None
+
+                if (_remaining and _remaining <= _fade_frames):
+                    if (self._fading is not _source):
+                        # Starts now; shorter than asked for if the length of the source was not known in time
+                        self._fading = _source
+                        self._fade_length = _remaining
+
+                    _data = _source.read(min(_frames, _remaining))
+
+                    if (_data):
+                        _chunks.append(
+                            mixer.crossfade(
+                                _data,
+                                _next.read(len(_data) // self.frame_size),
+                                position = self._fade_length - _remaining,
+                                length = self._fade_length,
+                                channels = self.channels,
+                                sample_width = self.sample_width,
+                                outgoing_gain = _source.gain,
+                                incoming_gain = _next.gain,
+                                mode = self.clipping,
+                            )
+                        )
+                        _bytes_rendered += len(_data)
+                else:
+                    if (_remaining is not None and _remaining > _fade_frames):
+                        # Stop right where the crossfade is due to start
+                        _frames = min(_frames, _remaining - _fade_frames)
+
+                    _data = _source.read(_frames)
+
+                    if (_data):
+                        _chunks.append(
+                            mixer.apply_gain(_data, _source.gain, self.sample_width) if (_source.gain != 1) else _data
+                        )
+                        _bytes_rendered += len(_data)
+
+                if (_source.finished):
+                    # Carry on with the next source within the same buffer, so there is no gap between them
+                    self.sources.popleft()
+                    self._fading = None
+                elif (not _data):
+                    # Underrun - the current source is waiting for data
+                    break
+
+        if (_bytes_rendered < _bytes_required):
+            _chunks.append(b"\x00" * (_bytes_required - _bytes_rendered))
+
+        return b"".join(_chunks)
+
+    read = render
+
+
+class PersistentOutput():
+    """
+    An output stream on one device that is kept open across playbacks.
+
+    Usage:
+    ```
+    with PersistentOutput(device_index) as _output:
+        _output.play_file("chime.wav")
+        _output.play_http("https://somedomain.com/announcement.mp3").wait()
+    ```
+
+    Sources are queued and played back to back, unless `mix` is set, in which case they play immediately
+    on top of whatever else is playing.
+    All non-WAV sources are decoded by FFmpeg straight into the format of the output,
+    which is the native format of the device unless specified.
+
+    While idle, the output does not hold off a DeviceMonitor from re-initialising PortAudio;
+    if that closes the stream, it is reopened on the next play.
+    """
+
+    def __init__(
+        self,
+        device_index:int = None,
+        sample_rate:int = None,
+        channels:int = None,
+        sample_width:int = DEFAULT_SAMPLE_WIDTH,
+        chunk_size:int = audio.DEFAULT_CHUNK_SIZE,
+        start:bool = True,
+        clipping:"mixer.ClippingMode" = mixer.ClippingMode.HARD,
+        crossfade:float = 0,
+        latency:Union[
+            "latency_profiles.LatencyProfile",
+            str,
+            None,
+        ] = None,
+        pya:"pyaudio.PyAudio" = None,
+        **kwargs,
+    )->None:
+        """
+        With `crossfade` seconds, queued sources overlap with an equal-power crossfade instead of following each other;
+        it can be changed later through .queue.crossfade.
+
+        If `latency` is given, it overrides `chunk_size` with the buffer size of that profile for the device.
+        Raises InvalidInputParameters if `latency` is not a known profile.
+
+        `pya` replaces the shared PyAudio handle, e.g. with a `remote_audio.null.NullPyAudio`.
+        """
+        if (not (sample_rate and channels)):
+            _sample_rate, _channels = audio.get_output_format(device_index, pya=pya)
+            sample_rate = sample_rate or _sample_rate
+            channels = channels or _channels
+
+        if (latency is not None):
+            _buffer_settings = latency_profiles.get_buffer_settings(
+                profile = latency,
+                device_info = audio.get_device_info(device_index, pya=pya),
+                sample_rate = sample_rate,
+                frame_size = channels * sample_width,
+            )
+
+            if (isinstance(_buffer_settings, Exception)):
+                raise _buffer_settings
+
+            chunk_size = _buffer_settings.chunk_size
+
+        self.device_index = device_index
+        self.pya = pya
+        self.chunk_size = chunk_size
+        self.stream_kwargs = kwargs
+
+        self.queue = SourceQueue(
+            channels = channels,
+            sample_width = sample_width,
+            sample_rate = sample_rate,
+            crossfade = crossfade,
+            clipping = clipping,
+        )
+
+        # The queue is a permanent voice of the mixer; other sources are mixed in on top of it.
+        self.mixer = mixer.Mixer(
+            channels = channels,
+            sample_width = sample_width,
+            sample_rate = sample_rate,
+            clipping = clipping,
+        )
+        self.mixer.add(self.queue)
+
+        # Flags, callback timings and latencies of the stream; see remote_audio.metrics
+        self.metrics = metrics.StreamMetrics(sample_rate=sample_rate)
+
+        self.stream = None
+        self._handle = None         # The PyAudio handle .stream was opened through
+        self._lock = threading.Lock()
+
+        if (start):
+            self.open()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(device_index={repr(self.device_index)}, sample_rate={self.sample_rate}, channels={self.channels}, queued={len(self.queue)}, mixed={len(self.mixer)-1}, open={self.is_open})"
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def sample_rate(self)->int:
+        return self.queue.sample_rate
+
+    @property
+    def channels(self)->int:
+        return self.queue.channels
+
+    @property
+    def sample_width(self)->int:
+        return self.queue.sample_width
+
+    @property
+    def is_open(
+        self,
+    )->bool:
+        return self.stream is not None
+
+    @property
+    def idle(
+        self,
+    )->bool:
+        return self.queue.idle and len(self.mixer) <= 1
+
+    def open(
+        self,
+    )->"PersistentOutput":
+        """
+        Open and start the stream, if not already open.
+        """
+        with self._lock:
+            if (self.stream is not None and self.pya is None and self._handle is not api.get_pya()):
+                # Closed by api.refresh() while idle
+                self.stream = None
+
+            if (self.stream is None):
+                _p = self.pya if (self.pya is not None) else api.get_pya()
+
+                self.stream = api.open_stream(
+                    pya=self.pya,
+                    busy=lambda: not self.idle,
+                    output_device_index=self.device_index,
+                    format=_p.get_format_from_width(self.sample_width),
+                    channels=self.channels,
+                    rate=self.sample_rate,
+                    output=True,
+                    frames_per_buffer=self.chunk_size,
+                    start=True,
+                    stream_callback=self._callback,
+                    **self.stream_kwargs,
+                )
+                self._handle = _p
+
+        return self
+
+    def close(
+        self,
+    )->None:
+        """
+        Stop everything queued and close the stream.
+        """
+        self.clear()
+
+        with self._lock:
+            if (self.stream is not None):
+                try:
+                    api.close_stream(self.stream)
+                except OSError as e:
+                    # Already closed, e.g. PortAudio had been terminated by api.refresh()
+                    pass
+
+                self.stream = None
+
+    def clear(
+        self,
+    )->None:
+        """
+        Stop everything queued or mixed, keeping the stream open.
+        """
+        self.queue.clear()
+
+        for _voice in list(self.mixer.voices):
+            if (_voice.source is not self.queue):
+                _voice.stop()
+                self.mixer.remove(_voice)
+
+    def render(
+        self,
+        frame_count:int,
+    )->bytes:
+        """
+        Produce the next `frame_count` frames of output.
+        """
+        return self.mixer.render(frame_count)
+
+    def _callback(
+        self,
+        in_data:Union[
+            bytes,
+            None,
+        ],
+        frame_count:int,
+        time_info:Dict[
+            str, Any
+        ],
+        status_flags:int,
+    )->Tuple[bytes, int]:
+        _start = timer.perf_counter()
+
+        self.metrics.record_flags(status_flags)
+        self.metrics.record_time_info(time_info)
+
+        _data = self.render(frame_count)
+
+        self.metrics.record_callback(timer.perf_counter() - _start, frame_count)
+
+        return (_data, PA_CONTINUE)
+
+    @property
+    def stats(
+        self,
+    )->"metrics.StreamStats":
+        """
+        Snapshot of .metrics; str() it for a log line.
+        """
+        return self.metrics.stats()
+
+    def play(
+        self,
+        io:Union[
+            BinaryIO,
+            str,
+        ],
+        bytes_total:Union[
+            int,
+            "remote_audio.io.base_io.StreamIO",
+            None,
+        ] = None,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+        mix:bool = False,
+    )->Union[
+        PCMSource,
+        Exception,
+    ]:
+        """
+        Queue WAV data, e.g. a StreamIO, for playback; or if `mix`, start playing it immediately over everything else.
+
+        Returns the PCMSource, which can be waited on or stopped, and whose .gain can be changed while playing;
+        or an InvalidInputParameters if the format does not match the output.
+        """
+        try:
+            _source = PCMSource(
+                io = io,
+                bytes_total = bytes_total,
+                timeout = timeout,
+                gain = gain,
+            )
+        except WavFormatError as e:
+            return e
+
+        if (mix):
+            # The voice follows the gain of the source
+            _voice = self.mixer.add(_source)
+
+            if (isinstance(_voice, Exception)):
+                _source = _voice
+        else:
+            _source = self.queue.put(_source)
+
+        if (not isinstance(_source, Exception)):
+            self.open()
+
+        return _source
+
+    def _play_source(
+        self,
+        kind:str,
+        source:Union[
+            str,
+            bytes,
+        ],
+        format:str = None,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+        mix:bool = False,
+        **kwargs,
+    )->Union[
+        PCMSource,
+        Exception,
+    ]:
+        _io = classes.open_source(
+            kind = kind,
+            source = source,
+            format = format,
+            sample_rate = self.sample_rate,
+            channels = self.channels,
+            **kwargs,
+        )
+
+        if (isinstance(_io, Exception)):
+            return _io
+
+        return self.play(
+            io = _io,
+            timeout = timeout,
+            gain = gain,
+            mix = mix,
+        )
+
+    def play_file(
+        self,
+        path:str,
+        format:str = None,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+        mix:bool = False,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
+    )->Union[
+        PCMSource,
+        Exception,
+    ]:
+        """
+        Queue a local audio file. See `audio.play_file`.
+        """
+        return self._play_source(
+            "file",
+            path,
+            format = format,
+            timeout = timeout,
+            gain = gain,
+            mix = mix,
+            callback = callback,
+            start_at = start_at,
+            end_at = end_at,
+        )
+
+    def play_http(
+        self,
+        url:str,
+        format:str = None,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+        mix:bool = False,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
+    )->Union[
+        PCMSource,
+        Exception,
+    ]:
+        """
+        Queue an audio file over HTTP. See `audio.play_http`.
+        """
+        return self._play_source(
+            "http",
+            url,
+            format = format,
+            timeout = timeout,
+            gain = gain,
+            mix = mix,
+            callback = callback,
+            start_at = start_at,
+            end_at = end_at,
+        )
+
+    def play_bytes(
+        self,
+        data:bytes,
+        format:str,
+        timeout:float = DEFAULT_TIMEOUT,
+        gain:float = 1.0,
+        mix:bool = False,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+    )->Union[
+        PCMSource,
+        Exception,
+    ]:
+        """
+        Queue audio data already in memory. See `audio.play_bytes`.
+        """
+        return self._play_source(
+            "bytes",
+            data,
+            format = format,
+            timeout = timeout,
+            gain = gain,
+            mix = mix,
+            callback = callback,
+        )
+
+
+_outputs = {}
+_outputs_lock = threading.Lock()
+
+def get_persistent_output(
+    device_index:int = None,
+    **kwargs,
+)->Union[
+    PersistentOutput,
+    Exception,
+]:
+    """
+    Get the shared PersistentOutput of a device, opening it on first use.
+    `kwargs` only take effect when the output is first created.
+
+    Returns InvalidInputParameters if `latency` is not a known profile, as `audio.start_wav_stream` does.
+    """
+    with _outputs_lock:
+        _output = _outputs.get(device_index, None)
+
+        if (_output is None):
+            try:
+                _output = PersistentOutput(
+                    device_index = device_index,
+                    **kwargs,
+                )
+            except InvalidInputParameters as e:
+                return e
+
+            _outputs[device_index] = _output
+
+    return _output.open()
+
+def close_all()->None:
+    """
+    Close all shared PersistentOutputs.
+    """
+    with _outputs_lock:
+        _closing = list(_outputs.values())
+        _outputs.clear()
+
+    for _output in _closing:
+        _output.close()
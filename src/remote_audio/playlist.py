@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+
+import collections
+import threading
+import time as timer
+from typing import BinaryIO, Callable, Iterator, Union
+
+import remote_audio.classes as classes
+from remote_audio.io.pcm import PCMSource
+from remote_audio.stream import DEFAULT_TIMEOUT
+
+"""
+Gapless playback of a sequence of sources on one output stream.
+
+Queueing everything onto a PersistentOutput at once would start decoding all of it at once; a Playlist keeps
+only the current item and the next `preload` ones open, opening more from a background thread as items finish.
+The next item is thus already being decoded into its StreamIO while the current one plays, and the SourceQueue of
+the output carries on into it within the same buffer, without a single frame of silence in between;
+or, with a `crossfade`, overlaps the two.
+"""
+
+DEFAULT_PRELOAD = 1             # Items opened and decoding ahead of the one playing
+FEED_INTERVAL = 0.05            # Seconds between checks of the item playing, for items added or skipped meanwhile
+
+
+class PlaylistItem():
+    """
+    One entry of a Playlist, opened only when it is due to be preloaded.
+
+    `kind` is "file", "http" or "bytes", as in `remote_audio.classes.open_source`; or None if `source` is already WAV data.
+    Once opened, .pcm_source is the PCMSource queued onto the output; if it could not be opened, .error is why.
+    """
+
+    def __init__(
+        self,
+        kind:Union[
+            str,
+            None,
+        ],
+        source:Union[
+            BinaryIO,
+            str,
+            bytes,
+        ],
+        gain:float = 1.0,
+        **kwargs,
+    )->None:
+        self.kind = kind
+        self.source = source
+        self.gain = gain
+        self.kwargs = kwargs
+
+        self.pcm_source = None
+        self.error = None
+        self.cancelled = False
+
+        # Set once opened, failed or cancelled
+        self.opened = threading.Event()
+
+    def __repr__(
+        self,
+    )->str:
+        _source = f"{len(self.source):,} bytes" if (isinstance(self.source, bytes)) else repr(self.source)
+        return f"{type(self).__name__}(kind={repr(self.kind)}, source={_source}, opened={self.opened.is_set()}, finished={self.finished})"
+
+    @property
+    def finished(
+        self,
+    )->bool:
+        if (self.pcm_source is not None):
+            return self.pcm_source.finished
+
+        return self.error is not None or self.cancelled
+
+    def stop(
+        self,
+    )->None:
+        """
+        Stop the item if playing, or drop it if not yet.
+        """
+        self.cancelled = True
+        self.opened.set()
+
+        if (self.pcm_source is not None):
+            self.pcm_source.stop()
+
+    def wait(
+        self,
+        timeout:float = None,
+    )->bool:
+        """
+        Block until this item had finished playing, failed or been stopped. Returns False if timed out.
+        """
+        _start = timer.perf_counter()
+
+        if (not self.opened.wait(timeout)):
+            return False
+
+        if (self.pcm_source is None):
+            return True
+
+        return self.pcm_source.wait(None if (timeout is None) else max(0, timeout - (timer.perf_counter() - _start)))
+
+
+class Playlist():
+    """
+    Plays items one after the other on a PersistentOutput, gaplessly.
+
+    Usage:
+    ```
+    with _device.playlist() as _playlist:
+        _playlist.add_file("intro.mp3")
+        _playlist.add_http("https://somedomain.com/track.mp3")
+        _playlist.add_file("outro.flac")
+    ```
+    Leaving the `with` block waits for everything added to finish, unless `exit_interrupt`.
+
+    Everything is decoded by FFmpeg into the format of the output; WAV data, e.g. from .add(), has to be in it already.
+    Items that cannot be opened are skipped, with .error set.
+
+    If `crossfade` is given, it sets the crossfade of the output's SourceQueue, in seconds; see `output.SourceQueue`.
+    As the output can be shared, it applies to everything queued onto it, and stays after the Playlist is closed.
+    A crossfade needs the next item queued before the current one reaches it, so `preload` is at least 1 then.
+    """
+
+    def __init__(
+        self,
+        output:"remote_audio.output.PersistentOutput",
+        preload:int = DEFAULT_PRELOAD,
+        timeout:float = DEFAULT_TIMEOUT,
+        crossfade:float = None,
+        start:bool = True,
+        exit_interrupt:bool = False,
+    )->None:
+        self.output = output
+        self.preload = max(preload, 1 if (crossfade) else 0)
+        self.timeout = timeout
+        self.exit_interrupt = exit_interrupt
+
+        if (crossfade is not None):
+            self.output.queue.crossfade = crossfade
+
+        self.pending = collections.deque()      # Items not yet opened
+        self.playing = collections.deque()      # Items opened and queued onto the output, not yet finished
+        self.lock = threading.Lock()
+
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopped = threading.Event()
+        self._feed_thread = None
+
+        if (start):
+            self.start()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(output={repr(self.output)}, playing={len(self.playing)}, pending={len(self.pending)}, preload={self.preload})"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if (not self.exit_interrupt):
+            self.wait()
+
+        self.close()
+
+    def __len__(
+        self,
+    )->int:
+        """
+        Items not yet finished, including the one playing.
+        """
+        with self.lock:
+            return len(self.pending) + sum(1 for _item in self.playing if not _item.finished)
+
+    def __iter__(
+        self,
+    )->Iterator[PlaylistItem]:
+        with self.lock:
+            return iter(list(self.playing) + list(self.pending))
+
+    @property
+    def current(
+        self,
+    )->Union[
+        PlaylistItem,
+        None,
+    ]:
+        """
+        The item playing, or the next one to play if the output is between items.
+        """
+        with self.lock:
+            for _item in self.playing:
+                if (not _item.finished):
+                    return _item
+
+        return None
+
+    @property
+    def idle(
+        self,
+    )->bool:
+        return self._idle.is_set()
+
+    def _add(
+        self,
+        item:PlaylistItem,
+    )->PlaylistItem:
+        with self.lock:
+            self.pending.append(item)
+            self._idle.clear()
+
+        self._wake.set()
+
+        return item
+
+    def add(
+        self,
+        io:Union[
+            BinaryIO,
+            str,
+        ],
+        bytes_total:Union[
+            int,
+            "remote_audio.io.base_io.StreamIO",
+            None,
+        ] = None,
+        gain:float = 1.0,
+    )->PlaylistItem:
+        """
+        Add WAV data, e.g. a StreamIO, in the format of the output.
+        """
+        return self._add(
+            PlaylistItem(
+                None,
+                io,
+                gain = gain,
+                bytes_total = bytes_total,
+            )
+        )
+
+    def add_file(
+        self,
+        path:str,
+        format:str = None,
+        gain:float = 1.0,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
+    )->PlaylistItem:
+        """
+        Add a local audio file. See `audio.play_file`.
+        """
+        return self._add(
+            PlaylistItem(
+                "file",
+                path,
+                gain = gain,
+                format = format,
+                callback = callback,
+                start_at = start_at,
+                end_at = end_at,
+            )
+        )
+
+    def add_http(
+        self,
+        url:str,
+        format:str = None,
+        gain:float = 1.0,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+        start_at:Union[float, str] = None,
+        end_at:Union[float, str] = None,
+    )->PlaylistItem:
+        """
+        Add an audio file over HTTP. See `audio.play_http`.
+        """
+        return self._add(
+            PlaylistItem(
+                "http",
+                url,
+                gain = gain,
+                format = format,
+                callback = callback,
+                start_at = start_at,
+                end_at = end_at,
+            )
+        )
+
+    def add_bytes(
+        self,
+        data:bytes,
+        format:str,
+        gain:float = 1.0,
+        callback:Callable[["remote_audio.io.ffmpeg.command.FFmpegCommand", int], None] = None,
+    )->PlaylistItem:
+        """
+        Add audio data already in memory. See `audio.play_bytes`.
+        """
+        return self._add(
+            PlaylistItem(
+                "bytes",
+                data,
+                gain = gain,
+                format = format,
+                callback = callback,
+            )
+        )
+
+    def _open(
+        self,
+        item:PlaylistItem,
+    )->None:
+        """
+        Open `item` and queue it onto the output; FFmpeg starts decoding it straight away.
+        """
+        try:
+            if (item.kind is None):
+                _io = item.source
+                _bytes_total = item.kwargs.get("bytes_total", None)
+            else:
+                _io = classes.open_source(
+                    kind = item.kind,
+                    source = item.source,
+                    sample_rate = self.output.sample_rate,
+                    channels = self.output.channels,
+                    **item.kwargs,
+                )
+                _bytes_total = None
+
+            if (not isinstance(_io, Exception)):
+                _io = self.output.play(
+                    io = _io,
+                    bytes_total = _bytes_total,
+                    timeout = self.timeout,
+                    gain = item.gain,
+                )
+        except Exception as e:
+            # Anything raised here would end the feeder thread, and with it the whole Playlist
+            _io = e
+
+        try:
+            if (isinstance(_io, Exception)):
+                item.error = _io
+            else:
+                item.pcm_source = _io
+
+                if (item.cancelled):
+                    # Stopped while being opened
+                    _io.stop()
+        finally:
+            item.opened.set()
+
+    def _feed(
+        self,
+    )->None:
+        """
+        Keep the item playing and the next `preload` ones opened, until closed.
+        """
+        while (not self._stopped.is_set()):
+            self._wake.clear()
+
+            with self.lock:
+                while (self.playing and self.playing[0].finished):
+                    self.playing.popleft()
+
+                _due = []
+                while (self.pending and len(self.playing) + len(_due) < 1 + self.preload):
+                    _due.append(self.pending.popleft())
+
+                self.playing.extend(_due)
+
+            # Opening can take a while, e.g. for HTTP; not holding the lock meanwhile.
+            # Only this thread opens items, so they are queued onto the output in order.
+            for _item in _due:
+                if (not _item.cancelled):
+                    self._open(_item)
+
+            with self.lock:
+                _head = self.playing[0] if (self.playing) else None
+
+                if (_head is None and not self.pending):
+                    self._idle.set()
+
+            if (_head is None):
+                self._wake.wait()
+            elif (not _head.finished):
+                _head.pcm_source.wait(FEED_INTERVAL)
+
+    def start(
+        self,
+    )->None:
+        if (self._feed_thread is None):
+            self._feed_thread = threading.Thread(
+                target = self._feed,
+                name = type(self).__name__,
+                daemon = True,
+            )
+            self._feed_thread.start()
+
+    def skip(
+        self,
+    )->Union[
+        PlaylistItem,
+        None,
+    ]:
+        """
+        Stop the item playing; the next one carries on from the next buffer. Returns the item skipped.
+        """
+        _item = self.current
+
+        if (_item is not None):
+            _item.stop()
+            self._wake.set()
+
+        return _item
+
+    def clear(
+        self,
+    )->None:
+        """
+        Stop the item playing and drop everything else; the Playlist can still be added to.
+        """
+        with self.lock:
+            _items = list(self.playing) + list(self.pending)
+            self.pending.clear()
+
+        for _item in _items:
+            _item.stop()
+
+        self._wake.set()
+
+    def wait(
+        self,
+        timeout:float = None,
+    )->bool:
+        """
+        Block until everything added had finished playing. Returns False if timed out.
+        """
+        return self._idle.wait(timeout)
+
+    def close(
+        self,
+    )->None:
+        """
+        Stop everything and the background thread. The output itself is left open.
+        """
+        self.clear()
+        self._stopped.set()
+        self._wake.set()
+
+        if (self._feed_thread is not None and self._feed_thread is not threading.current_thread()):
+            self._feed_thread.join()
+
+        self._idle.set()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+from remote_audio import api
+from remote_audio import device_cache
+
+"""
+One-pass index of all PortAudio devices.
+
+Enumerating devices through PortAudio is expensive - resolving the host API signature of a single device
+alone takes a linear probe through its host API. A DeviceSnapshot walks every host API once,
+and answers all subsequent queries from memory until PortAudio is re-initialised through `api.refresh()`.
+
+Snapshots are also saved to disk by `device_cache`; a new process answers its first queries from there,
+while PortAudio is scanned in the background to revalidate it.
+"""
+
+
+class DeviceSnapshot():
+    """
+    Immutable view of all devices known to a PyAudio handle at the time of the scan.
+
+    - `devices`: device_index -> device info dict, as returned by PyAudio
+    - `signatures`: device_index -> (host_api_index, host_api_device_index)
+    - `default_output_index` / `default_input_index`: None if there is no such default
+    - `host_apis`: names of the host APIs, by host_api_index
+    - `pya`: the PyAudio handle scanned; None if loaded from the on-disk cache
+    """
+
+    def __init__(
+        self,
+        devices:Dict[int, Dict[str, Any]],
+        signatures:Dict[int, Tuple[int, int]],
+        default_output_index:int = None,
+        default_input_index:int = None,
+        host_apis:Iterable[str] = (),
+        pya:"pyaudio.PyAudio" = None,
+    )->None:
+        self.devices = devices
+        self.signatures = signatures
+        self.default_output_index = default_output_index
+        self.default_input_index = default_input_index
+        self.host_apis = tuple(host_apis)
+        self.pya = pya
+
+        self.by_signature = {
+            _signature:_device_index \
+                for _device_index, _signature in signatures.items()
+        }
+        self.names = tuple(
+            (_device_index, _info.get("name") or "") \
+                for _device_index, _info in devices.items()
+        )
+
+        self._name_matches = {}
+        self._name_matches_lock = threading.Lock()
+
+    def __repr__(
+        self,
+    )->str:
+        return f"{type(self).__name__}(devices={len(self.devices)}, default_output_index={self.default_output_index}, default_input_index={self.default_input_index})"
+
+    def __eq__(
+        self,
+        other:"DeviceSnapshot",
+    )->bool:
+        if (isinstance(other, DeviceSnapshot)):
+            return self.to_dict() == other.to_dict()
+        else:
+            return NotImplemented
+
+    def __len__(
+        self,
+    )->int:
+        return len(self.devices)
+
+    def __contains__(
+        self,
+        device_index:int,
+    )->bool:
+        return device_index in self.devices
+
+    @classmethod
+    def scan(
+        cls,
+        pya:"pyaudio.PyAudio" = None,
+    )->"DeviceSnapshot":
+        """
+        Walk all host APIs of `pya` once to build a snapshot.
+        """
+
+        if (pya is None):
+            pya = api.get_pya()
+
+        _devices = {}
+        _signatures = {}
+        _host_apis = []
+
+        for _host_api_index in range(pya.get_host_api_count()):
+            try:
+                _host_api_info = pya.get_host_api_info_by_index(_host_api_index)
+            except OSError as e:
+                _host_apis.append(None)
+                continue
+
+            _host_apis.append(_host_api_info.get("name", None))
+
+            for _host_api_device_index in range(_host_api_info.get("deviceCount", 0)):
+                try:
+                    _device_info = pya.get_device_info_by_host_api_device_index(
+                        host_api_index=_host_api_index,
+                        host_api_device_index=_host_api_device_index,
+                    )
+                except OSError as e:
+                    continue
+
+                _devices[_device_info.get("index")] = _device_info
+                _signatures[_device_info.get("index")] = (_host_api_index, _host_api_device_index)
+
+        # Any device that no host API claims
+        for _device_index in range(pya.get_device_count()):
+            if (_device_index not in _devices):
+                try:
+                    _devices[_device_index] = pya.get_device_info_by_index(_device_index)
+                except OSError as e:
+                    pass
+
+        return cls(
+            devices = dict(sorted(_devices.items())),
+            signatures = _signatures,
+            default_output_index = cls._get_default_index(pya.get_default_output_device_info),
+            default_input_index = cls._get_default_index(pya.get_default_input_device_info),
+            host_apis = _host_apis,
+            pya = pya,
+        )
+
+    def to_dict(
+        self,
+    )->Dict[str, Any]:
+        """
+        JSON serialisable form of the snapshot, for `device_cache`.
+        """
+        return {
+            "devices":              [ _info for _info in self.devices.values() ],
+            "signatures":           { str(_device_index):list(_signature) for _device_index, _signature in self.signatures.items() },
+            "default_output_index": self.default_output_index,
+            "default_input_index":  self.default_input_index,
+            "host_apis":            list(self.host_apis),
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data:Dict[str, Any],
+    )->Union[
+        "DeviceSnapshot",
+        None,
+    ]:
+        """
+        Rebuild a snapshot from `.to_dict()`. Returns None if `data` is malformed.
+        """
+        try:
+            return cls(
+                devices = { int(_info["index"]):_info for _info in data["devices"] },
+                signatures = { int(_device_index):tuple(_signature) for _device_index, _signature in data["signatures"].items() },
+                default_output_index = data.get("default_output_index"),
+                default_input_index = data.get("default_input_index"),
+                host_apis = data.get("host_apis", ()),
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return None
+
+    @staticmethod
+    def _get_default_index(
+        getter:Callable[[], Dict[str, Any]],
+    )->Union[
+        int,
+        None,
+    ]:
+        try:
+            return getter().get("index")
+        except (OSError, IOError) as e:
+            # [Errno -9996] No Default Output/Input Device Available
+            return None
+
+    def get_info(
+        self,
+        device_index:int,
+    )->Union[
+        Dict[str, Any],
+        None,
+    ]:
+        return self.devices.get(device_index, None)
+
+    def get_signature(
+        self,
+        device_index:int,
+    )->Union[
+        Tuple[int, int],
+        None,
+    ]:
+        return self.signatures.get(device_index, None)
+
+    def get_device_index(
+        self,
+        host_api_index:int,
+        host_api_device_index:int,
+    )->Union[
+        int,
+        None,
+    ]:
+        return self.by_signature.get((host_api_index, host_api_device_index), None)
+
+    def match_name(
+        self,
+        name:Union[
+            re.Pattern,
+            str,
+            None,
+        ],
+    )->Tuple[int]:
+        """
+        Indices of all devices with names matching `name`, in device_index order.
+
+        A str matches case-insensitively anywhere in the name; a re.Pattern has to .match() the name.
+        Results are cached per snapshot, so repeated lookups are free.
+        """
+
+        if (name is None):
+            return tuple(self.devices)
+
+        _key = name.lower() if isinstance(name, str) else name
+
+        _matches = self._name_matches.get(_key, None)
+
+        if (_matches is None):
+            if (isinstance(name, str)):
+                # If its an empty string, this will return everything
+                _matches = tuple(
+                    _device_index \
+                        for _device_index, _name in self.names \
+                            if _key in _name.lower()
+                )
+            elif (isinstance(name, re.Pattern)):
+                _matches = tuple(
+                    _device_index \
+                        for _device_index, _name in self.names \
+                            if name.match(_name)
+                )
+            else:
+                _matches = ()
+
+            with self._name_matches_lock:
+                self._name_matches[_key] = _matches
+
+        return _matches
+
+    def find(
+        self,
+        input:bool = False,
+        output:bool = True,
+        name:Union[
+            re.Pattern,
+            str,
+        ] = None,
+    )->Iterable[int]:
+        """
+        Indices of all devices fitting the criteria, with the same semantics as `AudioDevice.find`.
+        """
+        for _device_index in self.match_name(name):
+            _info = self.devices[_device_index]
+
+            if (input and not _info.get("maxInputChannels")): continue
+            if (output and not _info.get("maxOutputChannels")): continue
+
+            yield _device_index
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+revalidated = threading.Event()
+
+def _load_cached()->Union[
+    DeviceSnapshot,
+    None,
+]:
+    _data = device_cache.load()
+
+    if (_data is not None):
+        return DeviceSnapshot.from_dict(_data)
+
+    return None
+
+def _scan(
+    pya:"pyaudio.PyAudio",
+)->DeviceSnapshot:
+    """
+    Scan PortAudio and save the result for the next process.
+    """
+    _scanned = DeviceSnapshot.scan(pya)
+    device_cache.save(_scanned.to_dict())
+
+    return _scanned
+
+def revalidate()->DeviceSnapshot:
+    """
+    Replace the current snapshot with a fresh scan of PortAudio, initialising it if necessary,
+    and update the on-disk cache.
+
+    Devices found through a cached snapshot keep their indices as long as the audio configuration had not changed;
+    if it had, the fingerprint would not have matched in the first place.
+    """
+
+    global _snapshot
+
+    _pya = api.get_pya()
+
+    with _snapshot_lock:
+        if (_snapshot is None or _snapshot.pya is not _pya):
+            _snapshot = _scan(_pya)
+
+        revalidated.set()
+
+        return _snapshot
+
+def _revalidate_in_background()->None:
+    try:
+        revalidate()
+    except OSError as e:
+        # PortAudio could not be initialised; keep using the cached snapshot
+        revalidated.set()
+
+def get_snapshot(
+    use_cache:bool = True,
+)->DeviceSnapshot:
+    """
+    Get the DeviceSnapshot of the current PyAudio handle, scanning on first use.
+
+    A new scan is only done when the PyAudio handle had changed, i.e. after `api.refresh()`.
+
+    If PortAudio had not yet been initialised and `use_cache` is True, a snapshot from the on-disk cache is returned
+    straight away when available, while PortAudio is initialised and scanned in a background thread;
+    see `revalidated` to wait for it.
+
+    Thread-safe.
+    """
+
+    global _snapshot
+
+    _current = _snapshot
+
+    if (_current is not None):
+        if (_current.pya is None):
+            # From disk, revalidation under way
+            return _current
+        elif (api.is_initialised() and _current.pya is api.get_pya()):
+            return _current
+
+    with _snapshot_lock:
+        if (_snapshot is None and use_cache and not api.is_initialised()):
+            _snapshot = _load_cached()
+
+            if (_snapshot is not None):
+                revalidated.clear()
+                threading.Thread(
+                    target = _revalidate_in_background,
+                    name = "DeviceSnapshotRevalidation",
+                    daemon = True,
+                ).start()
+
+                return _snapshot
+
+        _pya = api.get_pya()
+
+        if (_snapshot is None or _snapshot.pya is not _pya):
+            _snapshot = _scan(_pya)
+            revalidated.set()
+
+        return _snapshot
+
+def invalidate()->None:
+    """
+    Discard the current snapshot; the next `get_snapshot()` scans again.
+    """
+
+    global _snapshot
+
+    with _snapshot_lock:
+        _snapshot = None
@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 
+from enum import Enum
+import threading
 import time as timer
 import warnings
-from typing import Any, Union
+from typing import Any, Callable, Iterable, Union
 
 
-import pyaudio
-
 import remote_audio
+from remote_audio import api
+from remote_audio import metrics
+from remote_audio.exceptions import InvalidInputParameters
 
 DEFAULT_TIMEOUT = 5
+FADE_TIMEOUT_MARGIN = 0.5       # Seconds to wait for a fade out beyond its duration, for the buffers in between
+
+
+class PlaybackEngine(Enum):
+    CALLBACK = "callback"       # PortAudio calls back into Python for every buffer
+    BLOCKING = "blocking"       # A writer thread pushes larger blocks with blocking writes
 
 
 class StreamStatus():
@@ -26,6 +35,7 @@ class StreamStatus():
             int,
             "remote_audio.io.base_io.StreamIO",
         ]=None,
+        sample_rate:int=None,
     ):
         self.set(True)
 
@@ -33,6 +43,9 @@ class StreamStatus():
         self.bytes_total = bytes_total if bytes_total else (self.io if isinstance(self.io, remote_audio.io.base_io.StreamIO) else None)
         self.bytes_played = 0
 
+        # Flags, callback timings and latencies; see remote_audio.metrics
+        self.metrics = metrics.StreamMetrics(sample_rate=sample_rate)
+
         if (self.bytes_total is None and timeout is None):
             warnings.warn(
                 RuntimeWarning(
@@ -87,6 +100,24 @@ class StreamStatus():
         if (bytes_count>0):
             self.update_last_data()
 
+    @property
+    def stats(
+        self,
+    )->"metrics.StreamStats":
+        """
+        Snapshot of .metrics; str() it for a log line.
+        """
+        return self.metrics.stats()
+
+    @property
+    def xruns(
+        self,
+    )->int:
+        """
+        Output underflows seen so far; a view of .metrics.output_underflows.
+        """
+        return self.metrics.output_underflows
+
     @property
     def completed(
         self
@@ -180,14 +211,19 @@ class AudioStream():
 
     Or:
     Use it with .start() and .stop() manually.
+
+    If the stream has a `gain_stage`, its volume can be changed through .gain while playing,
+    and it fades out before being stopped or seeked if it was started with a fade.
     """
 
     def __init__(
         self,
-        stream:pyaudio.Stream,
+        stream:"pyaudio.Stream",
         timeout:float=None,
         stream_status:StreamStatus=None,
         exit_interrupt:bool=False,
+        gain_stage:"remote_audio.dsp.GainStage"=None,
+        wave_read:"wave.Wave_read"=None,
     ):
         self.stream = stream
         self.timeout = timeout
@@ -196,6 +232,9 @@ class AudioStream():
 
         self.exit_interrupt = exit_interrupt
 
+        self.gain_stage = gain_stage
+        self.wave_read = wave_read
+
     def __bool__(self):
         return self.stream_status
     __nonzero__ = __bool__
@@ -214,6 +253,7 @@ class AudioStream():
                 # Wait it out if stream hasn't finished by end of context
                 timer.sleep(0.1)
 
+            self.fade_out()
             self.stream_status.set(False)
 
         except OSError as e:
@@ -226,12 +266,225 @@ class AudioStream():
         self.stream.start_stream()
 
     def stop(self):
+        self.fade_out()
+
         try:
-            self.stream.stop_stream()
-            self.stream.close()
+            api.close_stream(self.stream)
         except OSError as e:
             pass
 
+        if (self.wave_read is not None):
+            # Closes the file if it was opened from a path
+            self.wave_read.close()
+
+    @property
+    def gain(
+        self,
+    )->float:
+        return self.gain_stage.gain if (self.gain_stage is not None) else 1.0
+
+    @gain.setter
+    def gain(
+        self,
+        value:float,
+    )->None:
+        if (self.gain_stage is None):
+            raise InvalidInputParameters(f"Gain is not supported for {self.wave_read.getsampwidth()*8 if self.wave_read else 'this'}-bit audio.")
+
+        self.gain_stage.gain = value
+
+    @property
+    def _processing(
+        self,
+    )->bool:
+        """
+        Whether the gain stage is being fed chunks, so that it can act on them.
+        """
+        try:
+            return bool(
+                self.gain_stage is not None and \
+                self.stream_status and \
+                self.stream.is_active()
+            )
+        except OSError as e:
+            # Stream had been closed
+            return False
+
+    def fade_out(
+        self,
+        timeout:float=None,
+    )->bool:
+        """
+        Fade to silence and wait until the silence had been handed to the device.
+        Does nothing unless the stream was started with a fade and is playing.
+
+        Returns whether the stream is silent.
+        """
+        if (not self._processing or not self.gain_stage.fade):
+            return False
+
+        self.gain_stage.fade_out()
 
+        return self.gain_stage.silent.wait(
+            timeout if (timeout is not None) else self.gain_stage.fade + FADE_TIMEOUT_MARGIN
+        )
+
+    def seek(
+        self,
+        position:float,
+    )->Union[
+        None,
+        InvalidInputParameters,
+    ]:
+        """
+        Continue playback from `position` seconds into the source; with a fade, it fades out and back in around the jump.
+
+        Only seekable sources can be seeked, e.g. files; not StreamIOs, which may be still being written into,
+        or had their played data discarded.
+        """
+        _io = getattr(self.stream_status, "io", None)
+
+        if (
+            self.wave_read is None or \
+            isinstance(_io, remote_audio.io.base_io.StreamIO) or \
+            not (isinstance(_io, str) or getattr(_io, "seekable", lambda: False)())
+        ):
+            return InvalidInputParameters("Only streams playing from seekable sources, e.g. files, can be seeked.")
 
+        _frame = int(position * self.wave_read.getframerate())
+
+        if (not 0 <= _frame <= self.wave_read.getnframes()):
+            return InvalidInputParameters(
+                f"Position {position}s is outside of the source, which is {self.wave_read.getnframes()/self.wave_read.getframerate():.2f}s long."
+            )
+
+        def _seek()->None:
+            self.wave_read.setpos(_frame)
+            self.stream_status.bytes_played = _frame * self.wave_read.getnchannels() * self.wave_read.getsampwidth()
+
+        if (self._processing):
+            # Repositioned by the thread reading the source, before it reads the first chunk after the fade out;
+            # that chunk is then faded in from the new position
+            def _seek_and_fade_in()->None:
+                _seek()
+                self.gain_stage.fade_in()
+
+            self.gain_stage.fade_out(callback=_seek_and_fade_in)
+        else:
+            _seek()
 
+
+class BlockingAudioStream(AudioStream):
+    """
+    AudioStream wrapper for blocking pyaudio.Stream objects.
+
+    Instead of PortAudio calling back into Python on its real-time thread for every buffer,
+    a writer thread pushes larger blocks with blocking writes, so that the GIL is only needed once per block.
+    Behaves like AudioStream otherwise.
+    """
+
+    def __init__(
+        self,
+        stream:"pyaudio.Stream",
+        writer:Callable[["pyaudio.Stream"], None],
+        timeout:float=None,
+        stream_status:StreamStatus=None,
+        exit_interrupt:bool=False,
+        **kwargs,
+    ):
+        super().__init__(
+            stream,
+            timeout=timeout,
+            stream_status=stream_status,
+            exit_interrupt=exit_interrupt,
+            **kwargs,
+        )
+
+        self.writer = writer
+        self.thread = None
+
+    def start(self):
+        if (self.thread is None):
+            self.stream.start_stream()
+
+            self.thread = threading.Thread(
+                target=self.writer,
+                args=(self.stream,),
+                name=type(self).__name__,
+                daemon=True,
+            )
+            self.thread.start()
+
+    def stop(self):
+        self.fade_out()
+
+        # The writer thread exits after its current block
+        self.stream_status.set(False)
+
+        if (self.thread is not None and self.thread is not threading.current_thread()):
+            self.thread.join()
+
+        super().stop()
+
+
+class AudioStreamGroup():
+    """
+    A group of AudioStreams that are started and stopped together,
+    e.g. the same source played on several devices.
+
+    Use it as a context manager like AudioStream:
+            with AudioDevice.start_shared_wav_stream(
+                _io,
+                devices=[_device1, _device2],
+            ) as _streams:
+                pass
+
+    The context only completes when all streams had finished.
+    """
+
+    def __init__(
+        self,
+        streams:Iterable[AudioStream],
+    ):
+        self.streams = list(streams)
+
+    def __bool__(self):
+        # AudioStream.__bool__ returns its StreamStatus, which any() cannot take
+        return any(bool(_stream.stream_status) for _stream in self.streams)
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        return iter(self.streams)
+
+    def __len__(self):
+        return len(self.streams)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        for _stream in self.streams:
+            _stream.__exit__(type, value, traceback)
+
+        self.close_readers()
+
+    def start(self):
+        for _stream in self.streams:
+            _stream.start()
+
+    def stop(self):
+        for _stream in self.streams:
+            _stream.stop()
+
+        self.close_readers()
+
+    def close_readers(self):
+        """
+        Release the StreamIOReaders of the streams, if any,
+        so that the shared source can free its memory.
+        """
+        for _stream in self.streams:
+            _io = getattr(_stream.stream_status, "io", None)
+            if (isinstance(_io, remote_audio.io.base_io.StreamIOReader)):
+                _io.close()
@@ -0,0 +1,63 @@
+import wave
+
+import quicktest as unittest
+
+from remote_audio.audio import create_stream_writer
+from remote_audio.dsp import create_gain_stage
+from remote_audio.io.file import create_wav
+from remote_audio.stream import StreamStatus
+
+
+class FakeBlockingStream():
+    """
+    Records blocking writes; its buffer starts empty, and runs dry again after every `dry_every` writes.
+    """
+    capacity = 4096
+
+    def __init__(self, dry_every:int=0):
+        self.dry_every = dry_every
+        self.writes = []
+
+    def get_write_available(self):
+        if (not self.writes or (self.dry_every and not len(self.writes) % self.dry_every)):
+            return self.capacity
+        else:
+            return 0
+
+    def write(self, data, num_frames=None):
+        # As PyAudio, copy; the writer reuses its buffers
+        self.writes.append(bytes(data))
+
+
+class TestBlockingWriter(unittest.TestCase):
+    def test_writer(self):
+        """
+        Test all data is written in blocks, and dry buffers are counted as xruns.
+        """
+        _wHnd = wave.open(create_wav(b"\x01\x00"*1000, channels=1, sample_rate=8000), "rb")
+        _status = StreamStatus(bytes_total=2000)
+        _stream = FakeBlockingStream(dry_every=2)
+
+        create_stream_writer(_wHnd, _status, block_size=256)(_stream)
+
+        self.assertListEqual([ len(_data) for _data in _stream.writes ], [512, 512, 512, 464])
+        self.assertEqual(b"".join(_stream.writes), b"\x01\x00"*1000)
+        self.assertEqual(_status.xruns, 1)
+        self.assertEqual(_status.stats.output_underflows, 1)
+        self.assertFalse(_status)
+
+    def test_no_dtype(self):
+        """
+        Test 8 and 24-bit data, which has no NumPy dtype, is written up to the last partial block, with a gain.
+        """
+        for _sample_width in (1, 3):
+            _wHnd = wave.open(create_wav((b"\x01" + b"\x00"*(_sample_width-1))*1000, channels=1, sample_width=_sample_width, sample_rate=8000), "rb")
+            _status = StreamStatus(bytes_total=1000*_sample_width)
+            _stream = FakeBlockingStream()
+
+            create_stream_writer(_wHnd, _status, block_size=256, gain_stage=create_gain_stage(1, _sample_width, 8000, gain=0.5))(_stream)
+
+            self.assertEqual(b"".join(_stream.writes), (b"\x01" + b"\x00"*(_sample_width-1))*1000)
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import tracemalloc
+
+import quicktest as unittest
+
+from remote_audio.audio import create_stream_callback
+from remote_audio.buffers import FrameReader
+from remote_audio.io.base_io import StreamIO
+from remote_audio.io.file import create_wav
+from remote_audio.stream import StreamStatus
+
+
+CHUNK_SIZE = 256
+
+# 16-bit stereo frames, where each frame is its own frame number
+PCM_DATA = b"".join(_frame.to_bytes(2, "little")*2 for _frame in range(CHUNK_SIZE*20 + 10))
+
+
+class TestFrameReader(unittest.TestCase):
+    def test_readinto(self):
+        """
+        Test frames are read into the buffer, from a StreamIO reader as from a file, and seeked.
+        """
+        _data = create_wav(PCM_DATA[:100*4], sample_rate=8000).getvalue()
+        _io = StreamIO(_data)
+
+        for _source in (io.BytesIO(_data), _io.reader()):
+            _reader = FrameReader.open(_source)
+            _buffer = bytearray(64*4)
+
+            self.assertEqual(_reader.readinto(memoryview(_buffer)), 64*4)
+            self.assertEqual(bytes(_buffer), _data[44:44+64*4])
+            self.assertEqual(_reader.readinto(memoryview(_buffer)), 36*4)
+            self.assertEqual(_reader.readinto(memoryview(_buffer)), 0)
+
+        _reader = FrameReader.open(io.BytesIO(_data))
+        _reader.setpos(90)
+        self.assertEqual(_reader.readframes(20), _data[44+90*4:])
+
+
+class TestStreamCallback(unittest.TestCase):
+    def test_pooled(self):
+        """
+        Test the callback hands out its pooled buffers, padded, without allocating chunks in steady state.
+        """
+        _data = create_wav(PCM_DATA, sample_rate=8000).getvalue()
+        _callback = create_stream_callback(
+            FrameReader.open(io.BytesIO(_data)),
+            chunk_size = CHUNK_SIZE,
+            stream_status = StreamStatus(timeout=60),
+        )
+
+        _chunks = []
+        _buffers = set()
+        for _ in range(4):
+            _output, _status = _callback(None, CHUNK_SIZE, {}, 0)
+            _chunks.append(bytes(_output))
+            _buffers.add(id(_output))
+
+        self.assertEqual(len(_buffers), 2)
+        self.assertEqual(b"".join(_chunks), _data[44:44+CHUNK_SIZE*4*4])
+
+        tracemalloc.start()
+        _before, _ = tracemalloc.get_traced_memory()
+        for _ in range(10):
+            _callback(None, CHUNK_SIZE, {}, 0)
+        _, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertLess(_peak - _before, CHUNK_SIZE*4)
+
+        for _ in range(7):
+            _output, _status = _callback(None, CHUNK_SIZE, {}, 0)
+
+        # The last 10 frames, then silence
+        self.assertEqual(bytes(_output), _data[-40:] + b"\x00"*(CHUNK_SIZE*4-40))
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import threading
+import time as timer
+
+import quicktest as unittest
+
+from remote_audio.capture import CaptureStream, record, PA_INPUT_OVERFLOW
+from remote_audio.classes import FFmpegEncoderStreamIO
+from remote_audio.null import NullPyAudio
+
+
+def create_microphone(
+    data:bytes = b"",
+    input_channels:int = 1,
+)->NullPyAudio:
+    """
+    A NullPyAudio capturing `data` as fast as it can.
+    """
+    return NullPyAudio(
+        sample_rate = 16000,
+        channels = 1,
+        speed = None,
+        name = "Null Microphone",
+        input_channels = input_channels,
+        source = io.BytesIO(data),
+    )
+
+def wait_captured(
+    pya:NullPyAudio,
+    timeout:float = 5,
+)->None:
+    """
+    Wait for the input stream to run out of data.
+    """
+    _start = timer.perf_counter()
+
+    while (any(_stream.is_active() for _stream in pya.streams) and timer.perf_counter() - _start < timeout):
+        timer.sleep(0.01)
+
+
+class TestCapture(unittest.TestCase):
+    def test_record(self):
+        """
+        Test captured chunks arrive in order as WAV, in the native format of the device.
+        """
+        _data = b"".join(bytes([_i])*64 for _i in range(10))
+        _pya = create_microphone(_data)
+        _capture = record(pya=_pya, chunk_size=32)
+
+        self.assertIsInstance(_capture, CaptureStream)
+        self.assertEqual(_pya.streams[0].rate, 16000)
+
+        wait_captured(_pya)
+        _capture.stop()
+
+        _captured = _capture.io.read()
+        self.assertEqual(_captured[:4], b"RIFF")
+        self.assertEqual(_captured[44:], _data)
+        self.assertEqual(_capture.io.bytes_total, 44+640)
+        self.assertFalse(_capture.recording)
+
+    def test_bounded(self):
+        """
+        Test chunks are dropped rather than queued without bound while the pump is not running, and overflows are counted.
+        """
+        _pya = create_microphone()
+        _capture = record(pya=_pya, max_buffered=4, chunk_size=32, start=False)
+
+        for _i in range(10):
+            _pya.streams[0].stream_callback(b"\x00"*64, 32, {}, PA_INPUT_OVERFLOW if _i == 5 else 0)
+
+        _capture.start()
+        _capture.stop()
+
+        self.assertEqual(_capture.chunks_dropped, 6)
+        self.assertEqual(_capture.bytes_captured, 4*64)
+        self.assertEqual(_capture.input_overflows, 1)
+
+    def test_encode(self):
+        """
+        Test capturing with `format` encodes through FFmpeg, which is told the raw format of the device.
+        """
+        _finished = threading.Event()
+        _pya = create_microphone(b"\x00\x01"*16000)
+        _capture = record(
+            pya = _pya,
+            format = "wav",
+            chunk_size = 1600,
+            callback = lambda command, bytes_total: _finished.set(),
+        )
+
+        self.assertIsInstance(_capture.io, FFmpegEncoderStreamIO)
+
+        _command = _capture.io.get_command().command
+        self.assertListEqual(
+            _command[:_command.index("-i")],
+            ["ffmpeg", "-f", "s16le", "-ar", "16000", "-ac", "1"],
+        )
+
+        wait_captured(_pya)
+        _capture.stop()
+
+        self.assertTrue(_finished.wait(10))
+        self.assertEqual(_capture.bytes_captured, 32000)
+        self.assertEqual(_capture.io.read(4), b"RIFF")
+        self.assertGreater(_capture.io.bytes_total, 32000)
+
+    def test_no_input(self):
+        """
+        Test output-only devices are refused.
+        """
+        self.assertIsInstance(record(pya=create_microphone(input_channels=0)), Exception)
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,60 @@
+import numpy as np
+
+import quicktest as unittest
+
+from remote_audio.dsp import GainStage
+
+
+def constant(value:int, frames:int, channels:int=2)->bytes:
+    return np.full(frames*channels, value, dtype=np.int16).tobytes()
+
+def to_samples(data:bytes, channels:int=2)->np.ndarray:
+    return np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+
+
+class TestGainStage(unittest.TestCase):
+    def test_gain(self):
+        """
+        Test unity gain passes data through untouched, and other gains are applied to all channels with clipping.
+        """
+        _stage = GainStage(channels=2, sample_width=2, sample_rate=8000, fade=0)
+        _data = constant(1000, 16)
+
+        self.assertIs(_stage.process(_data), _data)
+
+        _stage.gain = 0.5
+        self.assertEqual(_stage.process(_data), constant(500, 16))
+
+        _stage.gain = 40
+        self.assertEqual(_stage.process(_data), constant(32767, 16))
+
+    def test_fade(self):
+        """
+        Test fades ramp linearly across chunks, and fade_out() calls back once silent.
+        """
+        # 10 frames of fade
+        _stage = GainStage(channels=2, sample_width=2, sample_rate=1000, fade=0.01)
+        _stage.fade_in()
+
+        _samples = np.concatenate([
+            to_samples(_stage.process(constant(10000, 4))) \
+                for _ in range(4)
+        ])
+
+        self.assertListEqual(_samples[:, 0].tolist(), [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000] + [10000]*6)
+        self.assertTrue((_samples[:, 0] == _samples[:, 1]).all())
+        self.assertFalse(_stage.ramping)
+
+        _called = []
+        _stage.fade_out(callback=lambda: _called.append(_stage.level))
+
+        self.assertEqual(to_samples(_stage.process(constant(10000, 12)))[-1, 0], 0)
+        self.assertFalse(_called)
+        self.assertFalse(_stage.silent.is_set())
+
+        self.assertEqual(_stage.process(constant(10000, 4)), constant(0, 4))
+        self.assertListEqual(_called, [0])
+        self.assertTrue(_stage.silent.is_set())
+
+if (__name__=="__main__"):
+    unittest.main()
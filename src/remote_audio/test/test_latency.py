@@ -0,0 +1,79 @@
+import time as timer
+
+import quicktest as unittest
+
+from remote_audio.exceptions import InvalidInputParameters
+from remote_audio.io.base_io import StreamIO
+from remote_audio.latency import LatencyProfile, get_buffer_settings, get_profile
+
+
+DEVICE_INFO = {
+    "defaultLowOutputLatency": 0.01,
+    "defaultHighOutputLatency": 0.1,
+}
+
+
+class TestLatency(unittest.TestCase):
+    def test_get_profile(self):
+        """
+        Test profiles can be given by name.
+        """
+        self.assertIs(get_profile("low-latency"), LatencyProfile.LOW)
+        self.assertIs(get_profile("Robust"), LatencyProfile.ROBUST)
+        self.assertIsInstance(get_profile("fastest"), InvalidInputParameters)
+
+    def test_buffer_settings(self):
+        """
+        Test buffers grow from LOW to ROBUST, and are powers of two.
+        """
+        _settings = [
+            get_buffer_settings(
+                _profile,
+                device_info=DEVICE_INFO,
+                sample_rate=48000,
+                frame_size=4,
+            ) \
+                for _profile in LatencyProfile
+        ]
+
+        self.assertEqual(_settings[0].frames_per_buffer, 512)
+        self.assertEqual(_settings[0].prebuffer_bytes, 0)
+
+        for _lower, _higher in zip(_settings, _settings[1:]):
+            self.assertLess(_lower.frames_per_buffer, _higher.frames_per_buffer)
+            self.assertLess(_lower.prebuffer_bytes, _higher.prebuffer_bytes)
+
+        for _setting in _settings:
+            self.assertEqual(_setting.frames_per_buffer & (_setting.frames_per_buffer-1), 0)
+            self.assertEqual(_setting.prebuffer_bytes % 4, 0)
+
+    def test_write_jitter(self):
+        """
+        Test StreamIO measures the timing of its writes, and a jittery source is prebuffered more.
+        """
+        _io = StreamIO()
+
+        for _interval in (0.01, 0.03, 0.01, 0.03):
+            _io.write(b"\x00"*16)
+            timer.sleep(_interval)
+        _io.write(b"\x00"*16)
+
+        self.assertGreater(_io.write_interval, 0)
+        self.assertGreater(_io.write_jitter, 0)
+
+        _steady, _jittery = (
+            get_buffer_settings(
+                "balanced",
+                device_info=DEVICE_INFO,
+                sample_rate=48000,
+                frame_size=4,
+                write_interval=0.02,
+                write_jitter=_jitter,
+            ) \
+                for _jitter in (0, 0.1)
+        )
+
+        self.assertLess(_steady.prebuffer_bytes, _jittery.prebuffer_bytes)
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,69 @@
+
+import quicktest as unittest
+
+from remote_audio.io.file import create_wav
+from remote_audio.metrics import PA_OUTPUT_UNDERFLOW, PA_PRIMING_OUTPUT, StreamMetrics
+from remote_audio.null import NullAudioDevice
+
+
+SAMPLE_RATE = 8000
+FRAMES = 2000
+
+
+class TestStreamMetrics(unittest.TestCase):
+    def test_record(self):
+        """
+        Test flags are counted, callbacks bucketed by load, and latencies taken from time_info.
+        """
+        _metrics = StreamMetrics(sample_rate=SAMPLE_RATE, load_edges=(0.5, 1.0))
+
+        # 100 frames at 8kHz is a period of 12.5ms
+        for _flags, _duration in (
+            (0, 0.001),
+            (PA_OUTPUT_UNDERFLOW, 0.010),
+            (PA_OUTPUT_UNDERFLOW | PA_PRIMING_OUTPUT, 0.020),
+        ):
+            _metrics.record_flags(_flags)
+            _metrics.record_time_info({"current_time": 10.0, "output_buffer_dac_time": 10.04})
+            _metrics.record_callback(_duration, 100)
+
+        # Host APIs without timing pass zeros
+        _metrics.record_time_info({"current_time": 0, "output_buffer_dac_time": 0})
+
+        _stats = _metrics.stats()
+
+        self.assertEqual(_stats.callbacks, 3)
+        self.assertEqual(_stats.output_underflows, 2)
+        self.assertEqual(_stats.priming_outputs, 1)
+        self.assertEqual(_stats.load_histogram, (1, 1, 1))
+        self.assertEqual(_stats.late_callbacks, 1)
+        self.assertAlmostEqual(_stats.max_load, 1.6)
+        self.assertAlmostEqual(_stats.callback_time_max, 0.020)
+        self.assertAlmostEqual(_stats.output_latency_mean, 0.04)
+        self.assertTrue(_stats.glitches_from_callback)
+        self.assertIn("late=1", str(_stats))
+
+        _metrics.reset()
+        self.assertEqual(_metrics.stats().callbacks, 0)
+        self.assertIsNone(_metrics.stats().output_latency)
+
+    def test_stream(self):
+        """
+        Test a stream records every callback into its StreamStatus.
+        """
+        _buffer = create_wav(b"\x00\x10"*FRAMES, channels=1, sample_rate=SAMPLE_RATE)
+
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None)
+
+        with _device.start_wav_stream(_buffer, bytes_total=FRAMES*2, chunk_size=250, frames_per_buffer=250) as _stream:
+            pass
+
+        _stats = _stream.stream_status.stats
+
+        self.assertGreaterEqual(_stats.callbacks, FRAMES // 250)
+        self.assertEqual(sum(_stats.load_histogram), _stats.callbacks)
+        self.assertEqual(_stats.output_underflows, _stream.stream_status.xruns)
+
+
+if (__name__=="__main__"):
+    unittest.main()
@@ -0,0 +1,128 @@
+import numpy as np
+
+import quicktest as unittest
+
+from remote_audio.mixer import ClippingMode, Mixer, apply_gain, crossfade
+
+
+class ConstantSource():
+    """
+    A 16-bit mono source of `frames` frames, all of `value`.
+    """
+    channels = 1
+    sample_width = 2
+    sample_rate = 8000
+
+    def __init__(self, value, frames):
+        self.value = value
+        self.frames = frames
+        self.finished = False
+
+    def read(self, frame_count):
+        _frames = min(frame_count, self.frames)
+        self.frames -= _frames
+        self.finished = not self.frames
+
+        return np.full(_frames, self.value, dtype=np.int16).tobytes()
+
+
+def to_samples(data:bytes)->list:
+    return np.frombuffer(data, dtype=np.int16).tolist()
+
+
+class TestMixer(unittest.TestCase):
+    def test_mix(self):
+        """
+        Test voices are summed with their gains, and dropped once finished.
+        """
+        _mixer = Mixer(channels=1, sample_width=2, sample_rate=8000)
+
+        _mixer.add(ConstantSource(1000, 2))
+        _mixer.add(ConstantSource(-300, 4), gain=0.5)
+
+        self.assertListEqual(to_samples(_mixer.render(3)), [850, 850, -150])
+        self.assertEqual(len(_mixer), 1)
+
+        self.assertListEqual(to_samples(_mixer.render(3)), [-150, 0, 0])
+        self.assertEqual(len(_mixer), 0)
+
+        self.assertEqual(_mixer.render(2), b"\x00"*4)
+
+    def test_passthrough(self):
+        """
+        Test a single voice at unity gain is returned as is.
+        """
+        _mixer = Mixer(channels=1, sample_width=2, sample_rate=8000)
+        _mixer.add(ConstantSource(12345, 10))
+
+        self.assertListEqual(to_samples(_mixer.render(4)), [12345]*4)
+
+    def test_clipping(self):
+        """
+        Test overflowing sums are clipped rather than wrapped around.
+        """
+        _mixer = Mixer(channels=1, sample_width=2, sample_rate=8000)
+
+        for _ in range(3):
+            _mixer.add(ConstantSource(20000, 10))
+
+        self.assertListEqual(to_samples(_mixer.render(2)), [32767]*2)
+
+        _mixer.clipping = ClippingMode.SOFT
+        _sample = to_samples(_mixer.render(1))[0]
+        self.assertLess(_sample, 32767)
+        self.assertGreater(_sample, 32767*0.75)
+
+        self.assertListEqual(to_samples(apply_gain(np.array([-20000, 100], dtype=np.int16).tobytes(), 2, 2)), [-32768, 200])
+
+        # Wrapped as int16 addition would, rather than left to an undefined cast
+        _mixer.clipping = ClippingMode.NONE
+        self.assertListEqual(to_samples(_mixer.render(2)), [(60000 + 32768) % 65536 - 32768]*2)
+
+    def test_reuse(self):
+        """
+        Test working buffers carry nothing over between renders of different lengths.
+        """
+        _mixer = Mixer(channels=1, sample_width=2, sample_rate=8000)
+        _mixer.add(ConstantSource(1000, 100), gain=0.5)
+        _mixer.add(ConstantSource(1000, 3))
+
+        self.assertListEqual(to_samples(_mixer.render(4)), [1500]*3 + [500])
+        self.assertListEqual(to_samples(_mixer.render(2)), [500]*2)
+        self.assertListEqual(to_samples(_mixer.render(8)), [500]*8)
+
+    def test_crossfade(self):
+        """
+        Test crossfades follow equal-power curves, continuing across calls, and pad a short incoming source.
+        """
+        _outgoing = np.full(8, 10000, dtype=np.int16).tobytes()
+        _incoming = np.full(8, 10000, dtype=np.int16).tobytes()
+
+        _whole = to_samples(crossfade(_outgoing, _incoming, 0, 8, channels=1, sample_width=2))
+        _parts = to_samples(crossfade(_outgoing[:6], _incoming[:6], 0, 8, channels=1, sample_width=2)) + \
+            to_samples(crossfade(_outgoing[6:], _incoming[6:], 3, 8, channels=1, sample_width=2))
+
+        self.assertListEqual(_whole, _parts)
+
+        _out = np.array(to_samples(crossfade(_outgoing, b"", 0, 8, channels=1, sample_width=2))) / 10000
+        _in = np.array(to_samples(crossfade(np.zeros(8, dtype=np.int16).tobytes(), _incoming, 0, 8, channels=1, sample_width=2))) / 10000
+
+        np.testing.assert_allclose(_out**2 + _in**2, 1, atol=1e-3)
+        self.assertTrue(np.all(np.diff(_out) < 0))
+        self.assertGreater(_in[-1], 0.99)
+
+        # Stereo, with the gains of the sources
+        _stereo = crossfade(np.full(2, 1000, dtype=np.int16).tobytes(), b"", 1, 2, channels=2, sample_width=2, outgoing_gain=2)
+        self.assertListEqual(to_samples(_stereo), [round(2000*np.cos(np.pi*3/8))]*2)
+
+    def test_format(self):
+        """
+        Test sources in a different format are refused.
+        """
+        _mixer = Mixer(channels=2, sample_width=2, sample_rate=8000)
+
+        self.assertIsInstance(_mixer.add(ConstantSource(1, 1)), Exception)
+
+
+if (__name__=="__main__"):
+    unittest.main()
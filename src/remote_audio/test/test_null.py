@@ -0,0 +1,211 @@
+import io
+import os
+import tempfile
+import time as timer
+import wave
+
+import numpy as np
+
+import quicktest as unittest
+
+from remote_audio.audio import start_shared_wav_stream
+from remote_audio.exceptions import InvalidInputParameters
+from remote_audio.io.pcm import BytesPCMSink
+from remote_audio.io.base_io import StreamIO
+from remote_audio.io.file import create_wav
+from remote_audio.null import FileAudioDevice, NullAudioDevice
+
+
+SAMPLE_RATE = 8000
+FRAMES = 4000
+
+
+# 16-bit mono, FRAMES long
+WAV_DATA = create_wav(bytes(range(256))*(FRAMES*2//256) + b"\x00"*(FRAMES*2%256), channels=1, sample_rate=SAMPLE_RATE).getvalue()
+
+
+class TestNullAudioDevice(unittest.TestCase):
+    def test_callback(self):
+        """
+        Test the callback engine plays everything, at the pace of the virtual clock.
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=5, sink=_sink)
+
+        _start = timer.perf_counter()
+        with _device.start_wav_stream(io.BytesIO(WAV_DATA), bytes_total=FRAMES*2) as _stream:
+            pass
+        _elapsed = timer.perf_counter() - _start
+
+        # 0.5 seconds of audio at 5 times real time
+        self.assertGreaterEqual(_elapsed, 0.09)
+        self.assertLess(_elapsed, 0.5)
+
+        self.assertEqual(_sink.getvalue()[:FRAMES*2], WAV_DATA[44:])
+        self.assertEqual(_stream.stream_status.bytes_played, FRAMES*2)
+        self.assertFalse(_device.pya.streams)
+
+    def test_blocking(self):
+        """
+        Test the blocking engine plays everything through .write().
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None, sink=_sink)
+
+        with _device.start_wav_stream(io.BytesIO(WAV_DATA), bytes_total=FRAMES*2, engine="blocking", block_size=512) as _stream:
+            pass
+
+        self.assertEqual(_sink.getvalue(), WAV_DATA[44:])
+        self.assertEqual(_stream.stream_status.xruns, 0)
+
+    def test_gain(self):
+        """
+        Test the gain stage is applied on the way to the device.
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None, sink=_sink)
+
+        with _device.start_wav_stream(io.BytesIO(WAV_DATA), bytes_total=FRAMES*2, engine="blocking", gain=0.5) as _stream:
+            pass
+
+        _samples = np.frombuffer(WAV_DATA[44:], dtype=np.int16)
+        self.assertEqual(_sink.getvalue(), np.rint(_samples * np.float32(0.5)).astype(np.int16).tobytes())
+        self.assertEqual(_stream.gain, 0.5)
+
+        # No gain stage for 24-bit audio
+        _buffer = create_wav(b"\x00"*300, channels=1, sample_width=3, sample_rate=SAMPLE_RATE)
+        self.assertIsInstance(_device.start_wav_stream(_buffer, fade=0.01), Exception)
+
+    def test_seek(self):
+        """
+        Test a seek fades out, then fades in from the new position, with no sample of the new position at full gain straight away.
+        """
+        for _engine in ("callback", "blocking"):
+            # Every sample is its own frame number; 2 seconds
+            _source = create_wav(np.arange(SAMPLE_RATE*2, dtype=np.int16).tobytes(), channels=1, sample_rate=SAMPLE_RATE)
+            _sink = BytesPCMSink()
+            _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=4, sink=_sink)
+
+            with _device.start_wav_stream(_source, fade=0.01, engine=_engine) as _stream:
+                timer.sleep(0.1)
+                self.assertIsNone(_stream.seek(1.5))
+
+            _samples = np.frombuffer(_sink.getvalue(), dtype=np.int16).astype(np.int32)
+
+            # The old position is nowhere near 10000 yet; the new one is past it within the fade in
+            _jump = int(np.argmax(_samples > 10000))
+            self.assertGreater(_jump, 0)
+
+            # Faded to near silence before the new position, which ramps up rather than jumps
+            self.assertLess(np.min(_samples[_jump-100:_jump]), 500)
+            self.assertGreater(_samples[_jump], _samples[_jump-1])
+            self.assertLess(_samples[_jump] - _samples[_jump-1], 1000)
+
+            self.assertEqual(_samples[-1], SAMPLE_RATE*2-1)
+
+    def test_unknown_latency(self):
+        """
+        Test an unknown latency profile is returned as an error, by streams and persistent outputs alike.
+        """
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None)
+
+        self.assertIsInstance(_device.start_wav_stream(io.BytesIO(WAV_DATA), latency="bogus"), InvalidInputParameters)
+        self.assertIsInstance(_device.persistent_output(latency="bogus"), InvalidInputParameters)
+        self.assertIsInstance(_device.playlist(latency="bogus"), InvalidInputParameters)
+
+
+class TestSharedStream(unittest.TestCase):
+    def test_shared(self):
+        """
+        Test a StreamIO shared over devices given as a generator, and the clean up when a stream cannot start.
+        """
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None)
+        _io = StreamIO(WAV_DATA, bytes_total=len(WAV_DATA))
+
+        _group = start_shared_wav_stream(_io, (_index for _index in (0, 0)), start=False, pya=_device.pya)
+
+        self.assertEqual(len(_group), 2)
+        self.assertTrue(_group)
+        _group.stop()
+        self.assertFalse(_io.readers)
+
+        _error = start_shared_wav_stream(_io, [0, 0], start=False, engine="unknown", pya=_device.pya)
+
+        self.assertIsInstance(_error, Exception)
+        self.assertFalse(_io.readers)
+
+
+class TestFileAudioDevice(unittest.TestCase):
+    def test_render(self):
+        """
+        Test streams are rendered back to back into a complete WAV file, faster than real time.
+        """
+        _file = io.BytesIO()
+        _io = StreamIO(WAV_DATA, bytes_total=len(WAV_DATA))
+
+        with FileAudioDevice(_file, sample_rate=SAMPLE_RATE, channels=1) as _device:
+            for _source in (io.BytesIO(WAV_DATA), _io):
+                with _device.start_wav_stream(_source, bytes_total=FRAMES*2):
+                    pass
+
+            _output = _device.persistent_output()
+            _output.play(io.BytesIO(WAV_DATA), gain=0.5).wait(1)
+            _output.close()
+
+        _report = _device.report()
+        self.assertGreater(_report.realtime_multiple, 1)
+        self.assertGreaterEqual(_report.duration, 1.5)
+
+        _file.seek(0)
+        with wave.open(_file, "rb") as _wHnd:
+            self.assertEqual(_wHnd.getframerate(), SAMPLE_RATE)
+            self.assertEqual(_wHnd.getnframes(), _report.frames)
+
+            _data = _wHnd.readframes(_wHnd.getnframes())
+
+        # Each stream is padded to a whole buffer
+        self.assertEqual(_data[:FRAMES*2], WAV_DATA[44:])
+
+    def test_length_from_header(self):
+        """
+        Test a static source without bytes_total is rendered for its own length, not padded with silence until the timeout.
+        """
+        _file = io.BytesIO()
+
+        with FileAudioDevice(_file, sample_rate=SAMPLE_RATE, channels=1) as _device:
+            with _device.start_wav_stream(io.BytesIO(WAV_DATA)):
+                pass
+
+        # Up to a whole buffer of padding
+        self.assertGreaterEqual(_device.report().frames, FRAMES)
+        self.assertLess(_device.report().frames, FRAMES*2)
+
+    def test_play_file(self):
+        """
+        Test a WAV file, whole or a range of it, ends with its data; nothing of its header or the timeout is rendered.
+        """
+        with tempfile.TemporaryDirectory() as _directory:
+            _path = os.path.join(_directory, "chime.wav")
+            with open(_path, "wb") as _file:
+                _file.write(WAV_DATA)
+
+            for _kwargs, _frames in (
+                ({}, FRAMES),
+                ({"start_at": 0.1, "end_at": 0.3}, SAMPLE_RATE//5),
+            ):
+                _file = io.BytesIO()
+
+                _start = timer.perf_counter()
+                with FileAudioDevice(_file, sample_rate=SAMPLE_RATE, channels=1) as _device:
+                    with _device.play_file(_path, **_kwargs):
+                        pass
+
+                self.assertLess(timer.perf_counter() - _start, 2)
+                self.assertEqual(_device.report().frames, _frames)
+
+                _file.seek(0)
+                with wave.open(_file, "rb") as _wHnd:
+                    self.assertEqual(_wHnd.getnframes(), _frames)
+
+if (__name__=="__main__"):
+    unittest.main()
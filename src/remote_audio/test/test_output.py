@@ -0,0 +1,92 @@
+import quicktest as unittest
+
+from remote_audio.io.base_io import WaveStreamIO
+from remote_audio.io.file import create_wav
+from remote_audio.io.pcm import PCMSource
+from remote_audio.output import SourceQueue
+
+
+def build_source(
+    frames:int,
+    value:int,
+    sample_rate:int = 8000,
+)->PCMSource:
+    """
+    A 16-bit mono source where every byte is `value`.
+    """
+    return PCMSource(
+        WaveStreamIO.from_bytes(create_wav(bytes([value])*frames*2, channels=1, sample_rate=sample_rate).getvalue()),
+        timeout=1,
+    )
+
+
+class TestSourceQueue(unittest.TestCase):
+    def test_render(self):
+        """
+        Test sources play back to back without a gap, padded with silence when idle.
+        """
+        _queue = SourceQueue(channels=1, sample_width=2, sample_rate=8000)
+
+        self.assertEqual(_queue.render(4), b"\x00"*8)
+
+        _first = _queue.put(build_source(3, 1))
+        _second = _queue.put(build_source(3, 2))
+
+        self.assertEqual(_queue.render(4), b"\x01"*6 + b"\x02"*2)
+        self.assertTrue(_first.finished)
+        self.assertFalse(_second.finished)
+
+        self.assertEqual(_queue.render(4), b"\x02"*4 + b"\x00"*4)
+        self.assertTrue(_second.wait(0))
+        self.assertTrue(_queue.idle)
+
+    def test_crossfade(self):
+        """
+        Test the end of a source overlaps the start of the next, with the same result however it is rendered.
+        """
+        _rendered = []
+
+        for _frame_counts in ((200,), (7,)*29):
+            _queue = SourceQueue(channels=1, sample_width=2, sample_rate=8000, crossfade=0.005)
+            _first = _queue.put(build_source(100, 1))
+            _second = _queue.put(build_source(100, 2))
+
+            _rendered.append(b"".join(_queue.render(_frame_count) for _frame_count in _frame_counts)[:400])
+
+            self.assertTrue(_first.finished)
+            self.assertTrue(_second.finished)
+
+        self.assertEqual(_rendered[0], _rendered[1])
+
+        # 40 frames of overlap, so 160 frames played in all
+        _samples = _rendered[0]
+        self.assertEqual(_samples[:120], b"\x01"*120)
+        self.assertNotIn(_samples[120:122], (b"\x01"*2, b"\x02"*2))
+        self.assertEqual(_samples[200:320], b"\x02"*120)
+        self.assertEqual(_samples[320:], b"\x00"*80)
+
+    def test_format(self):
+        """
+        Test sources in a different format are refused.
+        """
+        _queue = SourceQueue(channels=1, sample_width=2, sample_rate=44100)
+
+        self.assertIsInstance(_queue.put(build_source(3, 1, sample_rate=8000)), Exception)
+        self.assertTrue(_queue.idle)
+
+    def test_clear(self):
+        """
+        Test clearing stops the queued sources.
+        """
+        _queue = SourceQueue(channels=1, sample_width=2, sample_rate=8000)
+        _sources = [ _queue.put(build_source(100, 1)) for _ in range(3) ]
+
+        _queue.render(10)
+        _queue.clear()
+
+        self.assertTrue(all(_source.finished for _source in _sources))
+        self.assertEqual(_queue.render(2), b"\x00"*4)
+
+
+if (__name__=="__main__"):
+    unittest.main()
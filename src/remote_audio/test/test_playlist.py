@@ -0,0 +1,106 @@
+import os
+import tempfile
+
+import quicktest as unittest
+
+from remote_audio.io.file import create_wav
+from remote_audio.io.pcm import BytesPCMSink
+from remote_audio.null import NullAudioDevice
+
+
+SAMPLE_RATE = 8000
+FRAMES = 800
+
+
+class TestPlaylist(unittest.TestCase):
+    def test_gapless(self):
+        """
+        Test items play back to back without a gap, even those preloaded for longer than the timeout.
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=1, sink=_sink)
+
+        with _device.playlist(preload=2, timeout=0.05, chunk_size=256) as _playlist:
+            _items = [ _playlist.add(create_wav(bytes([_value])*FRAMES*2, channels=1, sample_rate=SAMPLE_RATE)) for _value in (1, 2, 3) ]
+
+        _playlist.output.close()
+
+        self.assertTrue(all(_item.finished and _item.error is None for _item in _items))
+
+        _played = _sink.getvalue()
+        _start = _played.index(b"\x01")
+
+        self.assertEqual(_played[_start:_start+FRAMES*2*3], b"\x01"*FRAMES*2 + b"\x02"*FRAMES*2 + b"\x03"*FRAMES*2)
+
+    def test_crossfade(self):
+        """
+        Test consecutive items overlap by the crossfade.
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=10, sink=_sink)
+
+        with _device.playlist(crossfade=0.02, chunk_size=256) as _playlist:
+            for _value in (1, 2, 3):
+                _playlist.add(create_wav(bytes([_value])*FRAMES*2, channels=1, sample_rate=SAMPLE_RATE))
+
+        _playlist.output.close()
+
+        # 160 frames of overlap between each pair
+        _played = _sink.getvalue()
+        _start = _played.index(b"\x01")
+
+        self.assertEqual(_played[_start:_start+640*2], b"\x01"*640*2)
+        self.assertEqual(_played[_start+800*2:_start+1280*2], b"\x02"*480*2)
+        self.assertEqual(_played[_start+1440*2:_start+2080*2], b"\x03"*640*2)
+        self.assertEqual(_played[_start+2080*2:].strip(b"\x00"), b"")
+
+    def test_skip(self):
+        """
+        Test items in another format fail without stopping the playlist, and skipping carries on with the next item.
+        """
+        _sink = BytesPCMSink()
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=10, sink=_sink)
+
+        with _device.playlist(chunk_size=256) as _playlist:
+            _invalid = _playlist.add(create_wav(b"\x01"*FRAMES*2, channels=1, sample_rate=44100))
+            _long = _playlist.add(create_wav(b"\x02"*SAMPLE_RATE*60*2, channels=1, sample_rate=SAMPLE_RATE))
+            _last = _playlist.add(create_wav(b"\x03"*FRAMES*2, channels=1, sample_rate=SAMPLE_RATE))
+
+            self.assertTrue(_invalid.wait(1))
+            self.assertIsInstance(_invalid.error, Exception)
+
+            self.assertIs(_playlist.skip(), _long)
+            self.assertTrue(_last.wait(1))
+
+        _playlist.output.close()
+
+        self.assertTrue(_playlist.idle)
+        self.assertLess(_sink.getvalue().count(b"\x02"), SAMPLE_RATE*2)
+        self.assertEqual(_sink.getvalue().count(b"\x03"), FRAMES*2)
+
+    def test_raising(self):
+        """
+        Test an item raising while being opened fails on its own, and the playlist carries on.
+        """
+        _device = NullAudioDevice(sample_rate=SAMPLE_RATE, channels=1, speed=None)
+
+        with tempfile.TemporaryDirectory() as _directory:
+            _path = os.path.join(_directory, "invalid.wav")
+            with open(_path, "wb") as _file:
+                _file.write(create_wav(b"\x01"*2, channels=1, sample_rate=SAMPLE_RATE).getvalue())
+
+            with _device.playlist(chunk_size=256) as _playlist:
+                _invalid = _playlist.add_file(_path, start_at="bogus")
+                _valid = _playlist.add(create_wav(b"\x02"*4, channels=1, sample_rate=SAMPLE_RATE))
+
+                self.assertTrue(_playlist.wait(3))
+
+            _playlist.output.close()
+
+        self.assertIsInstance(_invalid.error, Exception)
+        self.assertTrue(_valid.finished)
+        self.assertIsNone(_valid.error)
+
+
+if (__name__=="__main__"):
+    unittest.main()
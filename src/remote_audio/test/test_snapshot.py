@@ -0,0 +1,198 @@
+import os
+import re
+import tempfile
+
+import quicktest as unittest
+
+import remote_audio.api as api
+import remote_audio.device_cache as device_cache
+from remote_audio.monitor import DeviceEventType, DeviceMonitor, diff_snapshots
+from remote_audio.null import NullPyAudio
+from remote_audio.output import PersistentOutput
+from remote_audio.snapshot import DeviceSnapshot
+
+
+class FakePyAudio():
+    """
+    Stands in for pyaudio.PyAudio with two host APIs, counting the calls made to it.
+    """
+
+    host_apis = [
+        ["Built-in Output", "Built-in Microphone"],
+        ["USB Audio Device", "HDMI"],
+    ]
+
+    def __init__(self):
+        self.calls = 0
+        self.devices = []
+
+        for _host_api_index, _names in enumerate(self.host_apis):
+            for _name in _names:
+                self.devices.append({
+                    "index":                len(self.devices),
+                    "name":                 _name,
+                    "hostApi":              _host_api_index,
+                    "maxInputChannels":     2 if "Microphone" in _name else 0,
+                    "maxOutputChannels":    0 if "Microphone" in _name else 2,
+                })
+
+    def get_host_api_count(self):
+        self.calls += 1
+        return len(self.host_apis)
+
+    def get_host_api_info_by_index(self, host_api_index):
+        self.calls += 1
+        return {"index":host_api_index, "name":f"Host API {host_api_index}", "deviceCount":len(self.host_apis[host_api_index])}
+
+    def get_device_count(self):
+        self.calls += 1
+        return len(self.devices)
+
+    def get_device_info_by_index(self, device_index):
+        self.calls += 1
+        return self.devices[device_index]
+
+    def get_device_info_by_host_api_device_index(self, host_api_index, host_api_device_index):
+        self.calls += 1
+        return self.devices[sum(map(len, self.host_apis[:host_api_index])) + host_api_device_index]
+
+    def get_default_output_device_info(self):
+        self.calls += 1
+        return self.devices[0]
+
+    def get_default_input_device_info(self):
+        self.calls += 1
+        raise OSError(-9996, "No Default Input Device Available")
+
+
+class TestDeviceSnapshot(unittest.TestCase):
+    def test_scan(self):
+        """
+        Test one scan resolves every device and its signature, with one PortAudio call per device.
+        """
+        _pya = FakePyAudio()
+        _snapshot = DeviceSnapshot.scan(_pya)
+
+        self.assertEqual(len(_snapshot), 4)
+        self.assertLessEqual(_pya.calls, 4 + 2 + 3 + 2)
+
+        self.assertTupleEqual(_snapshot.get_signature(3), (1, 1))
+        self.assertEqual(_snapshot.get_device_index(1, 0), 2)
+        self.assertEqual(_snapshot.default_output_index, 0)
+        self.assertIsNone(_snapshot.default_input_index)
+
+    def test_find(self):
+        """
+        Test name and direction filtering, and that it is answered without PortAudio.
+        """
+        _pya = FakePyAudio()
+        _snapshot = DeviceSnapshot.scan(_pya)
+        _calls = _pya.calls
+
+        self.assertTupleEqual(tuple(_snapshot.find(name="usb")), (2, ))
+        self.assertTupleEqual(tuple(_snapshot.find(input=True, output=False, name="built-in")), (1, ))
+        self.assertTupleEqual(tuple(_snapshot.find(name=re.compile(r"^(HDMI|Built-in)"))), (0, 3))
+        self.assertTupleEqual(tuple(_snapshot.find(name="not a device")), ())
+
+        self.assertIs(_snapshot.match_name("USB"), _snapshot.match_name("usb"))
+        self.assertEqual(_pya.calls, _calls)
+
+    def test_cache(self):
+        """
+        Test a snapshot survives the on-disk cache, but only under the same fingerprint.
+        """
+        _snapshot = DeviceSnapshot.scan(FakePyAudio())
+
+        with tempfile.TemporaryDirectory() as _dir:
+            _path = os.path.join(_dir, "devices.json")
+
+            self.assertTrue(device_cache.save(_snapshot.to_dict(), fingerprint="a", path=_path))
+
+            _cached = DeviceSnapshot.from_dict(device_cache.load(fingerprint="a", path=_path))
+            self.assertEqual(_cached, _snapshot)
+            self.assertIsNone(_cached.pya)
+            self.assertTupleEqual(tuple(_cached.find(name="usb")), (2, ))
+
+            self.assertIsNone(device_cache.load(fingerprint="b", path=_path))
+
+    def test_diff(self):
+        """
+        Test devices are matched across rescans by name rather than by index.
+        """
+        _old = DeviceSnapshot.scan(FakePyAudio())
+
+        _pya = FakePyAudio()
+        _pya.host_apis = [
+            ["Built-in Output", "Built-in Microphone", "Bluetooth Headphones"],
+            ["HDMI"],
+        ]
+        _pya.__init__()
+        _new = DeviceSnapshot.scan(_pya)
+
+        _events = diff_snapshots(_old, _new)
+
+        self.assertListEqual(
+            [ (_event.type, _event.name) for _event in _events ],
+            [
+                (DeviceEventType.REMOVED, "USB Audio Device"),
+                (DeviceEventType.ADDED, "Bluetooth Headphones"),
+            ],
+        )
+        self.assertEqual(_events[1].device_index, 2)
+        self.assertListEqual(diff_snapshots(_new, DeviceSnapshot.scan(_pya)), [])
+
+
+class TestDeviceMonitor(unittest.TestCase):
+    def test_check(self):
+        """
+        Test a change of devices is refreshed and notified once no stream is playing; an idle output does not hold it off.
+        """
+        _fingerprint = ["a"]
+        _names = iter(["Second", "Third"])
+
+        _monitor = DeviceMonitor(
+            fingerprint = lambda: _fingerprint[0],
+            pya_factory = lambda: NullPyAudio(name=next(_names)),
+        )
+        _monitor.last_fingerprint = "a"
+
+        _previous = api._pya
+        api.refresh(terminate=False, pya=NullPyAudio(name="First"))
+        _output = None
+
+        try:
+            self.assertListEqual(_monitor.check(), [])
+
+            _output = PersistentOutput(sample_rate=8000, channels=1)
+            _stream = api.open_stream(rate=8000, channels=1, format=8, output=True)
+            self.assertTrue(api.has_active_streams())
+
+            _fingerprint[0] = "b"
+            self.assertListEqual(_monitor.check(), [])
+            self.assertTrue(_monitor.pending)
+
+            api.close_stream(_stream)
+            self.assertFalse(api.has_active_streams())
+
+            self.assertListEqual(
+                [ (_event.type, _event.name) for _event in _monitor.check() ],
+                [
+                    (DeviceEventType.REMOVED, "First"),
+                    (DeviceEventType.ADDED, "Second"),
+                ],
+            )
+            self.assertEqual(_monitor.refreshes, 1)
+            self.assertFalse(_monitor.pending)
+
+            # Reopened on the new handle
+            _output.open()
+            self.assertIs(_output.stream.pya, api.get_pya())
+        finally:
+            if (_output is not None):
+                _output.close()
+
+            api._pya = _previous
+
+
+if (__name__=="__main__"):
+    unittest.main()